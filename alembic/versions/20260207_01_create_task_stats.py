@@ -0,0 +1,58 @@
+"""create task stats summary table
+
+Revision ID: 20260207_01
+Revises: 20260206_01
+Create Date: 2026-02-07
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20260207_01"
+down_revision = "20260206_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "task_stats",
+        sa.Column(
+            "owner_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "status",
+            postgresql.ENUM("pending", "processing", "completed", "failed", name="task_status", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("category", sa.String(120), nullable=False, server_default=""),
+        sa.Column("priority", sa.String(16), nullable=False, server_default=""),
+        sa.Column("task_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("total_estimated_duration", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("owner_id", "status", "category", "priority", name="pk_task_stats"),
+    )
+
+    op.execute(
+        """
+        INSERT INTO task_stats (owner_id, status, category, priority, task_count, total_estimated_duration)
+        SELECT
+            owner_id,
+            status,
+            COALESCE(category, ''),
+            COALESCE(priority, ''),
+            COUNT(*),
+            COALESCE(SUM(estimated_duration), 0)
+        FROM tasks
+        WHERE owner_id IS NOT NULL
+        GROUP BY owner_id, status, COALESCE(category, ''), COALESCE(priority, '')
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("task_stats")
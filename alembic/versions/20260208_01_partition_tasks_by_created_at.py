@@ -0,0 +1,90 @@
+"""partition tasks by created_at
+
+Revision ID: 20260208_01
+Revises: 20260207_01
+Create Date: 2026-02-08
+
+Rebuilds ``tasks`` as a table range-partitioned by month on ``created_at``.
+Existing rows are copied into monthly partitions and anything outside the
+pre-created range lands in ``tasks_default``. Future partitions are created by
+``python -m app.scripts.maintain_task_partitions``. The copy holds an exclusive
+lock on ``tasks`` for its duration, so schedule it in a maintenance window on
+large tables.
+"""
+
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260208_01"
+down_revision = "20260207_01"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    op.execute("ALTER TABLE tasks RENAME TO tasks_unpartitioned")
+    op.execute(
+        "CREATE TABLE tasks (LIKE tasks_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)"
+    )
+    op.execute("ALTER TABLE tasks ADD CONSTRAINT pk_tasks PRIMARY KEY (id, created_at)")
+
+    today = datetime.now(timezone.utc).date()
+    oldest = conn.execute(sa.text("SELECT MIN(created_at) FROM tasks_unpartitioned")).scalar()
+    month = _month_start(oldest.date() if oldest is not None else today)
+    last = _add_months(_month_start(today), MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE tasks_p{month:%Y%m} PARTITION OF tasks "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    op.execute("CREATE TABLE tasks_default PARTITION OF tasks DEFAULT")
+
+    op.execute("INSERT INTO tasks SELECT * FROM tasks_unpartitioned")
+    op.execute("DROP TABLE tasks_unpartitioned")
+
+    op.create_foreign_key(
+        "fk_tasks_owner_id_users",
+        "tasks",
+        "users",
+        ["owner_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index("ix_tasks_owner_id_created_at", "tasks", ["owner_id", "created_at"])
+    op.execute("ANALYZE tasks")
+
+
+def downgrade():
+    op.execute("ALTER TABLE tasks RENAME TO tasks_partitioned")
+    op.execute("CREATE TABLE tasks (LIKE tasks_partitioned INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE tasks ADD PRIMARY KEY (id)")
+    op.execute("INSERT INTO tasks SELECT * FROM tasks_partitioned")
+    # Detached partitions are standalone tables and are left in place.
+    op.execute("DROP TABLE tasks_partitioned CASCADE")
+
+    op.create_foreign_key(
+        "fk_tasks_owner_id_users",
+        "tasks",
+        "users",
+        ["owner_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index("ix_tasks_owner_id", "tasks", ["owner_id"])
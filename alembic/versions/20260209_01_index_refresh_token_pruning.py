@@ -0,0 +1,30 @@
+"""index refresh tokens for pruning
+
+Revision ID: 20260209_01
+Revises: 20260208_01
+Create Date: 2026-02-09
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260209_01"
+down_revision = "20260208_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"])
+    op.create_index(
+        "ix_refresh_tokens_revoked",
+        "refresh_tokens",
+        ["id"],
+        postgresql_where=sa.text("revoked"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_refresh_tokens_revoked", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
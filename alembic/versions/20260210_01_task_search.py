@@ -0,0 +1,46 @@
+"""full-text and trigram search on tasks
+
+Revision ID: 20260210_01
+Revises: 20260209_01
+Create Date: 2026-02-10
+
+Adds ``search_vector``, a stored ``tsvector`` generated from ``title``
+(weight A) and ``description`` (weight B), with a GIN index, and a
+``pg_trgm`` GIN index on ``title`` for prefix and typo matching. Both indexes
+are created on every partition. Adding a stored generated column rewrites
+each partition under an exclusive lock, so schedule it in a maintenance window
+on large tables.
+"""
+
+from alembic import op
+
+revision = "20260210_01"
+down_revision = "20260209_01"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')"
+)
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(f"ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED")
+    op.create_index("ix_tasks_search_vector", "tasks", ["search_vector"], postgresql_using="gin")
+    op.create_index(
+        "ix_tasks_title_trgm",
+        "tasks",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.execute("ANALYZE tasks")
+
+
+def downgrade():
+    op.drop_index("ix_tasks_title_trgm", table_name="tasks")
+    op.drop_index("ix_tasks_search_vector", table_name="tasks")
+    op.execute("ALTER TABLE tasks DROP COLUMN search_vector")
+    # pg_trgm is left installed; other schemas may rely on it.
@@ -0,0 +1,67 @@
+"""create tasks_archive for completed tasks
+
+Revision ID: 20260211_01
+Revises: 20260210_01
+Create Date: 2026-02-11
+
+Adds ``tasks_archive``, a plain table with the columns of ``tasks`` plus
+``archived_at``. ``python -m app.scripts.archive_tasks`` moves old completed
+tasks into it. Downgrading copies archived rows back into ``tasks`` first, and
+fails if a monthly partition for them no longer exists.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "20260211_01"
+down_revision = "20260210_01"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')"
+)
+TASK_COLUMNS = "id, title, description, status, category, priority, estimated_duration, owner_id, created_at, updated_at"
+
+
+def upgrade():
+    op.create_table(
+        "tasks_archive",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column(
+            "status",
+            postgresql.ENUM("pending", "processing", "completed", "failed", name="task_status", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("category", sa.String(120), nullable=True),
+        sa.Column("priority", sa.String(16), nullable=True),
+        sa.Column("estimated_duration", sa.Integer(), nullable=True),
+        sa.Column(
+            "owner_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True)),
+    )
+    op.create_index("ix_tasks_archive_owner_id_created_at", "tasks_archive", ["owner_id", "created_at"])
+    op.create_index("ix_tasks_archive_search_vector", "tasks_archive", ["search_vector"], postgresql_using="gin")
+    op.create_index(
+        "ix_tasks_archive_title_trgm",
+        "tasks_archive",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+
+
+def downgrade():
+    op.execute(f"INSERT INTO tasks ({TASK_COLUMNS}) SELECT {TASK_COLUMNS} FROM tasks_archive")
+    op.drop_table("tasks_archive")
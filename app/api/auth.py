@@ -2,12 +2,11 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Request, status
 from slowapi.util import get_remote_address
 from sqlalchemy import select
-from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_active_user
+from app.api.deps import CurrentUser, DbSession
 from app.core.config import settings
 from app.core.limiter import limiter
 from app.core.security import (
@@ -18,7 +17,6 @@ from app.core.security import (
     hash_token,
     verify_password,
 )
-from app.database import get_db
 from app.models.refresh_token import RefreshToken
 from app.models.user import User
 from app.schemas.auth import (
@@ -34,6 +32,7 @@ from app.services.auth_throttle import (
     clear_failed_logins,
     register_failed_login,
 )
+from app.services.refresh_tokens import cache_revocation, is_revocation_cached
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -55,7 +54,7 @@ def _token_response(user: User) -> tuple[TokenResponse, str, datetime]:
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit(settings.rate_limit_auth)
-def register(request: Request, payload: UserCreate, db: Session = Depends(get_db)) -> User:
+def register(request: Request, payload: UserCreate, db: DbSession) -> User:
     existing = db.execute(select(User).where(User.email == payload.email)).scalar_one_or_none()
     if existing:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
@@ -72,7 +71,7 @@ def register(request: Request, payload: UserCreate, db: Session = Depends(get_db
 
 @router.post("/login", response_model=TokenResponse)
 @limiter.limit(settings.rate_limit_auth)
-def login(request: Request, payload: UserLogin, db: Session = Depends(get_db)) -> TokenResponse:
+def login(request: Request, payload: UserLogin, db: DbSession) -> TokenResponse:
     client_ip = get_remote_address(request)
     throttle = check_login_allowed(client_ip, payload.email)
     if not throttle.allowed:
@@ -103,7 +102,7 @@ def login(request: Request, payload: UserLogin, db: Session = Depends(get_db)) -
 
 @router.post("/refresh", response_model=TokenResponse)
 @limiter.limit("5/minute")
-def refresh(request: Request, payload: RefreshRequest, db: Session = Depends(get_db)) -> TokenResponse:
+def refresh(request: Request, payload: RefreshRequest, db: DbSession) -> TokenResponse:
     try:
         decoded = decode_token(payload.refresh_token)
     except Exception:
@@ -113,6 +112,9 @@ def refresh(request: Request, payload: RefreshRequest, db: Session = Depends(get
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
 
     token_hash = hash_token(payload.refresh_token)
+    if is_revocation_cached(token_hash):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token revoked")
+
     token_entry = db.execute(
         select(RefreshToken).where(RefreshToken.token_hash == token_hash)
     ).scalar_one_or_none()
@@ -138,12 +140,13 @@ def refresh(request: Request, payload: RefreshRequest, db: Session = Depends(get
         )
     )
     db.commit()
+    cache_revocation(token_hash, token_entry.expires_at)
     return response
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
 @limiter.limit("5/minute")
-def logout(request: Request, payload: LogoutRequest, db: Session = Depends(get_db)) -> None:
+def logout(request: Request, payload: LogoutRequest, db: DbSession) -> None:
     token_hash = hash_token(payload.refresh_token)
     token_entry = db.execute(
         select(RefreshToken).where(RefreshToken.token_hash == token_hash)
@@ -151,9 +154,10 @@ def logout(request: Request, payload: LogoutRequest, db: Session = Depends(get_d
     if token_entry:
         token_entry.revoked = True
         db.commit()
+        cache_revocation(token_hash, token_entry.expires_at)
     return None
 
 
 @router.get("/me", response_model=UserResponse)
-def me(current_user: User = Depends(get_current_active_user)) -> User:
+def me(current_user: CurrentUser) -> User:
     return current_user
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Generator
+from typing import Annotated
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
@@ -8,15 +10,14 @@ from jose import JWTError
 from sqlalchemy.orm import Session
 
 from app.core.security import decode_token
-from app.database import get_db
+from app.database import get_db, replica_router
 from app.models.user import User
 
 security = HTTPBearer(auto_error=False)
 
 
 def get_current_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(security),
-    db: Session = Depends(get_db),
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)],
 ) -> User:
     if credentials is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
@@ -39,14 +40,32 @@ def get_current_user(
     except ValueError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject")
 
-    user = db.get(User, user_id)
+    # The lookup uses its own read session, which may be served by a replica.
+    with replica_router.open_read_session(user_id) as db:
+        user = db.get(User, user_id)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
     return user
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_active_user(current_user: Annotated[User, Depends(get_current_user)]) -> User:
     if not current_user.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is inactive")
     return current_user
+
+
+CurrentUser = Annotated[User, Depends(get_current_active_user)]
+DbSession = Annotated[Session, Depends(get_db)]
+
+
+def get_read_db(current_user: CurrentUser) -> Generator[Session, None, None]:
+    """Session for read-only endpoints; routed to a replica when one is safe to use."""
+    db = replica_router.open_read_session(current_user.id)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+ReadDbSession = Annotated[Session, Depends(get_read_db)]
@@ -1,22 +1,26 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, HTTPException, status
 from sqlalchemy import text
-from sqlalchemy.orm import Session
 
+from app.api.deps import CurrentUser, DbSession
+from app.core.admission import admission_stats
 from app.core.config import settings
-from app.database import get_db
+from app.core.sql_instrumentation import sql_metrics
+from app.database import pool_checkout_stats
+from app.models.user import UserRole
+from app.services.task_cache import task_cache_stats
 
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health/live")
-def live() -> dict:
+async def live() -> dict:
     return {"status": "ok"}
 
 
 @router.get("/health/ready")
-def ready(db: Session = Depends(get_db)) -> tuple[dict, int]:
+def ready(db: DbSession) -> tuple[dict, int]:
     try:
         db.execute(text("SELECT 1"))
     except Exception:
@@ -38,5 +42,17 @@ def ready(db: Session = Depends(get_db)) -> tuple[dict, int]:
 
 
 @router.get("/health")
-def health() -> dict:
+async def health() -> dict:
     return {"status": "ok"}
+
+
+@router.get("/health/metrics")
+def metrics(current_user: CurrentUser) -> dict:
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    return {
+        "sql": sql_metrics.snapshot(),
+        "db_pool": pool_checkout_stats.snapshot(),
+        "task_cache": task_cache_stats.snapshot(),
+        "admission": admission_stats.snapshot(),
+    }
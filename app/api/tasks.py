@@ -1,39 +1,169 @@
-from uuid import UUID
+from datetime import datetime
+import hashlib
+from types import SimpleNamespace
+from typing import Annotated
+from uuid import UUID, uuid4
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from sqlalchemy import select
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, text, union_all, update
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_active_user
-from app.database import get_db
+from app.api.deps import CurrentUser, DbSession, ReadDbSession
+from app.database import reads_from_replica, record_written_users
 from app.models.task import Task, TaskStatus
+from app.models.task_archive import TaskArchive
 from app.models.user import User, UserRole
-from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate
+from app.schemas.task import (
+    TaskBulkDeleteResponse,
+    TaskBulkFailure,
+    TaskBulkUpdate,
+    TaskBulkUpdateResponse,
+    TaskCreate,
+    TaskFilter,
+    TaskResponse,
+    TaskStatsResponse,
+    TaskUpdate,
+)
 from app.services.ai_classifier import DEFAULT_CLASSIFICATION
-from app.services.task_classification import classify_task_record
-from app.services.task_queue import enqueue_task_classification
+from app.services.task_classification import classify_task_fields, classify_task_record
+from app.services.task_events import stream_task_events
+from app.services.task_filters import search_condition, task_conditions, task_filter_conditions
+from app.services import task_cache
+from app.services.task_bulk_delete import delete_tasks_in_chunks
+from app.services.task_cache import CachedResponse
+from app.services.task_queue import enqueue_task_bulk_delete, enqueue_task_classification, fetch_job
+from app.services.task_stats import apply_task_change, apply_task_changes, load_task_stats, snapshot_task
 from app.core.config import settings
+from app.core.serialization import dump_row, dump_rows
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def _authorize_task(task: Task, user: User) -> None:
+# Listings select exactly the response columns and encode rows straight to JSON.
+TASK_RESPONSE_FIELDS = tuple(TaskResponse.model_fields)
+# The columns behind task_stats, captured before and after set-based writes.
+TASK_STATS_FIELDS = ("owner_id", "status", "category", "priority", "estimated_duration")
+
+
+# Autovacuum analyzes partitions but never a partitioned parent, whose reltuples
+# would stay frozen at the last manual ANALYZE. Sum the leaves instead; a
+# partition that was never analyzed (-1) is too new to hold many rows.
+ESTIMATED_ROWS_SQL = text(
+    """
+    SELECT SUM(rel.reltuples) FILTER (WHERE rel.reltuples >= 0)::bigint
+    FROM pg_class rel
+    WHERE (rel.oid = CAST(:table AS regclass) AND rel.relkind <> 'p')
+       OR rel.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = CAST(:table AS regclass))
+    """
+)
+
+
+def _estimated_task_count(db: Session, *, include_archived: bool = False) -> int | None:
+    """Planner row estimate for ``tasks``; ``None`` until the table has been analyzed."""
+    total = 0
+    for table in ("tasks", "tasks_archive") if include_archived else ("tasks",):
+        estimate = db.execute(ESTIMATED_ROWS_SQL, {"table": table}).scalar_one_or_none()
+        if estimate is None:
+            return None
+        total += int(estimate)
+    return total
+
+
+def _total_count_headers(total: int, *, estimated: bool) -> dict[str, str]:
+    headers = {"X-Total-Count": str(total)}
+    if estimated:
+        headers["X-Total-Count-Estimated"] = "true"
+    return headers
+
+
+def _task_conditions(user: User, model: type[Task] | type[TaskArchive] = Task, **filters) -> list:
+    """``task_conditions`` plus owner scoping: non-admins only ever see their own tasks."""
+    conditions = task_conditions(model=model, **filters)
+    if user.role != UserRole.ADMIN:
+        conditions.append(model.owner_id == user.id)
+    return conditions
+
+
+def _listing_select(model: type[Task] | type[TaskArchive], user: User, q: str | None, filters: dict):
+    """Response columns of the ``model`` rows a listing may return, plus ``rank`` when searching."""
+    query = select(*(getattr(model, name) for name in TASK_RESPONSE_FIELDS)).where(
+        *_task_conditions(user, model, **filters)
+    )
+    if q is not None:
+        clause, rank = search_condition(q, model)
+        query = query.where(clause).add_columns(rank.label("rank"))
+    return query
+
+
+def _select_task(db: Session, task_id: UUID, *fields: str):
+    """Select ``fields`` of one task, falling back to ``tasks_archive`` once it has been archived."""
+    for model in (Task, TaskArchive):
+        row = db.execute(
+            select(*(getattr(model, name) for name in fields)).where(model.id == task_id)
+        ).one_or_none()
+        if row is not None:
+            return row
+    return None
+
+
+def _task_etag(task_id: UUID, updated_at: datetime) -> str:
+    return f'W/"{task_id.hex}-{int(updated_at.timestamp() * 1_000_000)}"'
+
+
+def _page_etag(rows: list[tuple[UUID, datetime]]) -> str:
+    digest = hashlib.sha256()
+    for task_id, updated_at in rows:
+        digest.update(f"{task_id.hex}:{int(updated_at.timestamp() * 1_000_000)};".encode("ascii"))
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison (RFC 9110 section 8.8.3.2) against a comma-separated header value."""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def _task_page_response(rows: list, headers: dict[str, str]) -> Response:
+    headers["ETag"] = _page_etag([(row.id, row.updated_at) for row in rows])
+    return Response(
+        content=dump_rows(TASK_RESPONSE_FIELDS, rows),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def _cached_response(entry: CachedResponse, if_none_match: str | None) -> Response:
+    etag = entry.headers["ETag"]
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=entry.body, media_type="application/json", headers=entry.headers)
+
+
+def _authorize_owner(owner_id: UUID | None, user: User) -> None:
     if user.role == UserRole.ADMIN:
         return
-    if task.owner_id != user.id:
+    if owner_id != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
 
+def _authorize_task(task: Task, user: User) -> None:
+    _authorize_owner(task.owner_id, user)
+
+
 @router.post("/tasks", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 def create_task(
     payload: TaskCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: DbSession,
+    current_user: CurrentUser,
 ) -> Task:
     task = Task(
+        id=uuid4(),
         title=payload.title,
         description=payload.description,
         category=DEFAULT_CLASSIFICATION["category"],
@@ -42,113 +172,408 @@ def create_task(
         status=TaskStatus.PROCESSING if settings.task_classification_mode == "async" else TaskStatus.PENDING,
         owner_id=current_user.id,
     )
+    if settings.task_classification_mode == "sync":
+        # Classify before inserting so the HF call holds no locks and the task is
+        # written once, in a single transaction.
+        classify_task_fields(task)
     db.add(task)
+    apply_task_change(db, None, snapshot_task(task))
+    record_written_users(db, [current_user.id])
     db.commit()
-    db.refresh(task)
+    task_cache.invalidate_tasks([task.id], [task.owner_id])
 
-    if settings.task_classification_mode == "sync":
-        classify_task_record(db, task)
-        db.commit()
-        db.refresh(task)
-    else:
+    if settings.task_classification_mode == "async":
         try:
             enqueue_task_classification(str(task.id))
         except Exception:
             logger.exception("Task queue unavailable; classifying synchronously")
             classify_task_record(db, task)
             db.commit()
-            db.refresh(task)
+            task_cache.invalidate_tasks([task.id], [task.owner_id])
 
     return task
 
 
+@router.get("/tasks/stats", response_model=TaskStatsResponse)
+def task_stats(
+    db: ReadDbSession,
+    current_user: CurrentUser,
+    owner_id: UUID | None = None,
+) -> TaskStatsResponse:
+    if current_user.role != UserRole.ADMIN:
+        owner_id = current_user.id
+
+    buckets = load_task_stats(db, owner_id)
+    by_status: dict[str, int] = {}
+    by_category: dict[str, int] = {}
+    by_priority: dict[str, int] = {}
+    for bucket in buckets:
+        by_status[bucket["status"].value] = by_status.get(bucket["status"].value, 0) + bucket["count"]
+        category = bucket["category"] or "unset"
+        by_category[category] = by_category.get(category, 0) + bucket["count"]
+        priority = bucket["priority"] or "unset"
+        by_priority[priority] = by_priority.get(priority, 0) + bucket["count"]
+
+    return TaskStatsResponse(
+        total=sum(bucket["count"] for bucket in buckets),
+        total_estimated_duration=sum(bucket["total_estimated_duration"] for bucket in buckets),
+        by_status=by_status,
+        by_category=by_category,
+        by_priority=by_priority,
+        buckets=buckets,
+    )
+
+
+@router.get("/tasks/events", response_class=StreamingResponse)
+async def task_events(
+    current_user: CurrentUser,
+    last_event_id: str | None = Header(None),
+) -> StreamingResponse:
+    # The user lookup closes its session before streaming, so idle streams hold no DB connection.
+    if not settings.redis_url:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Task events unavailable")
+    return StreamingResponse(
+        stream_task_events(current_user.id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/tasks/{id}", response_model=TaskResponse)
 def get_task(
     id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-) -> Task:
-    task = db.get(Task, id)
-    if task is None:
+    db: ReadDbSession,
+    current_user: CurrentUser,
+    if_none_match: str | None = Header(None),
+) -> Response:
+    slot = task_cache.lookup_task(id)
+    if slot is not None and slot.entry is not None:
+        # Entries are shared by everyone who may read the task; check the reader here.
+        _authorize_owner(slot.entry.owner_id, current_user)
+        return _cached_response(slot.entry, if_none_match)
+
+    if if_none_match:
+        row = _select_task(db, id, "owner_id", "updated_at")
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+        _authorize_owner(row.owner_id, current_user)
+        etag = _task_etag(id, row.updated_at)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    row = _select_task(db, id, *TASK_RESPONSE_FIELDS)
+    if row is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-    _authorize_task(task, current_user)
-    return task
+    _authorize_owner(row.owner_id, current_user)
+    headers = {"ETag": _task_etag(row.id, row.updated_at)}
+    body = dump_row(TASK_RESPONSE_FIELDS, row)
+    if slot is not None:
+        task_cache.store(slot, body, headers, owner_id=row.owner_id, from_replica=reads_from_replica(db))
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/tasks", response_model=list[TaskResponse])
 def list_tasks(
+    db: ReadDbSession,
+    current_user: CurrentUser,
     status: TaskStatus | None = None,
     category: str | None = None,
     priority: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    q: str | None = Query(None, min_length=1, max_length=200),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    sort_by: str = Query("created_at", pattern="^(created_at|priority|status)$"),
+    sort_by: str | None = Query(None, pattern="^(relevance|created_at|priority|status)$"),
     sort_order: str = Query("desc", pattern="^(asc|desc)$"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-) -> list[Task]:
-    query = select(Task)
-
-    if current_user.role != UserRole.ADMIN:
-        query = query.where(Task.owner_id == current_user.id)
+    include_total: bool = Query(False),
+    include_archived: bool = Query(False),
+    if_none_match: str | None = Header(None),
+) -> Response:
+    scope = None if current_user.role == UserRole.ADMIN else current_user.id
+    slot = task_cache.lookup_page(
+        scope,
+        {
+            "status": status,
+            "category": category,
+            "priority": priority,
+            "created_after": created_after,
+            "created_before": created_before,
+            "q": q,
+            "limit": limit,
+            "offset": offset,
+            "sort_by": sort_by,
+            "sort_order": sort_order,
+            "include_total": include_total,
+            "include_archived": include_archived,
+        },
+    )
+    if slot is not None and slot.entry is not None:
+        return _cached_response(slot.entry, None if include_total else if_none_match)
 
-    if status is not None:
-        query = query.where(Task.status == status)
-    if category:
-        query = query.where(Task.category == category)
-    if priority:
-        query = query.where(Task.priority == priority)
+    filters = {
+        "status": status,
+        "category": category,
+        "priority": priority,
+        "created_after": created_after,
+        "created_before": created_before,
+    }
+    search = q.strip() if q is not None and q.strip() else None
+    hot = _listing_select(Task, current_user, search, filters)
+    # Archived tasks are only read when asked for, so plain listings touch the hot table alone.
+    if include_archived:
+        listing = union_all(hot, _listing_select(TaskArchive, current_user, search, filters)).subquery("listing")
+    else:
+        listing = hot.subquery("listing")
+    query = select(*(listing.c[name] for name in TASK_RESPONSE_FIELDS))
 
-    if sort_by == "priority":
-        order_col = Task.priority
+    # Searches default to relevance; without q it falls back to created_at.
+    by_relevance = search is not None and sort_by in (None, "relevance")
+    if by_relevance:
+        order_col = listing.c.rank
+    elif sort_by == "priority":
+        order_col = listing.c.priority
     elif sort_by == "status":
-        order_col = Task.status
+        order_col = listing.c.status
     else:
-        order_col = Task.created_at
+        order_col = listing.c.created_at
 
     if sort_order == "desc":
         query = query.order_by(order_col.desc())
     else:
         query = query.order_by(order_col.asc())
+    if by_relevance:
+        # Equal scores fall back to newest first, so pages stay stable.
+        query = query.order_by(listing.c.created_at.desc(), listing.c.id)
 
     query = query.limit(limit).offset(offset)
 
-    result = db.execute(query)
-    return list(result.scalars().all())
+    # The total can change without the page changing, so only plain pages are conditional.
+    if if_none_match and not include_total:
+        page = db.execute(query.with_only_columns(listing.c.id, listing.c.updated_at)).all()
+        etag = _page_etag(page)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+    unscoped = (
+        current_user.role == UserRole.ADMIN
+        and status is None
+        and not category
+        and not priority
+        and created_after is None
+        and created_before is None
+        and search is None
+    )
+    estimate = _estimated_task_count(db, include_archived=include_archived) if include_total and unscoped else None
+    if not include_total:
+        rows = db.execute(query).all()
+        headers = {}
+    elif estimate is not None and estimate >= settings.task_count_estimate_threshold:
+        rows = db.execute(query).all()
+        headers = _total_count_headers(estimate, estimated=True)
+    else:
+        rows = db.execute(query.add_columns(func.count().over().label("total_count"))).all()
+        if rows:
+            headers = _total_count_headers(int(rows[0].total_count), estimated=False)
+        elif offset == 0:
+            headers = _total_count_headers(0, estimated=False)
+        else:
+            # Paging past the end leaves no row to carry the window count, and a
+            # second full count would double the cost of every overshoot.
+            headers = {}
+
+    # dump_rows zips by field name, so a trailing total_count column is dropped.
+    response = _task_page_response(rows, headers)
+    if slot is not None:
+        task_cache.store(slot, response.body, headers, from_replica=reads_from_replica(db))
+    return response
+
+
+@router.patch("/tasks", response_model=TaskBulkUpdateResponse)
+def bulk_update_tasks(
+    payload: TaskBulkUpdate,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> TaskBulkUpdateResponse:
+    if payload.ids is not None:
+        conditions = [Task.id.in_(payload.ids)]
+        if current_user.role != UserRole.ADMIN:
+            conditions.append(Task.owner_id == current_user.id)
+    else:
+        conditions = task_filter_conditions(payload.filter)
+        if current_user.role != UserRole.ADMIN:
+            conditions.append(Task.owner_id == current_user.id)
+
+    # Lock the matching rows in id order and keep their old values, so one
+    # UPDATE ... FROM ... RETURNING yields both sides of each task_stats move.
+    matching = select(Task.id, Task.created_at, *(getattr(Task, name) for name in TASK_STATS_FIELDS))
+    matching = matching.where(*conditions)
+    if payload.filter is not None:
+        # One row past the cap tells a filter that is too broad from one that fits,
+        # without locking the rest of the table.
+        matching = matching.limit(settings.task_bulk_update_max_rows + 1)
+    previous = matching.order_by(Task.id).with_for_update().cte("previous")
+    tasks = Task.__table__
+    statement = (
+        update(tasks)
+        .where(tasks.c.id == previous.c.id, tasks.c.created_at == previous.c.created_at)
+        .values(**payload.update.model_dump(exclude_unset=True))
+        .returning(
+            tasks.c.id,
+            *(tasks.c[name] for name in TASK_STATS_FIELDS),
+            *(previous.c[name].label(f"previous_{name}") for name in TASK_STATS_FIELDS),
+        )
+    )
+    rows = db.execute(statement).all()
+    if payload.filter is not None and len(rows) > settings.task_bulk_update_max_rows:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Filter matches more than {settings.task_bulk_update_max_rows} tasks; narrow it",
+        )
+
+    changes = [
+        (
+            snapshot_task(SimpleNamespace(**{name: getattr(row, f"previous_{name}") for name in TASK_STATS_FIELDS})),
+            snapshot_task(row),
+        )
+        for row in rows
+    ]
+    apply_task_changes(db, changes)
+
+    # Explained in the same transaction, so the answers match what was updated.
+    failed = []
+    if payload.ids is not None:
+        missing = set(payload.ids) - {row.id for row in rows}
+        if missing:
+            existing = set(db.scalars(select(Task.id).where(Task.id.in_(missing))))
+            archived_owners = dict(
+                db.execute(select(TaskArchive.id, TaskArchive.owner_id).where(TaskArchive.id.in_(missing))).tuples()
+            )
+            for task_id in sorted(missing):
+                # Archived tasks answer like PATCH /tasks/{id}: ownership first, then read-only.
+                if task_id in archived_owners and (
+                    current_user.role == UserRole.ADMIN or archived_owners[task_id] == current_user.id
+                ):
+                    detail = "Archived tasks are read-only"
+                elif task_id in existing or task_id in archived_owners:
+                    detail = "Not authorized"
+                else:
+                    detail = "Task not found"
+                failed.append(TaskBulkFailure(id=task_id, detail=detail))
+
+    owner_ids = {row.owner_id for row in rows} | {row.previous_owner_id for row in rows}
+    # The acting user reads next, and an admin may not own any of these rows.
+    record_written_users(db, owner_ids | {current_user.id})
+    db.commit()
+    task_cache.invalidate_tasks([row.id for row in rows], owner_ids)
+    return TaskBulkUpdateResponse(updated=len(rows), failed=failed)
 
 
 @router.patch("/tasks/{id}", response_model=TaskResponse)
 def update_task(
     id: UUID,
     payload: TaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    response: Response,
+    db: DbSession,
+    current_user: CurrentUser,
+    if_match: str | None = Header(None),
 ) -> Task:
-    task = db.get(Task, id)
+    task = db.get(Task, id, with_for_update=True)
     if task is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+        archived = db.get(TaskArchive, id)
+        if archived is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+        _authorize_owner(archived.owner_id, current_user)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Archived tasks are read-only")
     _authorize_task(task, current_user)
+    if if_match and not _etag_matches(if_match, _task_etag(task.id, task.updated_at)):
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Task has been modified")
 
+    before = snapshot_task(task)
     update_data = payload.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(task, field, value)
-
+    apply_task_change(db, before, snapshot_task(task))
+    record_written_users(db, [current_user.id])
     db.commit()
-    db.refresh(task)
+    task_cache.invalidate_tasks([task.id], [task.owner_id])
+    response.headers["ETag"] = _task_etag(task.id, task.updated_at)
     return task
 
 
+BULK_DELETE_JOB = "app.jobs.task_bulk_delete.delete_tasks_job"
+
+
+def _require_admin(user: User) -> None:
+    if user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+
+@router.delete("/tasks", response_model=TaskBulkDeleteResponse)
+def bulk_delete_tasks(
+    selector: Annotated[TaskFilter, Query()],
+    response: Response,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> TaskBulkDeleteResponse:
+    _require_admin(current_user)
+    if not selector.model_dump(exclude_none=True):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="At least one filter is required")
+
+    # Like classification, large deletes go to the worker when there is one.
+    if settings.task_classification_mode == "async":
+        try:
+            job_id = enqueue_task_bulk_delete(selector.model_dump(mode="json", exclude_none=True))
+        except Exception:
+            logger.exception("Task queue unavailable; deleting inline")
+        else:
+            response.status_code = status.HTTP_202_ACCEPTED
+            response.headers["Location"] = f"/tasks/deletions/{job_id}"
+            return TaskBulkDeleteResponse(job_id=job_id, status="queued", deleted=0, chunks=0)
+
+    # Marked by the first chunk's commit; a queued job's writes are not read-your-writes.
+    record_written_users(db, [current_user.id])
+    result = delete_tasks_in_chunks(db, selector, settings.task_bulk_delete_chunk_size)
+    return TaskBulkDeleteResponse(
+        status="finished", deleted=result.deleted, chunks=result.chunks, remaining=result.remaining
+    )
+
+
+@router.get("/tasks/deletions/{job_id}", response_model=TaskBulkDeleteResponse)
+def bulk_delete_progress(
+    job_id: str,
+    current_user: CurrentUser,
+) -> TaskBulkDeleteResponse:
+    _require_admin(current_user)
+    job = fetch_job(job_id) if settings.redis_url else None
+    if job is None or job.func_name != BULK_DELETE_JOB:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deletion not found")
+    return TaskBulkDeleteResponse(
+        job_id=job.id,
+        status=job.get_status().value,
+        deleted=job.meta.get("deleted", 0),
+        chunks=job.meta.get("chunks", 0),
+        remaining=job.meta.get("remaining", 0),
+    )
+
+
 @router.delete("/tasks/{id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_task(
     id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: DbSession,
+    current_user: CurrentUser,
 ) -> Response:
-    task = db.get(Task, id)
+    # Archived tasks still count in task_stats, so they are deleted the same way.
+    task = db.get(Task, id, with_for_update=True) or db.get(TaskArchive, id, with_for_update=True)
     if task is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     _authorize_task(task, current_user)
 
+    snapshot = snapshot_task(task)
     db.delete(task)
+    apply_task_change(db, snapshot, None)
+    record_written_users(db, [current_user.id])
     db.commit()
+    task_cache.invalidate_tasks([id], [task.owner_id])
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,169 @@
+"""Adaptive concurrency limits with short, deadline-bounded wait queues.
+
+Sync handlers run on a shared threadpool, so once Postgres or Hugging Face
+slows down, queued requests hold threads and every endpoint slows down with
+them. An ``AdmissionLimiter`` bounds how many requests of one route class run
+at once. A few more may wait in a FIFO queue, and the rest are turned away
+straight away:
+
+* when the queue is full,
+* when the wait predicted from the current service time exceeds the deadline,
+* when a queued request has waited for the whole deadline.
+
+The limit follows a latency gradient, like Netflix's ``Gradient2Limit``. A
+short EWMA of request latency is compared with a long one that tracks the
+latency the service normally has. While the short average stays within
+``TOLERANCE`` times the long one the limit grows by about ``sqrt(limit)`` per
+sample, up to its maximum. Once latency rises past that, the limit is scaled
+down by the ratio, never below the configured minimum. A slowdown that lasts
+for several hundred requests gradually becomes the new baseline. The limit only grows
+while at least half of it is in use, so an idle service does not drift to
+limits it has never tested.
+
+Limiters are not thread-safe; they are used from the event loop only.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+
+import anyio
+
+SHORT_ALPHA = 0.1
+LONG_ALPHA = 0.002
+TOLERANCE = 1.5
+MIN_GRADIENT = 0.5
+SMOOTHING = 0.2
+# After an overload the long average is pulled back towards current latency.
+LONG_DECAY = 0.95
+
+
+class AdmissionLimiter:
+    def __init__(
+        self,
+        *,
+        max_limit: int,
+        min_limit: int,
+        max_queue: int,
+        queue_timeout_seconds: float,
+    ) -> None:
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+        self._short_latency: float | None = None
+        self._long_latency: float | None = None
+        self._waiters: deque[anyio.Event] = deque()
+
+    @property
+    def capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self, position: int) -> float:
+        """Seconds until the ``position``-th queued request would get a slot."""
+        if self._short_latency is None:
+            return 0.0
+        return position * self._short_latency / self.capacity
+
+    def _retry_after(self, expected_wait: float) -> float:
+        return max(expected_wait, self.queue_timeout_seconds)
+
+    async def acquire(self) -> float:
+        """Take a slot. Returns ``0.0`` once admitted, else seconds to suggest in ``Retry-After``."""
+        if self.in_flight < self.capacity and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return 0.0
+
+        expected_wait = self.expected_wait(len(self._waiters) + 1)
+        if len(self._waiters) >= self.max_queue or expected_wait > self.queue_timeout_seconds:
+            self.shed += 1
+            return self._retry_after(expected_wait)
+
+        event = anyio.Event()
+        self._waiters.append(event)
+        try:
+            with anyio.move_on_after(self.queue_timeout_seconds):
+                await event.wait()
+        except BaseException:
+            # Cancelled while queued, e.g. the client went away.
+            if event.is_set():
+                self.release(None)
+            else:
+                self._waiters.remove(event)
+            raise
+        if event.is_set():
+            # release() counted the slot in in_flight before waking us.
+            self.admitted += 1
+            return 0.0
+        self._waiters.remove(event)
+        self.shed += 1
+        return self._retry_after(self.expected_wait(len(self._waiters) + 1))
+
+    def release(self, latency_seconds: float | None) -> None:
+        """Free a slot; ``latency_seconds`` is how long the admitted request took."""
+        if latency_seconds is not None:
+            self._update_limit(latency_seconds)
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self.capacity:
+            self.in_flight += 1
+            self._waiters.popleft().set()
+
+    def _update_limit(self, latency: float) -> None:
+        if self._short_latency is None or self._long_latency is None:
+            self._short_latency = self._long_latency = latency
+            return
+        self._short_latency += SHORT_ALPHA * (latency - self._short_latency)
+        self._long_latency += LONG_ALPHA * (latency - self._long_latency)
+        if self._long_latency > 2 * self._short_latency:
+            self._long_latency *= LONG_DECAY
+
+        gradient = max(MIN_GRADIENT, min(1.0, TOLERANCE * self._long_latency / self._short_latency))
+        if gradient >= 1.0 and self.in_flight < self.limit / 2:
+            return
+        target = self.limit * gradient + math.sqrt(self.limit)
+        limit = self.limit * (1 - SMOOTHING) + target * SMOOTHING
+        self.limit = min(float(self.max_limit), max(float(self.min_limit), limit))
+
+    def snapshot(self) -> dict[str, float | int | None]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "latency_ms": round(self._short_latency * 1000, 3) if self._short_latency is not None else None,
+            "baseline_latency_ms": round(self._long_latency * 1000, 3) if self._long_latency is not None else None,
+        }
+
+
+class AdmissionStats:
+    """Route class limiters of this process, served at ``/health/metrics``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._limiters: dict[str, AdmissionLimiter] = {}
+
+    def register(self, route_class: str, limiter: AdmissionLimiter) -> None:
+        with self._lock:
+            self._limiters[route_class] = limiter
+
+    def snapshot(self) -> dict[str, dict[str, float | int | None]]:
+        with self._lock:
+            return {name: limiter.snapshot() for name, limiter in sorted(self._limiters.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._limiters.clear()
+
+
+admission_stats = AdmissionStats()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import importlib.util
+import zlib
+from typing import Protocol
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/problem+json",
+    "application/x-ndjson",
+    "text/",
+)
+# Server-sent events must reach the client as soon as they are written.
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+class Encoder(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes:
+        """Emit everything buffered so far so a streamed chunk can be decoded on arrival."""
+        ...
+
+    def finish(self) -> bytes: ...
+
+
+class GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int) -> None:
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self, level: int) -> None:
+        import zstandard
+
+        self._zstandard = zstandard
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(self._zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(self._zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+# brotli and zstandard are optional; an encoding whose module is missing is never offered.
+_ENCODING_MODULES = {"gzip": None, "br": "brotli", "zstd": "zstandard"}
+
+
+def available_encodings(preferred: list[str]) -> list[str]:
+    """``preferred`` filtered down to encodings whose libraries are installed, in order."""
+    available = []
+    for encoding in preferred:
+        module = _ENCODING_MODULES.get(encoding, "")
+        if module is None or (module and importlib.util.find_spec(module) is not None):
+            available.append(encoding)
+    return available
+
+
+def make_encoder(encoding: str, *, gzip_level: int, brotli_quality: int, zstd_level: int) -> Encoder:
+    if encoding == "gzip":
+        return GzipEncoder(gzip_level)
+    if encoding == "br":
+        return BrotliEncoder(brotli_quality)
+    if encoding == "zstd":
+        return ZstdEncoder(zstd_level)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def negotiate_encoding(accept_encoding: str, offered: list[str]) -> str | None:
+    """Pick an encoding from ``offered`` for an ``Accept-Encoding`` header (RFC 9110 section 12.5.3).
+
+    The highest q-value wins; ties go to the earlier entry in ``offered``. ``*``
+    covers encodings not named explicitly, and ``q=0`` rules an encoding out.
+    """
+    weights: dict[str, float] = {}
+    wildcard: float | None = None
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name == "*":
+            wildcard = quality
+        else:
+            weights[name] = quality
+
+    best: str | None = None
+    best_quality = 0.0
+    for encoding in offered:
+        quality = weights.get(encoding, wildcard if wildcard is not None else 0.0)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(UNCOMPRESSED_TYPES)
@@ -1,24 +1,69 @@
 from __future__ import annotations
 
+from typing import Annotated
+
 from pydantic import AliasChoices, Field, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
     database_url: str = Field(..., alias="DATABASE_URL")
+    db_pool_size: int = Field(5, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout_seconds: float = Field(30.0, alias="DB_POOL_TIMEOUT_SECONDS")
+    db_pool_recycle_seconds: int = Field(1800, alias="DB_POOL_RECYCLE_SECONDS")
+    db_pool_pre_ping: bool = Field(True, alias="DB_POOL_PRE_PING")
+    db_pool_slow_checkout_ms: float = Field(100.0, alias="DB_POOL_SLOW_CHECKOUT_MS")
+    db_pgbouncer_mode: bool = Field(False, alias="DB_PGBOUNCER_MODE")
+    database_replica_urls: Annotated[list[str], NoDecode] = Field(default_factory=list, alias="DATABASE_REPLICA_URLS")
+    db_replica_max_lag_seconds: float = Field(5.0, alias="DB_REPLICA_MAX_LAG_SECONDS")
+    db_replica_check_interval_seconds: float = Field(5.0, alias="DB_REPLICA_CHECK_INTERVAL_SECONDS")
+    db_read_your_writes_seconds: float = Field(10.0, alias="DB_READ_YOUR_WRITES_SECONDS")
     jwt_secret_key: str = Field(..., alias="JWT_SECRET_KEY")
     jwt_algorithm: str = Field("HS256", alias="JWT_ALGORITHM")
+    jwt_backend: str = Field("jose", alias="JWT_BACKEND")
+    jwt_claims_cache_size: int = Field(10000, alias="JWT_CLAIMS_CACHE_SIZE")
     access_token_expire_minutes: int = Field(30, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
     refresh_token_expire_days: int = Field(7, alias="REFRESH_TOKEN_EXPIRE_DAYS")
+    refresh_revocation_cache_enabled: bool = Field(False, alias="REFRESH_REVOCATION_CACHE_ENABLED")
+    refresh_token_prune_batch_size: int = Field(1000, alias="REFRESH_TOKEN_PRUNE_BATCH_SIZE")
     rate_limit_enabled: bool = Field(True, alias="RATE_LIMIT_ENABLED")
     rate_limit_default: str = Field("100/minute", alias="RATE_LIMIT_DEFAULT")
     rate_limit_auth: str = Field("10/minute", alias="RATE_LIMIT_AUTH")
+    rate_limit_default_backend: str = Field("local", alias="RATE_LIMIT_DEFAULT_BACKEND")
+    rate_limit_sync_interval_seconds: float = Field(1.0, alias="RATE_LIMIT_SYNC_INTERVAL_SECONDS")
+    admission_control_enabled: bool = Field(True, alias="ADMISSION_CONTROL_ENABLED")
+    admission_auth_concurrency: int = Field(8, alias="ADMISSION_AUTH_CONCURRENCY")
+    admission_task_write_concurrency: int = Field(12, alias="ADMISSION_TASK_WRITE_CONCURRENCY")
+    admission_task_read_concurrency: int = Field(16, alias="ADMISSION_TASK_READ_CONCURRENCY")
+    admission_min_concurrency: int = Field(2, alias="ADMISSION_MIN_CONCURRENCY")
+    admission_queue_size: int = Field(32, alias="ADMISSION_QUEUE_SIZE")
+    admission_queue_timeout_ms: float = Field(250.0, alias="ADMISSION_QUEUE_TIMEOUT_MS")
     redis_url: str | None = Field(None, alias="REDIS_URL")
     task_classification_mode: str = Field("async", alias="TASK_CLASSIFICATION_MODE")
     task_queue_name: str = Field("task-classification", alias="TASK_QUEUE_NAME")
+    task_maintenance_queue_name: str = Field("task-maintenance", alias="TASK_MAINTENANCE_QUEUE_NAME")
     task_queue_retry_max: int = Field(3, alias="TASK_QUEUE_RETRY_MAX")
+    worker_processes: int = Field(2, alias="WORKER_PROCESSES")
+    worker_max_jobs_per_child: int = Field(1000, alias="WORKER_MAX_JOBS_PER_CHILD")
+    worker_drain_timeout_seconds: float = Field(90.0, alias="WORKER_DRAIN_TIMEOUT_SECONDS")
+    task_partition_months_ahead: int = Field(3, alias="TASK_PARTITION_MONTHS_AHEAD")
+    task_partition_retention_months: int = Field(0, alias="TASK_PARTITION_RETENTION_MONTHS")
+    task_archive_after_days: int = Field(0, alias="TASK_ARCHIVE_AFTER_DAYS")
+    task_archive_batch_size: int = Field(1000, alias="TASK_ARCHIVE_BATCH_SIZE")
+    task_count_estimate_threshold: int = Field(100000, alias="TASK_COUNT_ESTIMATE_THRESHOLD")
+    task_cache_enabled: bool = Field(False, alias="TASK_CACHE_ENABLED")
+    task_cache_ttl_seconds: int = Field(300, alias="TASK_CACHE_TTL_SECONDS")
+    task_cache_list_ttl_seconds: int = Field(60, alias="TASK_CACHE_LIST_TTL_SECONDS")
+    task_bulk_update_max_rows: int = Field(1000, alias="TASK_BULK_UPDATE_MAX_ROWS")
+    task_bulk_delete_chunk_size: int = Field(1000, alias="TASK_BULK_DELETE_CHUNK_SIZE")
+    task_bulk_delete_job_timeout_seconds: int = Field(3600, alias="TASK_BULK_DELETE_JOB_TIMEOUT_SECONDS")
+    task_events_buffer_size: int = Field(100, alias="TASK_EVENTS_BUFFER_SIZE")
+    task_events_history: int = Field(1000, alias="TASK_EVENTS_HISTORY")
+    task_events_keepalive_seconds: float = Field(15.0, alias="TASK_EVENTS_KEEPALIVE_SECONDS")
+    task_events_retry_ms: int = Field(3000, alias="TASK_EVENTS_RETRY_MS")
     environment: str = Field("development", validation_alias=AliasChoices("ENV", "APP_ENV"))
     trusted_hosts: list[str] = Field(
         default_factory=lambda: ["localhost", "127.0.0.1", "testserver"],
@@ -30,8 +75,32 @@ class Settings(BaseSettings):
     security_headers_enabled: bool = Field(True, alias="SECURITY_HEADERS_ENABLED")
     hsts_max_age_seconds: int = Field(31536000, alias="HSTS_MAX_AGE_SECONDS")
     referrer_policy: str = Field("strict-origin-when-cross-origin", alias="REFERRER_POLICY")
+    sql_instrumentation_enabled: bool = Field(True, alias="SQL_INSTRUMENTATION_ENABLED")
+    sql_slow_query_ms: float = Field(200.0, alias="SQL_SLOW_QUERY_MS")
+    server_timing_enabled: bool = Field(True, alias="SERVER_TIMING_ENABLED")
+    profiling_enabled: bool = Field(False, alias="PROFILING_ENABLED")
+    profiling_sample_rate: float = Field(0.0, alias="PROFILING_SAMPLE_RATE")
+    profiling_header: str = Field("X-Profile", alias="PROFILING_HEADER")
+    profiling_interval_ms: float = Field(5.0, alias="PROFILING_INTERVAL_MS")
+    profiling_output_dir: str = Field("profiles", alias="PROFILING_OUTPUT_DIR")
+    profiling_format: str = Field("speedscope", alias="PROFILING_FORMAT")
+    compression_enabled: bool = Field(True, alias="COMPRESSION_ENABLED")
+    compression_encodings: Annotated[list[str], NoDecode] = Field(
+        default_factory=lambda: ["zstd", "br", "gzip"],
+        alias="COMPRESSION_ENCODINGS",
+    )
+    compression_min_size: int = Field(1024, alias="COMPRESSION_MIN_SIZE")
+    compression_gzip_level: int = Field(5, alias="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(4, alias="COMPRESSION_BROTLI_QUALITY")
+    compression_zstd_level: int = Field(3, alias="COMPRESSION_ZSTD_LEVEL")
 
-    @field_validator("trusted_hosts", "cors_allowed_origins", mode="before")
+    @field_validator(
+        "trusted_hosts",
+        "cors_allowed_origins",
+        "database_replica_urls",
+        "compression_encodings",
+        mode="before",
+    )
     @classmethod
     def _parse_csv_list(cls, value: str | list[str] | tuple[str, ...] | None) -> list[str]:
         if value is None:
@@ -54,12 +123,63 @@ class Settings(BaseSettings):
             raise ValueError("JWT_SECRET_KEY must be set")
         if secret == "change-me" and not self.is_development():
             raise ValueError("JWT_SECRET_KEY must be set to a strong value outside development")
+        if self.jwt_backend not in {"jose", "pyjwt"}:
+            raise ValueError("JWT_BACKEND must be 'jose' or 'pyjwt'")
+        if self.rate_limit_default_backend not in {"local", "slowapi"}:
+            raise ValueError("RATE_LIMIT_DEFAULT_BACKEND must be 'local' or 'slowapi'")
+        if self.rate_limit_sync_interval_seconds <= 0:
+            raise ValueError("RATE_LIMIT_SYNC_INTERVAL_SECONDS must be > 0")
+        if self.admission_min_concurrency < 1 or self.admission_min_concurrency > min(
+            self.admission_auth_concurrency,
+            self.admission_task_write_concurrency,
+            self.admission_task_read_concurrency,
+        ):
+            raise ValueError("ADMISSION_MIN_CONCURRENCY must be >= 1 and at most every ADMISSION_*_CONCURRENCY")
+        if self.admission_queue_size < 0:
+            raise ValueError("ADMISSION_QUEUE_SIZE must be >= 0")
+        if self.admission_queue_timeout_ms <= 0:
+            raise ValueError("ADMISSION_QUEUE_TIMEOUT_MS must be > 0")
         if self.task_classification_mode not in {"sync", "async"}:
             raise ValueError("TASK_CLASSIFICATION_MODE must be 'sync' or 'async'")
         if self.task_classification_mode == "async" and not self.redis_url:
             raise ValueError("REDIS_URL must be set when TASK_CLASSIFICATION_MODE=async")
+        if self.worker_processes < 1:
+            raise ValueError("WORKER_PROCESSES must be >= 1")
+        if self.worker_max_jobs_per_child < 0:
+            raise ValueError("WORKER_MAX_JOBS_PER_CHILD must be >= 0")
+        if self.task_cache_ttl_seconds < 1 or self.task_cache_list_ttl_seconds < 1:
+            raise ValueError("TASK_CACHE_TTL_SECONDS and TASK_CACHE_LIST_TTL_SECONDS must be >= 1")
+        if self.task_bulk_update_max_rows < 1:
+            raise ValueError("TASK_BULK_UPDATE_MAX_ROWS must be >= 1")
+        if self.task_bulk_delete_chunk_size < 1:
+            raise ValueError("TASK_BULK_DELETE_CHUNK_SIZE must be >= 1")
+        if self.task_archive_after_days < 0:
+            raise ValueError("TASK_ARCHIVE_AFTER_DAYS must be >= 0")
+        if self.task_archive_batch_size < 1:
+            raise ValueError("TASK_ARCHIVE_BATCH_SIZE must be >= 1")
+        if self.db_pool_size < 1:
+            raise ValueError("DB_POOL_SIZE must be >= 1")
+        if self.db_max_overflow < -1:
+            raise ValueError("DB_MAX_OVERFLOW must be >= -1")
+        if self.task_events_buffer_size < 1:
+            raise ValueError("TASK_EVENTS_BUFFER_SIZE must be >= 1")
         if self.hsts_max_age_seconds < 0:
             raise ValueError("HSTS_MAX_AGE_SECONDS must be >= 0")
+        if not 0.0 <= self.profiling_sample_rate <= 1.0:
+            raise ValueError("PROFILING_SAMPLE_RATE must be between 0 and 1")
+        if self.profiling_interval_ms <= 0:
+            raise ValueError("PROFILING_INTERVAL_MS must be > 0")
+        if self.profiling_format not in {"speedscope", "collapsed"}:
+            raise ValueError("PROFILING_FORMAT must be 'speedscope' or 'collapsed'")
+        unknown_encodings = set(self.compression_encodings) - {"zstd", "br", "gzip"}
+        if unknown_encodings:
+            raise ValueError(f"COMPRESSION_ENCODINGS has unsupported values: {', '.join(sorted(unknown_encodings))}")
+        if not 1 <= self.compression_gzip_level <= 9:
+            raise ValueError("COMPRESSION_GZIP_LEVEL must be between 1 and 9")
+        if not 0 <= self.compression_brotli_quality <= 11:
+            raise ValueError("COMPRESSION_BROTLI_QUALITY must be between 0 and 11")
+        if not 1 <= self.compression_zstd_level <= 22:
+            raise ValueError("COMPRESSION_ZSTD_LEVEL must be between 1 and 22")
 
 
 settings = Settings()
@@ -7,16 +7,19 @@ from app.core.config import settings
 
 
 def _build_limiter() -> Limiter:
+    # With the local backend, RateLimitMiddleware enforces RATE_LIMIT_DEFAULT and
+    # slowapi only handles the strict per-route limits on the auth endpoints.
+    default_limits = [settings.rate_limit_default] if settings.rate_limit_default_backend == "slowapi" else []
     if settings.redis_url:
         return Limiter(
             key_func=get_remote_address,
             storage_uri=settings.redis_url,
-            default_limits=[settings.rate_limit_default],
+            default_limits=default_limits,
             enabled=settings.rate_limit_enabled,
         )
     return Limiter(
         key_func=get_remote_address,
-        default_limits=[settings.rate_limit_default],
+        default_limits=default_limits,
         enabled=settings.rate_limit_enabled,
     )
 
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Any
+
+from app.core.sql_instrumentation import RequestQueryStats
+
+logger = logging.getLogger(__name__)
+
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+# Top frames of threads parked in a pool or on a lock; sampling them only adds noise.
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py", "concurrent/futures/thread.py")
+
+FrameKey = tuple[str, str, int]
+
+
+def is_valid_request_id(value: str) -> bool:
+    return bool(_REQUEST_ID_PATTERN.match(value))
+
+
+class RequestProfile:
+    """Wall-clock stack samples and SQL counters for a single request.
+
+    A background thread snapshots ``sys._current_frames()`` every ``interval``
+    seconds. Samples are kept for the thread that started the profile and for any
+    thread that executes SQL on the request's behalf (sync endpoints and
+    dependencies run in the threadpool); other threads are discarded when the
+    profile stops. Under concurrency a pooled thread may carry samples from other
+    requests it served during the window, so profiles are most precise at low load.
+    """
+
+    def __init__(self, request_id: str, interval: float, query_stats: RequestQueryStats) -> None:
+        self.request_id = request_id
+        self.interval = interval
+        self.query_stats = query_stats
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._threads = {threading.get_ident()}
+        self._samples: dict[int, list[tuple[FrameKey, ...]]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name=f"profiler-{self.request_id}", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.duration = time.perf_counter() - self.started_at
+        threads = self._threads | self.query_stats.thread_ids
+        with self._lock:
+            self._samples = {tid: stacks for tid, stacks in self._samples.items() if tid in threads}
+
+    @property
+    def sample_count(self) -> int:
+        return sum(len(stacks) for stacks in self._samples.values())
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id, frame in frames.items():
+                if thread_id == own_id or _is_idle(frame):
+                    continue
+                stack = _stack(frame)
+                with self._lock:
+                    self._samples.setdefault(thread_id, []).append(stack)
+
+    def speedscope(self, name: str) -> dict[str, Any]:
+        frame_index: dict[FrameKey, int] = {}
+        frames: list[dict[str, Any]] = []
+        profiles = []
+        interval_ms = self.interval * 1000
+        for thread_id, stacks in sorted(self._samples.items()):
+            samples = []
+            for stack in stacks:
+                indices = []
+                for key in stack:
+                    if key not in frame_index:
+                        frame_index[key] = len(frames)
+                        frames.append({"name": key[1], "file": key[0], "line": key[2]})
+                    indices.append(frame_index[key])
+                samples.append(indices)
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": f"thread {thread_id}",
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": round(len(samples) * interval_ms, 3),
+                    "samples": samples,
+                    "weights": [interval_ms] * len(samples),
+                }
+            )
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "app.core.profiling",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def collapsed(self) -> str:
+        counts: dict[str, int] = {}
+        for thread_id, stacks in self._samples.items():
+            for stack in stacks:
+                line = ";".join([f"thread {thread_id}", *(f"{key[1]} ({key[0]}:{key[2]})" for key in stack)])
+                counts[line] = counts.get(line, 0) + 1
+        return "".join(f"{line} {count}\n" for line, count in sorted(counts.items()))
+
+
+def _is_idle(frame: FrameType) -> bool:
+    return frame.f_code.co_filename.endswith(_IDLE_FILES)
+
+
+def _stack(frame: FrameType | None) -> tuple[FrameKey, ...]:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_filename, code.co_name, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+def save_profile(profile: RequestProfile, directory: str, fmt: str, metadata: dict[str, Any]) -> str:
+    """Write the profile and a ``<request id>.json`` summary; returns the profile path."""
+    os.makedirs(directory, exist_ok=True)
+    summary = {
+        "request_id": profile.request_id,
+        **metadata,
+        "duration_ms": round(profile.duration * 1000, 3),
+        "db_queries": profile.query_stats.query_count,
+        "db_time_ms": round(profile.query_stats.total_seconds * 1000, 3),
+        "db_slowest_ms": round(profile.query_stats.slowest_seconds * 1000, 3),
+        "samples": profile.sample_count,
+        "interval_ms": profile.interval * 1000,
+    }
+    base = os.path.join(directory, profile.request_id)
+    if fmt == "collapsed":
+        path = f"{base}.collapsed.txt"
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(profile.collapsed())
+    else:
+        path = f"{base}.speedscope.json"
+        name = f"{metadata.get('method', '')} {metadata.get('path', '')}".strip() or profile.request_id
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(profile.speedscope(name), handle)
+    with open(f"{base}.json", "w", encoding="utf-8") as handle:
+        json.dump({**summary, "profile": os.path.basename(path)}, handle, indent=2)
+    logger.info(
+        "Profiled %s %s in %.1fms (%s queries, %.1fms SQL): %s",
+        metadata.get("method"),
+        metadata.get("path"),
+        summary["duration_ms"],
+        summary["db_queries"],
+        summary["db_time_ms"],
+        path,
+    )
+    return path
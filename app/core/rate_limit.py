@@ -0,0 +1,270 @@
+"""Approximate distributed rate limiting with local token buckets.
+
+Each process admits requests from in-memory token buckets, so the request path
+never waits on Redis. A background thread reports what each bucket spent every
+``RATE_LIMIT_SYNC_INTERVAL_SECONDS`` in one pipelined round trip. The reply
+resets the bucket to this process's share of what the whole fleet has left.
+
+Redis keeps a sliding-window counter per key: one hash per fixed window with a
+field per process. The fleet-wide estimate is the current window plus the
+previous one weighted by how much of it still overlaps. A key that ``n``
+processes spent on in those two windows gives each of them ``1/n`` of what the
+estimate leaves, refilled as the previous window ages out.
+
+Accuracy, for a limit of ``L`` per period ``P`` synced every ``T`` by ``n``
+processes serving a key (``tests/test_rate_limit.py`` checks these):
+
+* Under sustained load any ``P``-second span admits at most
+  ``L * (1 + T / P) + n``. Tokens spent between syncs account for the
+  ``T / P`` term, and fractional tokens left in each process for the ``n``.
+  The same fractions can leave a busy key slightly under ``L``.
+* The sliding window assumes the previous window's requests were spread evenly.
+  A burst packed at the end of one window can let up to ``2 * L`` through in
+  the following ``P`` seconds, like a fixed window across its boundary. A
+  process meeting a key for the first time starts from ``L / N`` tokens, where
+  ``N`` is the number of live processes, which keeps cold starts inside the
+  same ``2 * L``.
+* Without Redis, or while it is unreachable, each process enforces ``L`` on
+  its own, so ``N`` processes admit up to ``N * L``.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Protocol
+from uuid import uuid4
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit"
+# Keys idle for this many periods are dropped from memory.
+IDLE_PERIODS = 2
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    amount: int
+    period_seconds: float
+
+    @classmethod
+    def parse(cls, value: str) -> RateLimit:
+        """Parse slowapi's notation, e.g. ``100/minute`` or ``5 per 10 seconds``."""
+        from limits import parse
+
+        item = parse(value)
+        return cls(amount=item.amount, period_seconds=float(item.get_expiry()))
+
+    @property
+    def rate(self) -> float:
+        return self.amount / self.period_seconds
+
+    def __str__(self) -> str:
+        return f"{self.amount} per {self.period_seconds:g} seconds"
+
+
+class CounterStore(Protocol):
+    def sync(
+        self, batch: dict[str, int], limit: RateLimit, now: float
+    ) -> tuple[int, dict[str, tuple[int, int, int]]] | None:
+        """Add ``batch`` (key -> requests admitted since the last sync) to the shared counters.
+
+        Returns the number of live processes and, per key, the fleet-wide count
+        for the current and the previous window plus how many processes spent
+        on it in either. ``None`` means the store is unavailable.
+        """
+        ...
+
+
+class RedisCounterStore:
+    """Sliding-window counters in Redis shared by every process using the same limit."""
+
+    def __init__(self, redis_url: str, *, process_ttl_seconds: float, prefix: str = KEY_PREFIX) -> None:
+        self._redis_url = redis_url
+        self._client: Redis | None = None
+        self._prefix = prefix
+        self._process_ttl_seconds = process_ttl_seconds
+        self.process_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+    def _redis(self) -> Redis:
+        if self._client is None:
+            from redis import Redis
+
+            self._client = Redis.from_url(self._redis_url)
+        return self._client
+
+    def sync(
+        self, batch: dict[str, int], limit: RateLimit, now: float
+    ) -> tuple[int, dict[str, tuple[int, int, int]]] | None:
+        from redis.exceptions import RedisError
+
+        window = int(now // limit.period_seconds)
+        processes_key = f"{self._prefix}:processes"
+
+        pipe = self._redis().pipeline(transaction=False)
+        pipe.zadd(processes_key, {self.process_id: now})
+        pipe.zremrangebyscore(processes_key, "-inf", now - self._process_ttl_seconds)
+        pipe.zcard(processes_key)
+        for key, count in batch.items():
+            current = f"{self._prefix}:{key}:{window}"
+            if count:
+                pipe.hincrby(current, self.process_id, count)
+                pipe.expire(current, int(2 * limit.period_seconds) + 1)
+            pipe.hgetall(current)
+            pipe.hgetall(f"{self._prefix}:{key}:{window - 1}")
+        try:
+            replies = iter(pipe.execute())
+        except RedisError:
+            logger.warning("Rate limit sync with Redis failed; enforcing limits locally", exc_info=True)
+            return None
+
+        next(replies), next(replies)
+        processes = max(1, int(next(replies)))
+        results = {}
+        own_field = self.process_id.encode("utf-8")
+        for key, count in batch.items():
+            if count:
+                next(replies), next(replies)
+            current, previous = next(replies), next(replies)
+            results[key] = (
+                sum(int(value) for value in current.values()),
+                sum(int(value) for value in previous.values()),
+                len(set(current) | set(previous) | {own_field}),
+            )
+        return processes, results
+
+
+class _Bucket:
+    __slots__ = ("capacity", "pending", "refill_rate", "tokens", "touched", "updated")
+
+    def __init__(self, capacity: float, refill_rate: float, now: float) -> None:
+        self.tokens = capacity
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.updated = now
+        self.touched = now
+        self.pending = 0
+
+
+class LocalRateLimiter:
+    """Token buckets per key, reconciled with a shared ``CounterStore`` in the background.
+
+    Without a store each bucket holds the full limit and refills at the limit's
+    rate, which makes it an exact per-process limiter.
+    """
+
+    def __init__(
+        self,
+        limit: RateLimit,
+        *,
+        store: CounterStore | None = None,
+        sync_interval_seconds: float = 1.0,
+        background: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.limit = limit
+        self._store = store
+        self._sync_interval_seconds = sync_interval_seconds
+        self._background = background and store is not None
+        self._clock = clock
+        self._buckets: dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+        self._processes = 1
+        self._flusher_pid: int | None = None
+
+    def acquire(self, key: str) -> float:
+        """Spend a token for ``key``; returns 0 when admitted, else seconds until one is due."""
+        if self._background and self._flusher_pid != os.getpid():
+            self._start_flusher()
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                share = 1 / self._processes
+                bucket = self._buckets[key] = _Bucket(self.limit.amount * share, self.limit.rate * share, now)
+            else:
+                refill = (now - bucket.updated) * bucket.refill_rate
+                bucket.tokens = min(bucket.capacity, bucket.tokens + refill)
+                bucket.updated = now
+            bucket.touched = now
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                bucket.pending += 1
+                return 0.0
+            # A key that has used its whole window gets tokens back once older counts age out.
+            refill_rate = bucket.refill_rate or self.limit.rate * bucket.capacity / self.limit.amount
+            return (1 - bucket.tokens) / refill_rate
+
+    def sync(self) -> None:
+        """Report spent tokens to the store and rebase every active bucket on its reply."""
+        if self._store is None:
+            return
+        now = self._clock()
+        idle_after = IDLE_PERIODS * self.limit.period_seconds
+        with self._lock:
+            batch = {}
+            for key, bucket in list(self._buckets.items()):
+                if bucket.pending == 0 and now - bucket.touched > idle_after:
+                    del self._buckets[key]
+                    continue
+                batch[key] = bucket.pending
+                bucket.pending = 0
+        if not batch:
+            return
+
+        reply = self._store.sync(batch, self.limit, now)
+        period = self.limit.period_seconds
+        previous_weight = 1 - (now % period) / period
+        with self._lock:
+            if reply is None:
+                # Report these again next time rather than losing them, and fall back
+                # to the full local limit: a share and refill rate rebased on the fleet
+                # would otherwise stay in force for as long as the store is down.
+                self._processes = 1
+                for key, count in batch.items():
+                    bucket = self._buckets.get(key)
+                    if bucket is not None:
+                        bucket.pending += count
+                for bucket in self._buckets.values():
+                    refill = (now - bucket.updated) * bucket.refill_rate
+                    bucket.tokens = min(bucket.capacity, bucket.tokens + refill)
+                    bucket.capacity = float(self.limit.amount)
+                    bucket.refill_rate = self.limit.rate
+                    bucket.updated = now
+                return
+            self._processes, results = reply
+            for key, (current, previous, active) in results.items():
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    continue
+                share = 1 / max(1, active)
+                remaining = max(0.0, self.limit.amount - current - previous * previous_weight)
+                # Requests admitted while the sync was in flight are not in the counts yet.
+                bucket.tokens = max(0.0, remaining * share - bucket.pending)
+                bucket.capacity = self.limit.amount * share
+                # Until the next sync, the allowance grows only as the previous window ages out.
+                bucket.refill_rate = previous / period * share
+                bucket.updated = now
+
+    def _start_flusher(self) -> None:
+        with self._lock:
+            # Forked children inherit the flag but not the thread.
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_forever, name="rate-limit-sync", daemon=True).start()
+
+    def _flush_forever(self) -> None:
+        while True:
+            time.sleep(self._sync_interval_seconds)
+            try:
+                self.sync()
+            except Exception:
+                logger.exception("Rate limit sync failed")
@@ -1,23 +1,39 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from functools import cache
 import hashlib
+import threading
+import time
+from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from jose import jwt
-from passlib.context import CryptContext
+from jose import JWTError
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+_claims_cache: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+_claims_cache_lock = threading.Lock()
+
+
+@cache
+def pwd_context() -> CryptContext:
+    """The bcrypt context, built on first use so importing the app does not load passlib."""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(password, hashed_password)
+    return pwd_context().verify(password, hashed_password)
 
 
 def _utc_now() -> datetime:
@@ -33,6 +49,8 @@ def create_access_token(subject: str, role: str) -> str:
         "iat": int(_utc_now().timestamp()),
         "exp": int(expire.timestamp()),
     }
+    from jose import jwt
+
     return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
 
 
@@ -46,13 +64,61 @@ def create_refresh_token(subject: str, role: str) -> tuple[str, datetime]:
         "iat": int(_utc_now().timestamp()),
         "exp": int(expire.timestamp()),
     }
+    from jose import jwt
+
     token = jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
     return token, expire
 
 
-def decode_token(token: str) -> dict:
+def _decode_with_backend(token: str) -> dict:
+    if settings.jwt_backend == "pyjwt":
+        import jwt as pyjwt
+
+        try:
+            return pyjwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+        except pyjwt.PyJWTError as exc:
+            raise JWTError(str(exc)) from exc
+    from jose import jwt
+
     return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
 
 
+def decode_token(token: str) -> dict:
+    """Verify ``token`` and return its claims.
+
+    Verified claims are kept in a bounded LRU keyed by the token's digest until
+    the token's ``exp``, so a bearer token reused across requests is only
+    verified once. Failures are never cached.
+    """
+    if settings.jwt_claims_cache_size <= 0:
+        return _decode_with_backend(token)
+
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    now = time.time()
+    with _claims_cache_lock:
+        entry = _claims_cache.get(key)
+        if entry is not None:
+            claims, expires_at = entry
+            if expires_at > now:
+                _claims_cache.move_to_end(key)
+                return dict(claims)
+            del _claims_cache[key]
+
+    claims = _decode_with_backend(token)
+    expires_at = claims.get("exp")
+    if isinstance(expires_at, int | float):
+        with _claims_cache_lock:
+            _claims_cache[key] = (dict(claims), float(expires_at))
+            _claims_cache.move_to_end(key)
+            while len(_claims_cache) > settings.jwt_claims_cache_size:
+                _claims_cache.popitem(last=False)
+    return claims
+
+
+def clear_claims_cache() -> None:
+    with _claims_cache_lock:
+        _claims_cache.clear()
+
+
 def hash_token(token: str) -> str:
     return hashlib.sha256(token.encode("utf-8")).hexdigest()
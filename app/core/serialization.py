@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+import orjson
+
+# Pydantic writes zero-offset datetimes as "Z"; orjson needs this flag to match.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def dump_rows(fields: Sequence[str], rows: Iterable[Sequence[object]]) -> bytes:
+    """Encode result rows as a JSON array of objects keyed by ``fields``, in order.
+
+    Produces the same bytes as Pydantic's ``dump_json`` for models whose fields are
+    plain strings, ints, UUIDs, str enums and datetimes, without building or
+    validating model instances. Callers own that guarantee; ``tests/test_serialization.py``
+    pins it for the task listing.
+    """
+    return orjson.dumps([dict(zip(fields, row)) for row in rows], option=ORJSON_OPTIONS)
+
+
+def dump_row(fields: Sequence[str], row: Sequence[object]) -> bytes:
+    """Encode one result row as a JSON object; see ``dump_rows``."""
+    return orjson.dumps(dict(zip(fields, row)), option=ORJSON_OPTIONS)
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_PREVIEW_CHARS = 300
+
+_current_stats: ContextVar[RequestQueryStats | None] = ContextVar("request_query_stats", default=None)
+_hooks_installed = False
+_hooks_lock = threading.Lock()
+_captures: list[list[RequestQueryStats]] = []
+_captures_lock = threading.Lock()
+
+
+class RequestQueryStats:
+    """Statements executed on behalf of one request, across every engine and thread."""
+
+    def __init__(self, record_statements: bool = False) -> None:
+        self._lock = threading.Lock()
+        self.route: str | None = None
+        self.query_count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: str | None = None
+        self.thread_ids: set[int] = set()
+        self.statements: list[str] | None = [] if record_statements else None
+
+    def record(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.query_count += 1
+            self.total_seconds += seconds
+            self.thread_ids.add(threading.get_ident())
+            if seconds >= self.slowest_seconds:
+                self.slowest_seconds = seconds
+                self.slowest_statement = statement
+            if self.statements is not None:
+                self.statements.append(statement)
+
+    def server_timing(self) -> str:
+        value = f'db;dur={self.total_seconds * 1000:.2f};desc="{self.query_count} queries"'
+        if self.query_count:
+            value += f", db-slowest;dur={self.slowest_seconds * 1000:.2f}"
+        return value
+
+
+class SqlMetrics:
+    """Process-wide per-route query counters, in the spirit of ``pool_checkout_stats``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: dict[str, dict[str, float | int | str | None]] = {}
+
+    def observe(self, route: str, stats: RequestQueryStats) -> None:
+        with self._lock:
+            entry = self._routes.setdefault(
+                route,
+                {
+                    "requests": 0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "total_db_ms": 0.0,
+                    "slowest_ms": 0.0,
+                    "slowest_statement": None,
+                },
+            )
+            entry["requests"] += 1
+            entry["queries"] += stats.query_count
+            entry["max_queries"] = max(entry["max_queries"], stats.query_count)
+            entry["total_db_ms"] += stats.total_seconds * 1000
+            if stats.slowest_seconds * 1000 > entry["slowest_ms"]:
+                entry["slowest_ms"] = stats.slowest_seconds * 1000
+                entry["slowest_statement"] = (stats.slowest_statement or "")[:STATEMENT_PREVIEW_CHARS]
+
+    def snapshot(self) -> dict[str, dict[str, float | int | str | None]]:
+        with self._lock:
+            return {
+                route: {
+                    **entry,
+                    "avg_queries": entry["queries"] / entry["requests"],
+                    "avg_db_ms": entry["total_db_ms"] / entry["requests"],
+                }
+                for route, entry in sorted(self._routes.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+sql_metrics = SqlMetrics()
+
+
+def current_query_stats() -> RequestQueryStats | None:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[RequestQueryStats]:
+    """Attribute statements run in this context (and threads it spawns) to one stats object.
+
+    Nested calls share the outer stats, so the profiler and the ``Server-Timing``
+    middleware see the same numbers.
+    """
+    existing = _current_stats.get()
+    if existing is not None:
+        yield existing
+        return
+    with _captures_lock:
+        record_statements = bool(_captures)
+    stats = RequestQueryStats(record_statements=record_statements)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def finish_request(stats: RequestQueryStats, route: str, slow_query_ms: float) -> None:
+    """Feed a finished request into ``sql_metrics``, the slow query log and any test captures."""
+    stats.route = route
+    sql_metrics.observe(route, stats)
+    if slow_query_ms and stats.slowest_seconds * 1000 >= slow_query_ms:
+        logger.warning(
+            "Slow SQL on %s: %.1fms (%s queries, %.1fms total): %s",
+            route,
+            stats.slowest_seconds * 1000,
+            stats.query_count,
+            stats.total_seconds * 1000,
+            (stats.slowest_statement or "")[:STATEMENT_PREVIEW_CHARS],
+        )
+    with _captures_lock:
+        for captured in _captures:
+            captured.append(stats)
+
+
+@contextmanager
+def capture_request_stats() -> Iterator[list[RequestQueryStats]]:
+    """Collect the stats of every request finished inside the block, whichever thread served it.
+
+    Meant for tests: the ``TestClient`` runs the app in its own thread, so context
+    variables set by the test do not reach it.
+    """
+    captured: list[RequestQueryStats] = []
+    with _captures_lock:
+        _captures.append(captured)
+    try:
+        yield captured
+    finally:
+        with _captures_lock:
+            _captures.remove(captured)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+    started = conn.info.get("query_started_at")
+    if stats is None or not started:
+        return
+    stats.record(statement, time.perf_counter() - started.pop())
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    started = connection.info.get("query_started_at") if connection is not None else None
+    if started:
+        started.pop()
+
+
+def install_sql_hooks() -> None:
+    """Listen on every engine, including replicas created later."""
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        _hooks_installed = True
@@ -1,21 +1,324 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Generator, Iterable
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 
-from app.core.config import settings
+from app.core.config import Settings, settings
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine: Engine = create_engine(settings.database_url, pool_pre_ping=True)
+class PoolCheckoutStats:
+    """Process-wide counters for time spent waiting on a pooled connection."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            average = self.total_wait_seconds / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "total_wait_ms": self.total_wait_seconds * 1000,
+                "avg_wait_ms": average * 1000,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.total_wait_seconds = 0.0
+            self.max_wait_seconds = 0.0
+
+
+pool_checkout_stats = PoolCheckoutStats()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long callers block waiting for a free connection."""
+
+    slow_checkout_seconds = 0.1
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            pool_checkout_stats.record(waited)
+            if waited >= self.slow_checkout_seconds:
+                logger.warning(
+                    "Waited %.1fms for a database connection (pool size=%s, checked out=%s, overflow=%s)",
+                    waited * 1000,
+                    self.size(),
+                    self.checkedout(),
+                    self.overflow(),
+                )
+
+
+def engine_options(config: Settings) -> dict[str, Any]:
+    """Keyword arguments for ``create_engine`` derived from the pool settings."""
+    options: dict[str, Any] = {"pool_pre_ping": config.db_pool_pre_ping}
+
+    if config.db_pgbouncer_mode:
+        # pgbouncer owns pooling in transaction mode; a second pool in front of it
+        # only pins server connections, and prepared statements do not survive
+        # being routed to a different server connection. Every checkout is a new
+        # connection, so a pre-ping would only add a round trip.
+        options["poolclass"] = NullPool
+        options["pool_pre_ping"] = False
+        if make_url(config.database_url).get_driver_name() == "psycopg":
+            options["connect_args"] = {"prepare_threshold": None}
+        return options
+
+    TimedQueuePool.slow_checkout_seconds = config.db_pool_slow_checkout_ms / 1000
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout_seconds,
+        pool_recycle=config.db_pool_recycle_seconds,
+    )
+    return options
+
+
+engine: Engine = create_engine(settings.database_url, **engine_options(settings))
+
+# Task writes fetch server-generated columns with RETURNING (``eager_defaults``),
+# so committed objects stay valid without a refresh SELECT.
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+RECENT_WRITE_KEY_PREFIX = "db:recent-write"
+# Checked before every replica read, so a slow Redis must not cost more than the primary.
+RECENT_WRITE_REDIS_TIMEOUT_SECONDS = 0.25
+
+
+class _Replica:
+    def __init__(self, url: str, config: Settings) -> None:
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = create_engine(url, **engine_options(config))
+        self.sessionmaker = sessionmaker(bind=self.engine, autoflush=False, autocommit=False)
+        self.healthy = True
+        self.lag_seconds = 0.0
+        self.checked_at = float("-inf")
+        self.lock = threading.Lock()
+
+
+class ReplicaRouter:
+    """Chooses where read-only sessions go.
+
+    Replicas are used only while their measured replay lag is within
+    ``DB_REPLICA_MAX_LAG_SECONDS``, and never for a user who wrote in the last
+    ``DB_READ_YOUR_WRITES_SECONDS``. Writes are remembered in this process and,
+    when ``REDIS_URL`` is set, as a Redis key per user that expires after that
+    window, so every API process sees them. Anything else, including a replica
+    that fails to connect or a Redis that cannot be asked, falls back to the
+    primary.
+    """
+
+    def __init__(self, config: Settings) -> None:
+        self._config = config
+        self._replicas = [_Replica(url, config) for url in config.database_replica_urls]
+        self._cycle = itertools.cycle(self._replicas) if self._replicas else None
+        self._recent_writes: dict[UUID, float] = {}
+        self._lock = threading.Lock()
+        self._redis_client: Redis | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._replicas)
+
+    def _redis(self) -> Redis | None:
+        if not self._config.redis_url:
+            return None
+        if self._redis_client is None:
+            with self._lock:
+                if self._redis_client is None:
+                    from redis import Redis
+
+                    self._redis_client = Redis.from_url(
+                        self._config.redis_url,
+                        socket_timeout=RECENT_WRITE_REDIS_TIMEOUT_SECONDS,
+                        socket_connect_timeout=RECENT_WRITE_REDIS_TIMEOUT_SECONDS,
+                    )
+        return self._redis_client
+
+    @staticmethod
+    def _recent_write_key(user_id: UUID) -> str:
+        return f"{RECENT_WRITE_KEY_PREFIX}:{user_id}"
+
+    def mark_write(self, user_id: UUID) -> None:
+        self.mark_writes([user_id])
+
+    def mark_writes(self, user_ids: Iterable[UUID]) -> None:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        now = time.monotonic()
+        window = self._config.db_read_your_writes_seconds
+        with self._lock:
+            for user_id in user_ids:
+                self._recent_writes[user_id] = now + window
+            if len(self._recent_writes) > 10000:
+                self._recent_writes = {key: until for key, until in self._recent_writes.items() if until > now}
+
+        client = self._redis()
+        if client is None:
+            return
+        from redis.exceptions import RedisError
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for user_id in user_ids:
+                pipe.set(self._recent_write_key(user_id), 1, px=max(1, int(window * 1000)))
+            pipe.execute()
+        except RedisError:
+            # Other processes may now serve these users from a replica within the lag limit.
+            logger.warning("Could not record recent writes in Redis", exc_info=True)
+
+    def _wrote_recently(self, user_id: UUID | None) -> bool:
+        if user_id is None:
+            return False
+        with self._lock:
+            until = self._recent_writes.get(user_id)
+        if until is not None and until > time.monotonic():
+            return True
+
+        client = self._redis()
+        if client is None:
+            return False
+        from redis.exceptions import RedisError
+
+        try:
+            return bool(client.exists(self._recent_write_key(user_id)))
+        except RedisError:
+            logger.warning("Could not check recent writes in Redis; using primary", exc_info=True)
+            return True
+
+    def _refresh(self, replica: _Replica) -> None:
+        now = time.monotonic()
+        if now - replica.checked_at < self._config.db_replica_check_interval_seconds:
+            return
+        if not replica.lock.acquire(blocking=False):
+            return
+        try:
+            with replica.engine.connect() as connection:
+                replica.lag_seconds = float(connection.execute(REPLICA_LAG_SQL).scalar_one())
+            replica.healthy = True
+        except SQLAlchemyError:
+            logger.warning("Read replica %s is unavailable; using primary", replica.name, exc_info=True)
+            replica.healthy = False
+        finally:
+            replica.checked_at = time.monotonic()
+            replica.lock.release()
+
+    def _pick(self, user_id: UUID | None) -> _Replica | None:
+        if self._cycle is None or self._wrote_recently(user_id):
+            return None
+        for _ in range(len(self._replicas)):
+            replica = next(self._cycle)
+            self._refresh(replica)
+            if replica.healthy and replica.lag_seconds <= self._config.db_replica_max_lag_seconds:
+                return replica
+        return None
+
+    def open_read_session(self, user_id: UUID | None = None) -> Session:
+        replica = self._pick(user_id)
+        if replica is None:
+            return SessionLocal()
+
+        session = replica.sessionmaker()
+        try:
+            session.connection()
+        except SQLAlchemyError:
+            session.close()
+            replica.healthy = False
+            replica.checked_at = time.monotonic()
+            logger.warning("Read replica %s refused a connection; using primary", replica.name, exc_info=True)
+            return SessionLocal()
+        return session
+
+
+replica_router = ReplicaRouter(settings)
+
+
+def _written_user_id(obj: object) -> UUID | None:
+    if getattr(obj, "__tablename__", None) == "users":
+        return getattr(obj, "id", None)
+    return getattr(obj, "owner_id", None) or getattr(obj, "user_id", None)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_written_users(session: Session, flush_context: Any) -> None:
+    if not replica_router.enabled:
+        return
+    written = session.info.setdefault("written_user_ids", set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        user_id = _written_user_id(obj)
+        if user_id is not None:
+            written.add(user_id)
+
+
+def reads_from_replica(session: Session) -> bool:
+    return session.get_bind() is not engine
+
+
+def record_written_users(session: Session, user_ids: Iterable[UUID | None]) -> None:
+    """Send these users' reads to the primary after the next commit.
+
+    The flush hook only sees the owners of ORM objects. Callers add owners
+    touched by Core statements and the user making the request, who may be an
+    admin writing someone else's tasks.
+    """
+    if not replica_router.enabled:
+        return
+    session.info.setdefault("written_user_ids", set()).update(user_id for user_id in user_ids if user_id is not None)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _mark_written_users(session: Session) -> None:
+    replica_router.mark_writes(session.info.pop("written_user_ids", ()))
+
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_written_users(session: Session) -> None:
+    session.info.pop("written_user_ids", None)
 
 
 def get_db() -> Generator[Session, None, None]:
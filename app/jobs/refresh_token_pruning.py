@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.services.refresh_tokens import prune_refresh_tokens
+
+
+def prune_refresh_tokens_job() -> int:
+    with SessionLocal() as db:
+        return prune_refresh_tokens(db, settings.refresh_token_prune_batch_size)
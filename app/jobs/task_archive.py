@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.services.task_archive import archive_completed_tasks
+
+
+def archive_tasks_job() -> int:
+    with SessionLocal() as db:
+        return archive_completed_tasks(db, settings.task_archive_after_days, settings.task_archive_batch_size)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.schemas.task import TaskFilter
+from app.services.task_bulk_delete import BulkDeleteProgress, delete_tasks_in_chunks
+
+
+def delete_tasks_job(filters: dict) -> dict[str, int]:
+    """Delete the tasks matching ``filters`` (a ``TaskFilter`` dump), recording progress in the job meta."""
+    from rq import get_current_job
+
+    job = get_current_job()
+
+    def report(progress: BulkDeleteProgress) -> None:
+        if job is not None:
+            job.meta.update(deleted=progress.deleted, chunks=progress.chunks)
+            job.save_meta()
+
+    selector = TaskFilter.model_validate(filters)
+    with SessionLocal() as db:
+        result = delete_tasks_in_chunks(db, selector, settings.task_bulk_delete_chunk_size, progress=report)
+    if job is not None:
+        job.meta.update(remaining=result.remaining)
+        job.save_meta()
+    return {"deleted": result.deleted, "chunks": result.chunks, "remaining": result.remaining}
@@ -1,19 +1,43 @@
 from __future__ import annotations
 
+import math
+import random
+import time
+from uuid import uuid4
+
+import anyio
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
+from fastapi.responses import JSONResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.api.auth import router as auth_router
 from app.api.health import router as health_router
 from app.api.tasks import router as tasks_router
+from app.core.admission import AdmissionLimiter, admission_stats
+from app.core.compression import (
+    available_encodings,
+    is_compressible,
+    make_encoder,
+    negotiate_encoding,
+)
 from app.core.config import Settings, settings
 from app.core.limiter import limiter
+from app.core.profiling import RequestProfile, is_valid_request_id, save_profile
+from app.core.rate_limit import LocalRateLimiter, RateLimit, RedisCounterStore
+from app.core.security import decode_token
+from app.core.sql_instrumentation import (
+    finish_request,
+    install_sql_hooks,
+    track_queries,
+)
 
 
 def _request_is_secure(request: Request) -> bool:
@@ -42,16 +66,333 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class RateLimitMiddleware:
+    """Enforce ``RATE_LIMIT_DEFAULT`` per user (by access token) or per client IP.
+
+    Admission is decided from local token buckets; counts reach Redis in batched
+    background syncs (see ``app.core.rate_limit`` for the accuracy bounds).
+    """
+
+    EXEMPT_PREFIXES = ("/health",)
+
+    def __init__(self, app: ASGIApp, *, app_settings: Settings) -> None:
+        self.app = app
+        limit = RateLimit.parse(app_settings.rate_limit_default)
+        store = None
+        if app_settings.redis_url:
+            # A process that has not synced for a few intervals no longer counts as live.
+            store = RedisCounterStore(
+                app_settings.redis_url,
+                process_ttl_seconds=3 * app_settings.rate_limit_sync_interval_seconds + 5,
+            )
+        self.limiter = LocalRateLimiter(
+            limit,
+            store=store,
+            sync_interval_seconds=app_settings.rate_limit_sync_interval_seconds,
+        )
+
+    @staticmethod
+    def _key(scope: Scope) -> str:
+        scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and token:
+            try:
+                claims = decode_token(token)
+            except Exception:  # noqa: BLE001
+                claims = {}
+            if claims.get("type") == "access" and claims.get("sub"):
+                return f"user:{claims['sub']}"
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = self.limiter.acquire(self._key(scope))
+        if retry_after:
+            response = JSONResponse(
+                {"error": f"Rate limit exceeded: {self.limiter.limit}"},
+                status_code=429,
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+class AdmissionControlMiddleware:
+    """Bound concurrent auth, task write and task read requests; shed the excess with 503.
+
+    Each route class has an adaptive concurrency limit and a short wait queue
+    (see ``app.core.admission``). Health checks and the ``/tasks/events``
+    stream are never queued.
+    """
+
+    EXEMPT_PATHS = ("/tasks/events",)
+    READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def __init__(self, app: ASGIApp, *, app_settings: Settings) -> None:
+        self.app = app
+        concurrency = {
+            "auth": app_settings.admission_auth_concurrency,
+            "task_writes": app_settings.admission_task_write_concurrency,
+            "task_reads": app_settings.admission_task_read_concurrency,
+        }
+        self.limiters = {
+            route_class: AdmissionLimiter(
+                max_limit=max_limit,
+                min_limit=app_settings.admission_min_concurrency,
+                max_queue=app_settings.admission_queue_size,
+                queue_timeout_seconds=app_settings.admission_queue_timeout_ms / 1000,
+            )
+            for route_class, max_limit in concurrency.items()
+        }
+        for route_class, route_limiter in self.limiters.items():
+            admission_stats.register(route_class, route_limiter)
+
+    def _route_class(self, scope: Scope) -> str | None:
+        path = scope["path"]
+        if path in self.EXEMPT_PATHS:
+            return None
+        if path == "/auth" or path.startswith("/auth/"):
+            return "auth"
+        if path == "/tasks" or path.startswith("/tasks/"):
+            return "task_reads" if scope["method"] in self.READ_METHODS else "task_writes"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route_class = self._route_class(scope) if scope["type"] == "http" else None
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[route_class]
+        retry_after = await limiter.acquire()
+        if retry_after:
+            response = JSONResponse(
+                {"error": "Service overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - started)
+
+
+OFFLOAD_COMPRESSION_BYTES = 64 * 1024
+
+
+def _compress_all(encoder, body: bytes) -> bytes:
+    return encoder.compress(body) + encoder.finish()
+
+
+class CompressionMiddleware:
+    """Compress responses with the best ``Accept-Encoding`` match among gzip, brotli and zstd.
+
+    Complete bodies below ``COMPRESSION_MIN_SIZE`` are sent as is, and so are
+    streams (``text/event-stream``, or chunks without a ``Content-Length``):
+    compressing them would hold events back in the encoder. A chunked body of
+    known length is compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp, *, app_settings: Settings) -> None:
+        self.app = app
+        self._settings = app_settings
+        self._encodings = available_encodings(app_settings.compression_encodings)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._encodings:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self._encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        encoder = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, encoder
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] in (204, 304)
+                    or "content-encoding" in headers
+                    or not is_compressible(headers.get("content-type", ""))
+                ):
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                headers = MutableHeaders(scope=start_message)
+                headers.add_vary_header("Accept-Encoding")
+                min_size = self._settings.compression_min_size
+                if more_body:
+                    declared_length = headers.get("content-length")
+                    # A stream of unknown length goes out as it is written.
+                    skip = declared_length is None or int(declared_length) < min_size
+                else:
+                    skip = len(body) < min_size
+                if skip:
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+
+                encoder = make_encoder(
+                    encoding,
+                    gzip_level=self._settings.compression_gzip_level,
+                    brotli_quality=self._settings.compression_brotli_quality,
+                    zstd_level=self._settings.compression_zstd_level,
+                )
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    if len(body) >= OFFLOAD_COMPRESSION_BYTES:
+                        # zlib, brotli and zstd release the GIL; keep big pages off the event loop.
+                        compressed = await anyio.to_thread.run_sync(_compress_all, encoder, body)
+                    else:
+                        compressed = _compress_all(encoder, body)
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                await send(start_message)
+
+            if more_body:
+                chunk = encoder.compress(body) + encoder.flush()
+            else:
+                chunk = encoder.compress(body) + encoder.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class QueryTimingMiddleware:
+    """Count the SQL each request runs and report it in ``Server-Timing`` and ``sql_metrics``."""
+
+    def __init__(self, app: ASGIApp, *, app_settings: Settings) -> None:
+        self.app = app
+        self._settings = app_settings
+        install_sql_hooks()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as query_stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start" and self._settings.server_timing_enabled:
+                    MutableHeaders(scope=message).append("Server-Timing", query_stats.server_timing())
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                # Route templates, not raw paths, keep the metrics keyed by endpoint.
+                route = scope.get("route")
+                path = route.path if route is not None else "unmatched"
+                finish_request(query_stats, f"{scope['method']} {path}", self._settings.sql_slow_query_ms)
+
+
+class ProfilingMiddleware:
+    """Profile a sampled fraction of requests, or those an admin asks for via a header.
+
+    Pure ASGI so the profile context reaches the endpoint, including sync
+    handlers that run in the threadpool. Profiles are written to
+    ``PROFILING_OUTPUT_DIR`` keyed by request id, which is echoed in ``X-Request-ID``.
+    """
+
+    def __init__(self, app: ASGIApp, *, app_settings: Settings) -> None:
+        self.app = app
+        self._settings = app_settings
+        install_sql_hooks()
+
+    def _requested_by_admin(self, headers: Headers) -> bool:
+        if headers.get(self._settings.profiling_header, "").lower() not in {"1", "true", "yes"}:
+            return False
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            claims = decode_token(token)
+        except Exception:  # noqa: BLE001
+            return False
+        return claims.get("type") == "access" and claims.get("role") == "admin"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        sampled = random.random() < self._settings.profiling_sample_rate
+        if not sampled and not self._requested_by_admin(headers):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = headers.get("x-request-id", "")
+        if not is_valid_request_id(request_id):
+            request_id = uuid4().hex
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
+
+        with track_queries() as query_stats:
+            profile = RequestProfile(request_id, self._settings.profiling_interval_ms / 1000, query_stats)
+            profile.start()
+            try:
+                await self.app(scope, receive, send_with_request_id)
+            finally:
+                profile.stop()
+        metadata = {"method": scope["method"], "path": scope["path"], "status": status_code}
+        await anyio.to_thread.run_sync(
+            save_profile,
+            profile,
+            self._settings.profiling_output_dir,
+            self._settings.profiling_format,
+            metadata,
+        )
+
+
 def create_app(app_settings: Settings | None = None) -> FastAPI:
     config = app_settings or settings
     config.validate_security()
 
     app = FastAPI()
 
+    if config.admission_control_enabled:
+        app.add_middleware(AdmissionControlMiddleware, app_settings=config)
+
     if config.rate_limit_enabled:
         app.state.limiter = limiter
         app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
         app.add_middleware(SlowAPIMiddleware)
+        if config.rate_limit_default_backend == "local":
+            app.add_middleware(RateLimitMiddleware, app_settings=config)
 
     if config.trusted_hosts:
         app.add_middleware(TrustedHostMiddleware, allowed_hosts=config.trusted_hosts)
@@ -62,7 +403,15 @@ def create_app(app_settings: Settings | None = None) -> FastAPI:
             allow_origins=config.cors_allowed_origins,
             allow_credentials=config.cors_allow_credentials,
             allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-            allow_headers=["Authorization", "Content-Type"],
+            allow_headers=[
+                "Authorization",
+                "Content-Type",
+                "If-Match",
+                "If-None-Match",
+                "X-Request-ID",
+                config.profiling_header,
+            ],
+            expose_headers=["ETag", "Server-Timing", "X-Request-ID", "X-Total-Count", "X-Total-Count-Estimated"],
         )
 
     if config.is_production() and config.https_redirect_enabled:
@@ -71,10 +420,30 @@ def create_app(app_settings: Settings | None = None) -> FastAPI:
     if config.security_headers_enabled:
         app.add_middleware(SecurityHeadersMiddleware, app_settings=config)
 
+    if config.compression_enabled:
+        app.add_middleware(CompressionMiddleware, app_settings=config)
+
+    if config.sql_instrumentation_enabled:
+        app.add_middleware(QueryTimingMiddleware, app_settings=config)
+
+    if config.profiling_enabled:
+        app.add_middleware(ProfilingMiddleware, app_settings=config)
+
     app.include_router(auth_router)
     app.include_router(tasks_router)
     app.include_router(health_router)
     return app
 
 
-app = create_app()
+_app: FastAPI | None = None
+
+
+def __getattr__(name: str) -> FastAPI:
+    # ``app`` is built on first access (``uvicorn app.main:app``, ``from app.main import app``)
+    # so importing this module for create_app() or a middleware class does not build one.
+    global _app
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _app is None:
+        _app = create_app()
+    return _app
@@ -1,3 +1,3 @@
 """ORM models package."""
 
-from app.models import refresh_token, task, user  # noqa: F401
+from app.models import refresh_token, task, task_archive, task_stats, user  # noqa: F401
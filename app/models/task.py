@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
+from typing import ClassVar
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, Enum as SAEnum, ForeignKey, Integer, String, Text, func
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy import Column, Computed, DateTime, Enum as SAEnum, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -18,8 +19,28 @@ class TaskStatus(str, Enum):
     FAILED = "failed"
 
 
+# Must match the generated column in migration 20260210_01.
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')"
+)
+
+
 class Task(Base):
     __tablename__ = "tasks"
+    # Range-partitioned by month on created_at; the database primary key is
+    # (id, created_at), while the ORM identifies rows by id alone.
+    __table_args__ = (
+        Index("ix_tasks_owner_id_created_at", "owner_id", "created_at"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_tasks_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    # INSERT/UPDATE ... RETURNING created_at/updated_at instead of a follow-up SELECT.
+    # search_vector is only queried through Task.__table__, so the ORM never
+    # loads or returns it.
+    __mapper_args__: ClassVar[dict] = {"eager_defaults": True, "exclude_properties": ["search_vector"]}
 
     id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True),
@@ -57,4 +78,6 @@ class Task(Base):
         nullable=False,
     )
 
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True))
+
     owner = relationship("User", back_populates="tasks")
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import ClassVar
+from uuid import UUID
+
+from sqlalchemy import (
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.task import SEARCH_VECTOR_SQL, TaskStatus
+
+
+class TaskArchive(Base):
+    """Completed tasks moved out of ``tasks`` by ``app.services.task_archive``.
+
+    Columns mirror ``Task`` so rows can be listed next to it with ``UNION ALL``.
+    The table is not partitioned and rows are only inserted in batches or deleted.
+    """
+
+    __tablename__ = "tasks_archive"
+    __table_args__ = (
+        Index("ix_tasks_archive_owner_id_created_at", "owner_id", "created_at"),
+        Index("ix_tasks_archive_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_tasks_archive_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
+    __mapper_args__: ClassVar[dict] = {"exclude_properties": ["search_vector"]}
+
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[TaskStatus] = mapped_column(
+        SAEnum(
+            TaskStatus,
+            name="task_status",
+            values_callable=lambda enum: [e.value for e in enum],
+            create_type=False,
+        ),
+        nullable=False,
+    )
+    category: Mapped[str | None] = mapped_column(String(120), nullable=True)
+    priority: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    estimated_duration: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    owner_id: Mapped[UUID | None] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True))
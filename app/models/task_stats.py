@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import BigInteger, ForeignKey, String
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.task import TaskStatus
+
+
+class TaskStats(Base):
+    """Per-owner task counters, maintained in the same transaction as task writes.
+
+    ``category`` and ``priority`` use ``""`` for tasks where the value is unset so
+    they can take part in the primary key.
+    """
+
+    __tablename__ = "task_stats"
+
+    owner_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    status: Mapped[TaskStatus] = mapped_column(
+        SAEnum(
+            TaskStatus,
+            name="task_status",
+            values_callable=lambda enum: [e.value for e in enum],
+            create_type=False,
+        ),
+        primary_key=True,
+    )
+    category: Mapped[str] = mapped_column(String(120), primary_key=True, default="")
+    priority: Mapped[str] = mapped_column(String(16), primary_key=True, default="")
+    task_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    total_estimated_duration: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
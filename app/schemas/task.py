@@ -5,7 +5,7 @@ from uuid import UUID
 
 from typing import Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from app.models.task import TaskStatus
 
@@ -52,6 +52,52 @@ class TaskUpdate(BaseModel):
         return value
 
 
+class TaskFilter(BaseModel):
+    """Selects tasks for bulk operations with the same filters as ``GET /tasks``."""
+
+    owner_id: UUID | None = None
+    status: TaskStatus | None = None
+    category: str | None = None
+    priority: str | None = None
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    q: str | None = Field(None, min_length=1, max_length=200)
+
+
+class TaskBulkUpdate(BaseModel):
+    ids: list[UUID] | None = Field(None, min_length=1, max_length=1000)
+    filter: TaskFilter | None = None
+    update: TaskUpdate
+
+    @model_validator(mode="after")
+    def _validate_target(self) -> TaskBulkUpdate:
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("provide exactly one of ids or filter")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("filter must set at least one field")
+        if not self.update.model_fields_set:
+            raise ValueError("update must set at least one field")
+        return self
+
+
+class TaskBulkFailure(BaseModel):
+    id: UUID
+    detail: str
+
+
+class TaskBulkUpdateResponse(BaseModel):
+    updated: int
+    failed: list[TaskBulkFailure]
+
+
+class TaskBulkDeleteResponse(BaseModel):
+    job_id: str | None = None
+    status: str
+    deleted: int
+    chunks: int
+    remaining: int = 0
+
+
 class TaskResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -65,3 +111,20 @@ class TaskResponse(BaseModel):
     owner_id: UUID | None = None
     created_at: datetime
     updated_at: datetime
+
+
+class TaskStatsBucket(BaseModel):
+    status: TaskStatus
+    category: str | None = None
+    priority: str | None = None
+    count: int
+    total_estimated_duration: int
+
+
+class TaskStatsResponse(BaseModel):
+    total: int
+    total_estimated_duration: int
+    by_status: dict[str, int]
+    by_category: dict[str, int]
+    by_priority: dict[str, int]
+    buckets: list[TaskStatsBucket]
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from app.jobs.task_archive import archive_tasks_job
+
+
+def main() -> None:
+    archived = archive_tasks_job()
+    print(f"Archived {archived} completed tasks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.task import TaskStatus
+from app.schemas.task import TaskFilter
+from app.services.task_bulk_delete import BulkDeleteProgress, delete_tasks_in_chunks
+
+
+def _print_progress(progress: BulkDeleteProgress) -> None:
+    print(f"Deleted {progress.deleted} tasks after {progress.chunks} chunks", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Delete every task matching the GET /tasks filters, archived ones included, in chunks."
+    )
+    parser.add_argument("--owner-id")
+    parser.add_argument("--status", choices=[item.value for item in TaskStatus])
+    parser.add_argument("--category")
+    parser.add_argument("--priority")
+    parser.add_argument("--created-after", help="ISO 8601")
+    parser.add_argument("--created-before", help="ISO 8601")
+    parser.add_argument("--q", help="search titles and descriptions")
+    parser.add_argument("--chunk-size", type=int, default=settings.task_bulk_delete_chunk_size)
+    args = parser.parse_args()
+
+    filters = {name: value for name, value in vars(args).items() if name != "chunk_size" and value is not None}
+    if not filters:
+        parser.error("at least one filter is required")
+    selector = TaskFilter.model_validate(filters)
+
+    with SessionLocal() as db:
+        result = delete_tasks_in_chunks(db, selector, args.chunk_size, progress=_print_progress)
+    print(f"Deleted {result.deleted} tasks in {result.chunks} chunks")
+    if result.remaining:
+        print(f"{result.remaining} matching tasks were locked by requests and left; run again to delete them")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.services.task_partitions import detach_old_partitions, ensure_future_partitions
+
+
+def main() -> None:
+    with SessionLocal() as db:
+        created = ensure_future_partitions(db, settings.task_partition_months_ahead)
+        detached = detach_old_partitions(db, settings.task_partition_retention_months)
+
+    print(f"Created partitions: {', '.join(created) or 'none'}")
+    print(f"Detached partitions: {', '.join(detached) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
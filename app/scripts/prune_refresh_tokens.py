@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from app.jobs.refresh_token_pruning import prune_refresh_tokens_job
+
+
+def main() -> None:
+    deleted = prune_refresh_tokens_job()
+    print(f"Pruned {deleted} refresh tokens")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,6 @@ import random
 import time
 from typing import Any, Callable
 
-from huggingface_hub import InferenceClient, InferenceTimeoutError
-
 logger = logging.getLogger(__name__)
 
 DEFAULT_CLASSIFICATION: dict[str, Any] = {
@@ -48,13 +46,22 @@ RETRYABLE_ERROR_HINTS = (
 class AIClassifier:
     def __init__(self) -> None:
         token = os.getenv("HUGGINGFACEHUB_API_TOKEN")
-        if not token:
+        base_url = os.getenv("HF_INFERENCE_BASE_URL", "").strip()
+        if not token and not base_url:
             raise RuntimeError("HUGGINGFACEHUB_API_TOKEN must be set")
 
         self._provider = "huggingface"
         self._model = os.getenv("HF_MODEL_ID", "MoritzLaurer/mDeBERTa-v3-base-mnli-xnli")
+        if base_url:
+            # A full URL as the model makes huggingface_hub POST straight to it, bypassing
+            # provider routing; used to point at benchmarks.hf_stub or a private endpoint.
+            self._model = f"{base_url.rstrip('/')}/models/{self._model}"
         self._timeout = float(os.getenv("HF_TIMEOUT_SECONDS", "20"))
         self._max_retries = max(1, int(os.getenv("HF_MAX_RETRIES", "3")))
+        # huggingface_hub's inference client costs a few hundred milliseconds to
+        # import, so it is loaded with the first classifier rather than with the app.
+        from huggingface_hub import InferenceClient
+
         self._client = InferenceClient(token=token, timeout=self._timeout)
 
     def classify_task(self, title: str, description: str | None) -> dict[str, Any]:
@@ -137,6 +144,8 @@ class AIClassifier:
 
     @staticmethod
     def _is_retryable(exc: Exception) -> bool:
+        from huggingface_hub import InferenceTimeoutError
+
         if isinstance(exc, InferenceTimeoutError):
             return True
 
@@ -4,12 +4,13 @@ import json
 import threading
 import time
 from dataclasses import dataclass
-
-from redis import Redis
-from redis.exceptions import RedisError
+from typing import TYPE_CHECKING
 
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from redis import Redis
+
 KEY_PREFIX = "auth:login-throttle"
 STATE_TTL_SECONDS = 3600
 SOFT_THRESHOLD = 5
@@ -51,6 +52,8 @@ def _get_redis_client() -> Redis | None:
     if _redis_client is None:
         with _redis_client_lock:
             if _redis_client is None:
+                from redis import Redis
+
                 _redis_client = Redis.from_url(settings.redis_url)
     return _redis_client
 
@@ -58,6 +61,8 @@ def _get_redis_client() -> Redis | None:
 def _load_state(key: str) -> dict[str, int] | None:
     client = _get_redis_client()
     if client is not None:
+        from redis.exceptions import RedisError
+
         try:
             raw = client.get(key)
             if raw:
@@ -83,6 +88,8 @@ def _save_state(key: str, state: dict[str, int], ttl: int) -> None:
     ttl = max(1, ttl)
     client = _get_redis_client()
     if client is not None:
+        from redis.exceptions import RedisError
+
         try:
             client.setex(key, ttl, json.dumps(state))
             return
@@ -96,6 +103,8 @@ def _save_state(key: str, state: dict[str, int], ttl: int) -> None:
 def _delete_state(key: str) -> None:
     client = _get_redis_client()
     if client is not None:
+        from redis.exceptions import RedisError
+
         try:
             client.delete(key)
         except RedisError:
@@ -182,6 +191,8 @@ def reset_failed_logins_for_tests() -> None:
 
     client = _get_redis_client()
     if client is not None:
+        from redis.exceptions import RedisError
+
         try:
             keys = list(client.scan_iter(f"{KEY_PREFIX}:*"))
             if keys:
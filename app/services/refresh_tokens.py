@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY_PREFIX = "auth:revoked-refresh"
+
+_redis_client: Redis | None = None
+_redis_client_lock = threading.Lock()
+
+PRUNE_BATCH_SQL = text(
+    """
+    DELETE FROM refresh_tokens
+    WHERE id IN (
+        SELECT id FROM refresh_tokens
+        WHERE expires_at < now() OR revoked
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    """
+)
+
+
+def _get_redis_client() -> Redis | None:
+    global _redis_client
+    if not settings.redis_url or not settings.refresh_revocation_cache_enabled:
+        return None
+
+    if _redis_client is None:
+        with _redis_client_lock:
+            if _redis_client is None:
+                from redis import Redis
+
+                _redis_client = Redis.from_url(settings.redis_url)
+    return _redis_client
+
+
+def _revoked_key(token_hash: str) -> str:
+    return f"{REVOKED_KEY_PREFIX}:{token_hash}"
+
+
+def cache_revocation(token_hash: str, expires_at: datetime) -> None:
+    """Remember a revoked refresh token in Redis until it would have expired anyway."""
+    client = _get_redis_client()
+    if client is None:
+        return
+    from redis.exceptions import RedisError
+
+    ttl = int(expires_at.timestamp() - time.time())
+    if ttl <= 0:
+        return
+    try:
+        client.setex(_revoked_key(token_hash), ttl, 1)
+    except RedisError:
+        logger.warning("Failed to cache refresh token revocation", exc_info=True)
+
+
+def is_revocation_cached(token_hash: str) -> bool:
+    """``True`` only when Redis positively knows the token is revoked; misses fall through to Postgres."""
+    client = _get_redis_client()
+    if client is None:
+        return False
+    from redis.exceptions import RedisError
+
+    try:
+        return bool(client.exists(_revoked_key(token_hash)))
+    except RedisError:
+        return False
+
+
+def prune_refresh_tokens(db: Session, batch_size: int, max_batches: int | None = None) -> int:
+    """Delete expired and revoked refresh tokens in short, separately committed batches.
+
+    ``SKIP LOCKED`` leaves rows that a concurrent refresh or logout is holding for
+    a later run, so pruning never waits on request traffic.
+    """
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        deleted = db.execute(PRUNE_BATCH_SQL, {"batch_size": batch_size}).rowcount
+        db.commit()
+        total += deleted
+        batches += 1
+        if deleted < batch_size:
+            break
+    logger.info("Pruned %s refresh tokens in %s batches", total, batches)
+    return total
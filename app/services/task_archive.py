@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, TaskStatus
+from app.models.task_archive import TaskArchive
+from app.services.task_cache import invalidate_tasks
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "category",
+    "priority",
+    "estimated_duration",
+    "owner_id",
+    "created_at",
+    "updated_at",
+)
+
+
+def archive_completed_tasks(
+    db: Session,
+    older_than_days: int,
+    batch_size: int,
+    *,
+    max_batches: int | None = None,
+    now: datetime | None = None,
+) -> int:
+    """Move completed tasks untouched for ``older_than_days`` into ``tasks_archive``.
+
+    Each batch is one ``WITH moved AS (DELETE ... RETURNING) INSERT`` statement,
+    committed on its own, so a row is always in exactly one table. Archived
+    tasks still count in ``task_stats``: they stay readable and deletable through
+    ``/tasks/{id}``. ``SKIP LOCKED`` leaves rows a request is writing for a later run.
+    """
+    if older_than_days <= 0:
+        return 0
+
+    cutoff = (now or datetime.now(UTC)) - timedelta(days=older_than_days)
+    table = Task.__table__
+    batch = (
+        select(Task.id, Task.created_at)
+        # created_at <= updated_at, so the created_at bound only prunes partitions.
+        .where(Task.status == TaskStatus.COMPLETED, Task.updated_at < cutoff, Task.created_at < cutoff)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    moved = (
+        delete(table)
+        .where(tuple_(table.c.id, table.c.created_at).in_(batch))
+        .returning(*(table.c[name] for name in ARCHIVED_COLUMNS))
+        .cte("moved")
+    )
+    statement = (
+        insert(TaskArchive.__table__)
+        .from_select(ARCHIVED_COLUMNS, select(*(moved.c[name] for name in ARCHIVED_COLUMNS)))
+        .returning(TaskArchive.owner_id)
+    )
+
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        owner_ids = db.execute(statement).scalars().all()
+        db.commit()
+        if owner_ids:
+            # Cached tasks stay valid: GET /tasks/{id} serves the same body from the
+            # archive. Listing pages now miss these tasks.
+            invalidate_tasks([], owner_ids)
+        total += len(owner_ids)
+        batches += 1
+        if len(owner_ids) < batch_size:
+            break
+    logger.info("Archived %s completed tasks in %s batches", total, batches)
+    return total
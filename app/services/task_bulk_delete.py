@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import ColumnElement, delete, func, select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from app.database import record_written_users
+from app.models.task import Task
+from app.models.task_archive import TaskArchive
+from app.schemas.task import TaskFilter
+from app.services.task_cache import invalidate_tasks
+from app.services.task_filters import task_filter_conditions
+from app.services.task_stats import apply_task_changes, snapshot_task
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[["BulkDeleteProgress"], None]
+
+
+@dataclass(frozen=True)
+class BulkDeleteProgress:
+    deleted: int
+    chunks: int
+    # Matching rows left behind because requests held them locked; set once the delete ends.
+    remaining: int = 0
+
+
+def _delete_in_chunks(
+    db: Session,
+    model: type[Task | TaskArchive],
+    key: tuple[InstrumentedAttribute, ...],
+    conditions: list[ColumnElement[bool]],
+    chunk_size: int,
+    report: BulkDeleteProgress,
+    progress: ProgressCallback | None,
+) -> BulkDeleteProgress:
+    chunk = select(*key).where(*conditions).limit(chunk_size).with_for_update(skip_locked=True).scalar_subquery()
+    statement = (
+        delete(model.__table__)
+        .where(tuple_(*key).in_(chunk))
+        .returning(model.id, model.owner_id, model.status, model.category, model.priority, model.estimated_duration)
+    )
+    while True:
+        rows = db.execute(statement).all()
+        apply_task_changes(db, [(snapshot_task(row), None) for row in rows])
+        record_written_users(db, {row.owner_id for row in rows})
+        db.commit()
+        if rows:
+            invalidate_tasks([row.id for row in rows], {row.owner_id for row in rows})
+        report = BulkDeleteProgress(deleted=report.deleted + len(rows), chunks=report.chunks + 1)
+        if progress is not None:
+            progress(report)
+        # A short chunk is not the end: SKIP LOCKED may have passed over rows.
+        if not rows:
+            return report
+
+
+def delete_tasks_in_chunks(
+    db: Session,
+    selector: TaskFilter,
+    chunk_size: int,
+    *,
+    progress: ProgressCallback | None = None,
+) -> BulkDeleteProgress:
+    """Delete every task matching ``selector``, archived ones included, in separately committed chunks.
+
+    Each chunk is ``DELETE ... WHERE key IN (SELECT ... LIMIT k)`` and moves its
+    rows out of ``task_stats`` in the same transaction, so locks and WAL per
+    transaction stay bounded by ``chunk_size``. ``tasks`` is emptied first, then
+    ``tasks_archive``, whose rows still count in ``task_stats``. ``SKIP LOCKED``
+    leaves rows that a request is updating for a later run instead of waiting
+    on it; each table is chunked until a chunk deletes nothing, and the rows
+    still matching at the end are reported as ``remaining``. ``progress`` is
+    called after every commit.
+    """
+    hot_conditions = task_filter_conditions(selector)
+    archive_conditions = task_filter_conditions(selector, model=TaskArchive)
+    report = BulkDeleteProgress(deleted=0, chunks=0)
+    # tasks is keyed by (id, created_at) so the subquery can prune partitions.
+    report = _delete_in_chunks(db, Task, (Task.id, Task.created_at), hot_conditions, chunk_size, report, progress)
+    report = _delete_in_chunks(db, TaskArchive, (TaskArchive.id,), archive_conditions, chunk_size, report, progress)
+
+    remaining = db.scalar(select(func.count()).select_from(Task).where(*hot_conditions)) + db.scalar(
+        select(func.count()).select_from(TaskArchive).where(*archive_conditions)
+    )
+    db.commit()
+    report = BulkDeleteProgress(deleted=report.deleted, chunks=report.chunks, remaining=remaining)
+    if remaining:
+        logger.warning(
+            "Deleted %s tasks in %s chunks; %s locked tasks were left", report.deleted, report.chunks, remaining
+        )
+    else:
+        logger.info("Deleted %s tasks in %s chunks", report.deleted, report.chunks)
+    return report
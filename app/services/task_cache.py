@@ -0,0 +1,237 @@
+"""Redis read-through cache for ``GET /tasks/{id}`` and ``GET /tasks`` pages.
+
+Entries are never deleted on write. Each entry records the versions it was
+filled under, and a read counts as a hit only while those versions are still
+current. Writers bump versions after they commit:
+
+* ``version:task:<id>`` retires one task's entry,
+* ``version:owner:<owner_id>`` retires that owner's listing pages,
+* ``version:all`` retires unscoped (admin) listing pages, and every write bumps it,
+* ``epoch`` retires everything, for bulk deletes and partition detaches.
+
+A read fetches the entry and its versions with one ``MGET``. The versions are
+read before the database query, so a write that commits while a miss is being
+filled leaves the new entry under an already stale version. Versions are
+write timestamps in nanoseconds. A miss served by a read replica is stored
+only once its versions are older than ``DB_REPLICA_MAX_LAG_SECONDS``, so a
+lagging replica cannot fill a fresh version with old rows. Version keys
+outlive every entry, so a version that expires cannot bring back an old entry.
+
+When Redis is unreachable reads go to Postgres. A bump that fails leaves
+entries stale for at most their TTL.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+import orjson
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "taskcache"
+# A cache that answers slower than Postgres is worse than none.
+REDIS_TIMEOUT_SECONDS = 0.25
+# Version keys must outlive any entry filled under them.
+VERSION_TTL_MARGIN_SECONDS = 60
+
+_redis_client: Redis | None = None
+_redis_client_lock = threading.Lock()
+
+
+class TaskCacheStats:
+    """Process-wide hit and miss counters per entry kind, served at ``/health/metrics``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._kinds: dict[str, dict[str, int]] = {}
+
+    def record(self, kind: str, outcome: str) -> None:
+        with self._lock:
+            entry = self._kinds.setdefault(kind, {"hits": 0, "misses": 0, "errors": 0})
+            entry[outcome] += 1
+
+    def snapshot(self) -> dict[str, dict[str, float | int]]:
+        with self._lock:
+            snapshot = {}
+            for kind, entry in sorted(self._kinds.items()):
+                lookups = entry["hits"] + entry["misses"]
+                snapshot[kind] = {**entry, "hit_ratio": entry["hits"] / lookups if lookups else 0.0}
+            return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._kinds.clear()
+
+
+task_cache_stats = TaskCacheStats()
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    headers: dict[str, str]
+    owner_id: UUID | None
+
+
+@dataclass(frozen=True)
+class CacheSlot:
+    """Where a lookup looked and the versions a fill must be stored under."""
+
+    key: str
+    version: str
+    written_at_ns: int
+    ttl_seconds: int
+    entry: CachedResponse | None
+
+
+def _get_redis_client() -> Redis | None:
+    global _redis_client
+    if not settings.redis_url or not settings.task_cache_enabled:
+        return None
+
+    if _redis_client is None:
+        with _redis_client_lock:
+            if _redis_client is None:
+                from redis import Redis
+
+                _redis_client = Redis.from_url(
+                    settings.redis_url,
+                    socket_timeout=REDIS_TIMEOUT_SECONDS,
+                    socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+                )
+    return _redis_client
+
+
+def _key(*parts: object) -> str:
+    return ":".join([KEY_PREFIX, *(str(part) for part in parts)])
+
+
+def _version_ttl_seconds() -> int:
+    return max(settings.task_cache_ttl_seconds, settings.task_cache_list_ttl_seconds) + VERSION_TTL_MARGIN_SECONDS
+
+
+def _lookup(kind: str, key: str, version_keys: list[str], ttl_seconds: int) -> CacheSlot | None:
+    client = _get_redis_client()
+    if client is None:
+        return None
+    from redis.exceptions import RedisError
+
+    try:
+        *versions, raw = client.mget([*version_keys, key])
+    except RedisError:
+        logger.warning("Task cache lookup failed; reading from the database", exc_info=True)
+        task_cache_stats.record(kind, "errors")
+        return None
+
+    stamps = [int(value) if value else 0 for value in versions]
+    version = ":".join(str(stamp) for stamp in stamps)
+    entry = None
+    if raw is not None:
+        data = orjson.loads(raw)
+        if data["version"] == version:
+            owner_id = data["owner_id"]
+            entry = CachedResponse(
+                body=data["body"].encode("utf-8"),
+                headers=data["headers"],
+                owner_id=UUID(owner_id) if owner_id else None,
+            )
+    task_cache_stats.record(kind, "hits" if entry is not None else "misses")
+    return CacheSlot(key=key, version=version, written_at_ns=max(stamps), ttl_seconds=ttl_seconds, entry=entry)
+
+
+def lookup_task(task_id: UUID) -> CacheSlot | None:
+    """Look up a single task; ``None`` when the cache is disabled or unreachable."""
+    return _lookup(
+        "task",
+        _key("task", task_id),
+        [_key("epoch"), _key("version", "task", task_id)],
+        settings.task_cache_ttl_seconds,
+    )
+
+
+def lookup_page(owner_id: UUID | None, params: dict[str, object]) -> CacheSlot | None:
+    """Look up a listing page for one owner (``None`` for unscoped admin listings)."""
+    scope = owner_id or "all"
+    digest = hashlib.sha256(orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()[:32]
+    return _lookup(
+        "page",
+        _key("page", scope, digest),
+        [_key("epoch"), _key("version", "owner", scope)],
+        settings.task_cache_list_ttl_seconds,
+    )
+
+
+def store(
+    slot: CacheSlot,
+    body: bytes,
+    headers: dict[str, str],
+    *,
+    owner_id: UUID | None = None,
+    from_replica: bool = False,
+) -> None:
+    """Fill ``slot`` with a response built from the database."""
+    if from_replica and time.time_ns() - slot.written_at_ns < settings.db_replica_max_lag_seconds * 1e9:
+        return
+    client = _get_redis_client()
+    if client is None:
+        return
+    from redis.exceptions import RedisError
+
+    value = orjson.dumps(
+        {
+            "version": slot.version,
+            "owner_id": str(owner_id) if owner_id else None,
+            "headers": headers,
+            "body": body.decode("utf-8"),
+        }
+    )
+    try:
+        client.set(slot.key, value, ex=slot.ttl_seconds)
+    except RedisError:
+        logger.warning("Task cache fill failed", exc_info=True)
+
+
+def invalidate_tasks(task_ids: Iterable[UUID], owner_ids: Iterable[UUID | None]) -> None:
+    """Retire cached entries for ``task_ids`` and listing pages for ``owner_ids``. Call after commit."""
+    client = _get_redis_client()
+    if client is None:
+        return
+    from redis.exceptions import RedisError
+
+    now = time.time_ns()
+    ttl_seconds = _version_ttl_seconds()
+    pipe = client.pipeline(transaction=False)
+    for task_id in set(task_ids):
+        pipe.set(_key("version", "task", task_id), now, ex=ttl_seconds)
+    for owner_id in {owner_id for owner_id in owner_ids if owner_id is not None}:
+        pipe.set(_key("version", "owner", owner_id), now, ex=ttl_seconds)
+    pipe.set(_key("version", "owner", "all"), now, ex=ttl_seconds)
+    try:
+        pipe.execute()
+    except RedisError:
+        logger.warning("Task cache invalidation failed; entries expire within their TTL", exc_info=True)
+
+
+def invalidate_all() -> None:
+    """Retire every cached task and page, for writes that touch too many owners to list."""
+    client = _get_redis_client()
+    if client is None:
+        return
+    from redis.exceptions import RedisError
+
+    try:
+        client.set(_key("epoch"), time.time_ns())
+    except RedisError:
+        logger.warning("Task cache invalidation failed; entries expire within their TTL", exc_info=True)
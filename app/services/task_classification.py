@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import logging
+import threading
+from typing import Any
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -9,9 +11,32 @@ from app.database import SessionLocal
 from app import models  # noqa: F401
 from app.models.task import Task, TaskStatus
 from app.services.ai_classifier import AIClassifier, DEFAULT_CLASSIFICATION
+from app.services.task_cache import invalidate_tasks
+from app.services.task_events import publish_task_event
+from app.services.task_stats import apply_task_change, snapshot_task
 
 logger = logging.getLogger(__name__)
 
+_classifier: Any = None
+_classifier_factory: Any = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier() -> AIClassifier:
+    """The process-wide classifier, built on first use and kept warm for later tasks.
+
+    It is rebuilt when ``AIClassifier`` is replaced (tests and benchmarks swap in
+    stubs), and a constructor that raises is retried on the next call.
+    """
+    global _classifier, _classifier_factory
+    factory = AIClassifier
+    if _classifier is None or _classifier_factory is not factory:
+        with _classifier_lock:
+            if _classifier is None or _classifier_factory is not factory:
+                _classifier = factory()
+                _classifier_factory = factory
+    return _classifier
+
 
 def _apply_classification(task: Task, classification: dict) -> None:
     task.category = classification["category"]
@@ -19,13 +44,10 @@ def _apply_classification(task: Task, classification: dict) -> None:
     task.estimated_duration = classification["estimated_duration"]
 
 
-def classify_task_record(db: Session, task: Task) -> None:
-    if task.status == TaskStatus.COMPLETED:
-        return
-
+def classify_task_fields(task: Task) -> None:
+    """Set category, priority, duration and status on ``task`` without touching the database."""
     try:
-        classifier = AIClassifier()
-        classification = classifier.classify_task(task.title, task.description)
+        classification = get_classifier().classify_task(task.title, task.description)
         _apply_classification(task, classification)
         task.status = TaskStatus.PENDING
     except Exception:
@@ -34,9 +56,18 @@ def classify_task_record(db: Session, task: Task) -> None:
         task.status = TaskStatus.FAILED
 
 
+def classify_task_record(db: Session, task: Task) -> None:
+    if task.status == TaskStatus.COMPLETED:
+        return
+
+    before = snapshot_task(task)
+    classify_task_fields(task)
+    apply_task_change(db, before, snapshot_task(task))
+
+
 def classify_task_by_id(task_id: str) -> None:
     with SessionLocal() as db:
-        task = db.get(Task, UUID(task_id))
+        task = db.get(Task, UUID(task_id), with_for_update=True)
         if task is None:
             logger.warning("Task not found for classification: %s", task_id)
             return
@@ -45,3 +76,5 @@ def classify_task_by_id(task_id: str) -> None:
 
         classify_task_record(db, task)
         db.commit()
+        invalidate_tasks([task.id], [task.owner_id])
+        publish_task_event(task, "task.classified")
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from app.core.config import settings
+from app.models.task import Task
+
+if TYPE_CHECKING:
+    from redis import Redis
+    from redis import asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "task-events"
+STREAM_KEY_PREFIX = "task-events"
+RECONNECT_DELAY_SECONDS = 1.0
+
+_redis_client: Redis | None = None
+_redis_client_lock = threading.Lock()
+
+
+def _stream_key(owner_id: UUID | str) -> str:
+    return f"{STREAM_KEY_PREFIX}:{owner_id}"
+
+
+def _get_redis_client() -> Redis | None:
+    global _redis_client
+    if not settings.redis_url:
+        return None
+
+    if _redis_client is None:
+        with _redis_client_lock:
+            if _redis_client is None:
+                from redis import Redis
+
+                _redis_client = Redis.from_url(settings.redis_url)
+    return _redis_client
+
+
+def _parse_event_id(event_id: str) -> tuple[int, int]:
+    milliseconds, _, sequence = event_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+def publish_task_event(task: Task, event: str = "task.updated") -> None:
+    """Record ``task``'s current state for its owner and notify live subscribers.
+
+    Events are appended to a capped per-owner Redis stream, whose entry ids double
+    as SSE event ids for ``Last-Event-ID`` replay, then announced on a single
+    pub/sub channel. Failures are logged and swallowed: clients can still poll.
+    """
+    client = _get_redis_client()
+    if client is None or task.owner_id is None:
+        return
+    from redis.exceptions import RedisError
+
+    data = json.dumps(
+        {
+            "task_id": str(task.id),
+            "status": task.status.value,
+            "category": task.category,
+            "priority": task.priority,
+            "estimated_duration": task.estimated_duration,
+            "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+        }
+    )
+    try:
+        event_id = client.xadd(
+            _stream_key(task.owner_id),
+            {"event": event, "data": data},
+            maxlen=settings.task_events_history,
+            approximate=True,
+        )
+        if isinstance(event_id, bytes):
+            event_id = event_id.decode("ascii")
+        client.publish(
+            CHANNEL,
+            json.dumps({"id": event_id, "owner_id": str(task.owner_id), "event": event, "data": data}),
+        )
+    except RedisError:
+        logger.exception("Failed to publish %s for task_id=%s", event, task.id)
+
+
+class _Subscription:
+    def __init__(self, owner_id: str) -> None:
+        self.owner_id = owner_id
+        self.queue: asyncio.Queue[dict | None] = asyncio.Queue(maxsize=settings.task_events_buffer_size)
+        self.overflowed = False
+        self.first_dropped_id: str | None = None
+
+    def offer(self, message: dict | None) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A slow reader is cut off rather than buffered without bound. Nothing
+            # buffered is delivered; the reader replays from the stream instead,
+            # after the last id it delivered or, if none, from the first one dropped.
+            self.overflowed = True
+            dropped = [self.queue.get_nowait() for _ in range(self.queue.qsize())] + [message]
+            self.first_dropped_id = next((item["id"] for item in dropped if item is not None), None)
+            self.queue.put_nowait(None)
+
+
+class TaskEventBroker:
+    """Fans one Redis pub/sub subscription out to every SSE connection in the process."""
+
+    def __init__(self) -> None:
+        self._subscriptions: dict[str, set[_Subscription]] = {}
+        self._listener: asyncio.Task | None = None
+        self._client: aioredis.Redis | None = None
+
+    def _redis(self) -> aioredis.Redis:
+        if self._client is None:
+            from redis import asyncio as aioredis
+
+            self._client = aioredis.Redis.from_url(settings.redis_url)
+        return self._client
+
+    def subscribe(self, owner_id: str) -> _Subscription:
+        subscription = _Subscription(owner_id)
+        self._subscriptions.setdefault(owner_id, set()).add(subscription)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return subscription
+
+    def unsubscribe(self, subscription: _Subscription) -> None:
+        subscribers = self._subscriptions.get(subscription.owner_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscriptions[subscription.owner_id]
+        if not self._subscriptions and self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    async def replay(self, owner_id: str, last_event_id: str, *, inclusive: bool = False) -> list[dict]:
+        start = last_event_id if inclusive else f"({last_event_id}"
+        entries = await self._redis().xrange(_stream_key(owner_id), min=start, max="+")
+        return [
+            {
+                "id": entry_id.decode("ascii"),
+                "event": fields[b"event"].decode("utf-8"),
+                "data": fields[b"data"].decode("utf-8"),
+            }
+            for entry_id, fields in entries
+        ]
+
+    async def _listen(self) -> None:
+        from redis.exceptions import RedisError
+
+        while self._subscriptions:
+            pubsub = self._redis().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(CHANNEL)
+                async for message in pubsub.listen():
+                    self._dispatch(message)
+            except asyncio.CancelledError:
+                raise
+            except RedisError:
+                logger.exception("Task event subscription lost; reconnecting")
+                # Subscribers may have missed events; closing them makes clients resume.
+                for subscribers in list(self._subscriptions.values()):
+                    for subscription in list(subscribers):
+                        subscription.offer(None)
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+            finally:
+                await pubsub.aclose()
+
+    def _dispatch(self, message: dict) -> None:
+        try:
+            payload = json.loads(message["data"])
+        except (KeyError, TypeError, ValueError):
+            return
+        for subscription in list(self._subscriptions.get(payload.get("owner_id"), ())):
+            subscription.offer(payload)
+
+
+broker = TaskEventBroker()
+
+
+def _format_event(message: dict) -> str:
+    return f"id: {message['id']}\nevent: {message['event']}\ndata: {message['data']}\n\n"
+
+
+async def stream_task_events(owner_id: UUID, last_event_id: str | None) -> AsyncIterator[str]:
+    """Yield SSE frames for ``owner_id``, replaying anything after ``last_event_id`` first.
+
+    A reader that overflows its buffer is resubscribed and catches up from the
+    stream, so events dropped before its first delivery are not lost either.
+    """
+    from redis.exceptions import RedisError
+
+    owner_key = str(owner_id)
+    # Subscribe before replaying so nothing published in between is lost.
+    subscription = broker.subscribe(owner_key)
+    try:
+        last_seen: tuple[int, int] | None = None
+        last_id: str | None = None
+        if last_event_id:
+            try:
+                last_seen, last_id = _parse_event_id(last_event_id), last_event_id
+                for message in await broker.replay(owner_key, last_event_id):
+                    last_seen, last_id = _parse_event_id(message["id"]), message["id"]
+                    yield _format_event(message)
+            except (ValueError, RedisError):
+                logger.warning("Ignoring unusable Last-Event-ID %r", last_event_id)
+
+        yield f"retry: {settings.task_events_retry_ms}\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    subscription.queue.get(),
+                    timeout=settings.task_events_keepalive_seconds,
+                )
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if message is None:
+                resume_from = last_id or subscription.first_dropped_id
+                if not subscription.overflowed or resume_from is None:
+                    # The pub/sub connection was lost; the client resumes with Last-Event-ID.
+                    return
+                # The new subscription takes over before the old one goes, so the
+                # listener keeps running and nothing after the replay is missed.
+                overflowed, subscription = subscription, broker.subscribe(owner_key)
+                broker.unsubscribe(overflowed)
+                try:
+                    replayed = await broker.replay(owner_key, resume_from, inclusive=last_id is None)
+                except RedisError:
+                    logger.warning("Could not replay task events after an overflow", exc_info=True)
+                    return
+                for message in replayed:
+                    if last_seen is not None and _parse_event_id(message["id"]) <= last_seen:
+                        continue
+                    last_seen, last_id = _parse_event_id(message["id"]), message["id"]
+                    yield _format_event(message)
+                continue
+            if last_seen is not None and _parse_event_id(message["id"]) <= last_seen:
+                continue
+            last_seen, last_id = _parse_event_id(message["id"]), message["id"]
+            yield _format_event(message)
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, func, literal, or_
+
+from app.models.task import SEARCH_CONFIG, Task, TaskStatus
+from app.models.task_archive import TaskArchive
+from app.schemas.task import TaskFilter
+
+
+def task_conditions(
+    *,
+    model: type[Task | TaskArchive] = Task,
+    owner_id: UUID | None = None,
+    status: TaskStatus | None = None,
+    category: str | None = None,
+    priority: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+) -> list[ColumnElement[bool]]:
+    """WHERE clauses for the ``GET /tasks`` filters on ``model``; callers add owner scoping."""
+    conditions = []
+    if owner_id is not None:
+        conditions.append(model.owner_id == owner_id)
+    if status is not None:
+        conditions.append(model.status == status)
+    if category:
+        conditions.append(model.category == category)
+    if priority:
+        conditions.append(model.priority == priority)
+    # Bounding created_at lets Postgres prune monthly partitions.
+    if created_after is not None:
+        conditions.append(model.created_at >= created_after)
+    if created_before is not None:
+        conditions.append(model.created_at < created_before)
+    return conditions
+
+
+def search_condition(
+    q: str, model: type[Task | TaskArchive] = Task
+) -> tuple[ColumnElement[bool], ColumnElement[float]]:
+    """Match ``q`` against the weighted full-text vector or, fuzzily, against the title.
+
+    Returns the WHERE clause and a relevance score. ``websearch_to_tsquery``
+    accepts quoted phrases, ``or`` and ``-term``. The trigram word similarity
+    (``<%``) covers prefixes and typos in titles that full-text stemming misses.
+    Both predicates are served by GIN indexes and combined with a BitmapOr.
+    """
+    search_vector = model.__table__.c.search_vector
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    term = literal(q)
+    clause = or_(search_vector.op("@@")(tsquery), term.op("<%")(model.title))
+    rank = func.ts_rank_cd(search_vector, tsquery) + func.word_similarity(term, model.title)
+    return clause, rank
+
+
+def task_filter_conditions(
+    selector: TaskFilter, model: type[Task | TaskArchive] = Task
+) -> list[ColumnElement[bool]]:
+    """WHERE clauses for a ``TaskFilter`` body on ``model``, search included."""
+    conditions = task_conditions(
+        model=model,
+        owner_id=selector.owner_id,
+        status=selector.status,
+        category=selector.category,
+        priority=selector.priority,
+        created_after=selector.created_after,
+        created_before=selector.created_before,
+    )
+    if selector.q and selector.q.strip():
+        conditions.append(search_condition(selector.q.strip(), model)[0])
+    return conditions
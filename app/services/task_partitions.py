@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import logging
+import re
+from datetime import UTC, date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.task import Task
+from app.services.task_cache import invalidate_all
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME_PATTERN = re.compile(r"^tasks_p(\d{4})(\d{2})$")
+DETACHING_SUFFIX = "_detaching"
+DETACHING_NAME_PATTERN = re.compile(r"^tasks_p\d{6}_detaching$")
+DEFAULT_PARTITION = "tasks_default"
+# Every column but the generated search_vector, which Postgres fills in.
+TASK_COLUMNS = ", ".join(column.name for column in Task.__table__.columns if column.computed is None)
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"tasks_p{month:%Y%m}"
+
+
+def list_partitions(db: Session) -> dict[str, date]:
+    """Monthly partitions currently attached to ``tasks``, keyed by table name."""
+    rows = db.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = 'tasks'
+            """
+        )
+    ).scalars()
+    partitions: dict[str, date] = {}
+    for name in rows:
+        match = PARTITION_NAME_PATTERN.match(name)
+        if match:
+            partitions[name] = date(int(match.group(1)), int(match.group(2)), 1)
+    return partitions
+
+
+def _create_partition(db: Session, name: str, month: date) -> None:
+    lower, upper = month.isoformat(), _add_months(month, 1).isoformat()
+    bounds = f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    has_default = db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": DEFAULT_PARTITION}).scalar_one()
+    strays = has_default and db.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at >= :lower AND created_at < :upper)"),
+        {"lower": lower, "upper": upper},
+    ).scalar_one()
+    if not strays:
+        db.execute(text(f"CREATE TABLE {name} PARTITION OF tasks {bounds}"))
+        return
+
+    # Postgres refuses a partition whose range already has rows in the default
+    # one (a missed maintenance run, or a client-supplied created_at). Take the
+    # default out, create the partition, move the rows and put the default back.
+    # Rows outside every range cannot be inserted until this transaction commits.
+    db.execute(text(f"ALTER TABLE tasks DETACH PARTITION {DEFAULT_PARTITION}"))
+    db.execute(text(f"CREATE TABLE {name} PARTITION OF tasks {bounds}"))
+    moved = db.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE created_at >= :lower AND created_at < :upper
+                RETURNING {TASK_COLUMNS}
+            )
+            INSERT INTO {name} ({TASK_COLUMNS}) SELECT {TASK_COLUMNS} FROM moved
+            """
+        ),
+        {"lower": lower, "upper": upper},
+    ).rowcount
+    db.execute(text(f"ALTER TABLE tasks ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+    logger.info("Moved %s tasks from %s into %s", moved, DEFAULT_PARTITION, name)
+
+
+def ensure_future_partitions(db: Session, months_ahead: int, today: date | None = None) -> list[str]:
+    """Create any missing monthly partitions from this month through ``months_ahead``.
+
+    Each partition is created in its own transaction. One that fails is logged
+    and skipped, so the remaining months are still created.
+    """
+    current = _month_start(today or datetime.now(UTC).date())
+    existing = list_partitions(db)
+    created: list[str] = []
+    for offset in range(months_ahead + 1):
+        month = _add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        try:
+            _create_partition(db, name, month)
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            logger.exception("Could not create task partition %s", name)
+            continue
+        created.append(name)
+    return created
+
+
+def _subtract_detached(db: Session, staging: str, name: str) -> None:
+    """Remove a detached partition's rows from ``task_stats`` and give it its final name."""
+    db.execute(
+        text(
+            f"""
+            INSERT INTO task_stats (owner_id, status, category, priority, task_count, total_estimated_duration)
+            SELECT
+                owner_id,
+                status,
+                COALESCE(category, ''),
+                COALESCE(priority, ''),
+                -COUNT(*),
+                -COALESCE(SUM(estimated_duration), 0)
+            FROM {staging}
+            WHERE owner_id IS NOT NULL
+            GROUP BY owner_id, status, COALESCE(category, ''), COALESCE(priority, '')
+            ORDER BY 1, 2, 3, 4
+            ON CONFLICT (owner_id, status, category, priority) DO UPDATE SET
+                task_count = task_stats.task_count + EXCLUDED.task_count,
+                total_estimated_duration = task_stats.total_estimated_duration
+                    + EXCLUDED.total_estimated_duration
+            """
+        )
+    )
+    db.execute(text(f"ALTER TABLE {staging} RENAME TO {name}"))
+    db.commit()
+    invalidate_all()
+
+
+def detach_old_partitions(db: Session, retention_months: int, today: date | None = None) -> list[str]:
+    """Detach monthly partitions that end before the retention window.
+
+    Detached partitions keep their rows as standalone tables for archiving or
+    dropping. The detach commits on its own, with the table renamed to
+    ``<name>_detaching``, so the ACCESS EXCLUSIVE lock on ``tasks`` is not held
+    while the partition is scanned. A second transaction subtracts its rows from
+    ``task_stats`` and renames it back; until then ``/tasks/stats`` still counts
+    them. Tables left in ``_detaching`` by an interrupted run are finished first.
+    """
+    leftovers = db.execute(
+        text("SELECT relname FROM pg_class WHERE relkind = 'r' AND relname ~ :pattern ORDER BY relname"),
+        {"pattern": DETACHING_NAME_PATTERN.pattern},
+    ).scalars().all()
+    for staging in leftovers:
+        name = staging.removesuffix(DETACHING_SUFFIX)
+        _subtract_detached(db, staging, name)
+        logger.info("Finished detaching task partition %s", name)
+
+    if retention_months <= 0:
+        return []
+
+    cutoff = _add_months(_month_start(today or datetime.now(UTC).date()), -retention_months)
+    detached: list[str] = []
+    for name, month in sorted(list_partitions(db).items(), key=lambda item: item[1]):
+        if _add_months(month, 1) > cutoff:
+            continue
+        staging = f"{name}{DETACHING_SUFFIX}"
+        db.execute(text(f"ALTER TABLE tasks DETACH PARTITION {name}"))
+        db.execute(text(f"ALTER TABLE {name} RENAME TO {staging}"))
+        db.commit()
+        invalidate_all()
+        # Only task_stats is locked from here on, so task writers (which lock
+        # tasks before task_stats) cannot deadlock with this transaction.
+        _subtract_detached(db, staging, name)
+        logger.info("Detached task partition %s", name)
+        detached.append(name)
+    return detached
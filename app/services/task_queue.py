@@ -1,17 +1,27 @@
 from __future__ import annotations
 
-from redis import Redis
-from rq import Queue, Retry
+from typing import TYPE_CHECKING
 
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from rq import Queue
+    from rq.job import Job
+
+
+def _queue(name: str | None = None) -> Queue:
+    # redis and rq are imported on first enqueue so web workers that never
+    # enqueue (sync mode, read-only replicas) do not pay for them at startup.
+    from redis import Redis
+    from rq import Queue
 
-def _queue() -> Queue:
     connection = Redis.from_url(settings.redis_url)
-    return Queue(settings.task_queue_name, connection=connection)
+    return Queue(name or settings.task_queue_name, connection=connection)
 
 
 def enqueue_task_classification(task_id: str) -> None:
+    from rq import Retry
+
     queue = _queue()
     retry = Retry(max=settings.task_queue_retry_max, interval=[10, 30, 60])
     queue.enqueue(
@@ -20,3 +30,26 @@ def enqueue_task_classification(task_id: str) -> None:
         retry=retry,
         job_timeout=60,
     )
+
+
+def enqueue_task_bulk_delete(filters: dict) -> str:
+    # Deletes can run for TASK_BULK_DELETE_JOB_TIMEOUT_SECONDS; on their own queue
+    # they cannot hold every classification worker.
+    queue = _queue(settings.task_maintenance_queue_name)
+    job = queue.enqueue(
+        "app.jobs.task_bulk_delete.delete_tasks_job",
+        filters,
+        job_timeout=settings.task_bulk_delete_job_timeout_seconds,
+        meta={"deleted": 0, "chunks": 0},
+    )
+    return job.id
+
+
+def fetch_job(job_id: str) -> Job | None:
+    from rq.exceptions import NoSuchJobError
+    from rq.job import Job
+
+    try:
+        return Job.fetch(job_id, connection=_queue().connection)
+    except NoSuchJobError:
+        return None
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, TaskStatus
+from app.models.task_stats import TaskStats
+
+
+@dataclass(frozen=True, order=True)
+class TaskStatsKey:
+    owner_id: UUID
+    status: str
+    category: str
+    priority: str
+
+
+@dataclass(frozen=True)
+class TaskSnapshot:
+    key: TaskStatsKey
+    estimated_duration: int
+
+
+def snapshot_task(task: Task) -> TaskSnapshot | None:
+    """Capture the fields that feed ``task_stats``; ``None`` for unowned tasks.
+
+    Accepts a ``Task`` or any row with the same attribute names.
+    """
+    if task.owner_id is None:
+        return None
+    status = task.status.value if isinstance(task.status, TaskStatus) else str(task.status)
+    return TaskSnapshot(
+        key=TaskStatsKey(
+            owner_id=task.owner_id,
+            status=status,
+            category=task.category or "",
+            priority=task.priority or "",
+        ),
+        estimated_duration=task.estimated_duration or 0,
+    )
+
+
+def apply_task_change(db: Session, before: TaskSnapshot | None, after: TaskSnapshot | None) -> None:
+    """Move a task's contribution from ``before`` to ``after`` in the caller's transaction.
+
+    Pass ``before=None`` for inserts and ``after=None`` for deletes. Pending task
+    changes are flushed first so every writer locks ``tasks`` rows before
+    ``task_stats`` rows.
+    """
+    apply_task_changes(db, [(before, after)])
+
+
+def apply_task_changes(
+    db: Session, changes: Iterable[tuple[TaskSnapshot | None, TaskSnapshot | None]]
+) -> None:
+    """Apply many ``(before, after)`` pairs with one upsert per affected bucket."""
+    db.flush()
+    deltas: dict[TaskStatsKey, list[int]] = {}
+    for before, after in changes:
+        if before is not None:
+            entry = deltas.setdefault(before.key, [0, 0])
+            entry[0] -= 1
+            entry[1] -= before.estimated_duration
+        if after is not None:
+            entry = deltas.setdefault(after.key, [0, 0])
+            entry[0] += 1
+            entry[1] += after.estimated_duration
+
+    # Sorted keys give concurrent writers a consistent row lock order.
+    for key in sorted(deltas):
+        count_delta, duration_delta = deltas[key]
+        if count_delta == 0 and duration_delta == 0:
+            continue
+        _upsert_delta(db, key, count_delta, duration_delta)
+
+
+def _upsert_delta(db: Session, key: TaskStatsKey, count_delta: int, duration_delta: int) -> None:
+    statement = pg_insert(TaskStats).values(
+        owner_id=key.owner_id,
+        status=TaskStatus(key.status),
+        category=key.category,
+        priority=key.priority,
+        task_count=count_delta,
+        total_estimated_duration=duration_delta,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[TaskStats.owner_id, TaskStats.status, TaskStats.category, TaskStats.priority],
+        set_={
+            "task_count": TaskStats.task_count + statement.excluded.task_count,
+            "total_estimated_duration": TaskStats.total_estimated_duration
+            + statement.excluded.total_estimated_duration,
+        },
+    )
+    db.execute(statement)
+
+
+def load_task_stats(db: Session, owner_id: UUID | None) -> list[dict]:
+    """Return non-empty buckets, optionally scoped to a single owner."""
+    query = (
+        select(
+            TaskStats.status,
+            TaskStats.category,
+            TaskStats.priority,
+            func.sum(TaskStats.task_count).label("count"),
+            func.sum(TaskStats.total_estimated_duration).label("total_estimated_duration"),
+        )
+        .group_by(TaskStats.status, TaskStats.category, TaskStats.priority)
+        .having(func.sum(TaskStats.task_count) > 0)
+        .order_by(TaskStats.status, TaskStats.category, TaskStats.priority)
+    )
+    if owner_id is not None:
+        query = query.where(TaskStats.owner_id == owner_id)
+
+    return [
+        {
+            "status": row.status,
+            "category": row.category or None,
+            "priority": row.priority or None,
+            "count": int(row.count),
+            "total_estimated_duration": int(row.total_estimated_duration),
+        }
+        for row in db.execute(query)
+    ]
@@ -0,0 +1,225 @@
+"""Preforked classification worker.
+
+``rq worker`` forks a fresh work horse for every job, so each classification
+pays for a new database pool, Redis connection and ``AIClassifier``. Here the
+parent imports the job code once and forks ``WORKER_PROCESSES`` long-lived
+children. Each child warms its own pool and classifier and then runs jobs
+in-process from ``TASK_QUEUE_NAME``. Children are replaced after
+``WORKER_MAX_JOBS_PER_CHILD`` jobs, which bounds leaks, or when they crash.
+SIGTERM or SIGINT to the supervisor (Ctrl-C reaches the whole process group;
+children ignore SIGINT) sends each child one SIGTERM, which lets it finish its
+current job. Anything still running after ``WORKER_DRAIN_TIMEOUT_SECONDS`` is
+killed:
+
+    python -m app.worker --processes 4 --max-jobs 1000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import signal
+import sys
+import time
+from collections.abc import Callable
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+from types import FrameType
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# A child exits with this after running its share of jobs, asking to be replaced.
+RECYCLE_EXIT_CODE = 75
+# A child that dies sooner than this is respawned only after a pause, so a
+# broken deployment does not fork in a tight loop.
+MIN_CHILD_LIFETIME_SECONDS = 1.0
+
+ChildTarget = Callable[[str, int, bool], None]
+
+
+def preload() -> None:
+    """Import everything a job touches so forked children start with it in memory."""
+    import redis  # noqa: F401
+    import rq  # noqa: F401
+    from huggingface_hub import InferenceClient  # noqa: F401
+
+    import app.jobs.task_bulk_delete
+    import app.jobs.task_classification  # noqa: F401
+
+
+def warm_up() -> None:
+    """Connect the child's own database pool and build its classifier before the first job."""
+    from sqlalchemy import text
+
+    from app.database import engine
+    from app.services.task_classification import get_classifier
+
+    # Connections are not fork-safe; drop any the parent's pool handed down
+    # without closing them under the parent.
+    engine.dispose(close=False)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    try:
+        get_classifier()
+    except Exception:
+        # Jobs fall back to the default classification, as they would under rq.
+        logger.exception("Could not build the classifier; jobs will retry it")
+
+
+def run_child(queue_name: str, max_jobs: int, burst: bool) -> None:
+    """Body of one preforked child: run jobs in-process until stopped, drained or recycled."""
+    from redis import Redis
+    from rq import SimpleWorker
+
+    class CountingWorker(SimpleWorker):
+        jobs_run = 0
+
+        def _install_signal_handlers(self) -> None:
+            # SIGINT stays ignored (see _child_main); the supervisor's SIGTERM is the
+            # only stop request, so rq never sees a second one and cold-stops a job.
+            signal.signal(signal.SIGTERM, self.request_stop)
+
+        def request_stop(self, signum, frame):  # type: ignore[no-untyped-def]
+            try:
+                super().request_stop(signum, frame)
+            finally:
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        def perform_job(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+            try:
+                return super().perform_job(*args, **kwargs)
+            finally:
+                self.jobs_run += 1
+
+    warm_up()
+    worker = CountingWorker([queue_name], connection=Redis.from_url(settings.redis_url))
+    worker.work(burst=burst, max_jobs=max_jobs or None, logging_level=logging.getLevelName(logger.getEffectiveLevel()))
+    if max_jobs and worker.jobs_run >= max_jobs:
+        sys.exit(RECYCLE_EXIT_CODE)
+
+
+def _child_main(target: ChildTarget, queue_name: str, max_jobs: int, burst: bool) -> None:
+    # The fork copies the supervisor's handlers; a child must die on SIGTERM until
+    # rq installs its own warm-shutdown handlers. Ctrl-C sends SIGINT to the whole
+    # process group, so children ignore it and wait for the SIGTERM the
+    # supervisor sends while draining.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    target(queue_name, max_jobs, burst)
+
+
+class PreforkSupervisor:
+    """Keeps ``processes`` children running ``target`` and drains them on shutdown.
+
+    A child is respawned when it exits unless the supervisor is stopping. In
+    burst mode only recycled children are respawned, so the pool exits once
+    the queue is empty.
+    """
+
+    def __init__(
+        self,
+        *,
+        processes: int,
+        queue_name: str,
+        max_jobs: int,
+        drain_timeout: float,
+        burst: bool = False,
+        target: ChildTarget = run_child,
+    ) -> None:
+        self.processes = processes
+        self.queue_name = queue_name
+        self.max_jobs = max_jobs
+        self.drain_timeout = drain_timeout
+        self.burst = burst
+        self.target = target
+        self.spawned = 0
+        self._context = multiprocessing.get_context("fork")
+        self._children: dict[int, tuple[BaseProcess, float]] = {}
+        self._stopping = False
+
+    def stop(self, signum: int | None = None, frame: FrameType | None = None) -> None:
+        if not self._stopping:
+            logger.info("Draining %s worker processes", len(self._children))
+        self._stopping = True
+
+    def _spawn(self) -> None:
+        process = self._context.Process(
+            target=_child_main,
+            args=(self.target, self.queue_name, self.max_jobs, self.burst),
+            name=f"classification-worker-{self.spawned}",
+        )
+        process.start()
+        self.spawned += 1
+        self._children[process.sentinel] = (process, time.monotonic())
+
+    def _reap(self, sentinel: int) -> None:
+        process, started = self._children.pop(sentinel)
+        process.join()
+        recycled = process.exitcode == RECYCLE_EXIT_CODE
+        if recycled:
+            logger.info("Recycling worker pid=%s after %s jobs", process.pid, self.max_jobs)
+        elif process.exitcode and not self._stopping:
+            logger.warning("Worker pid=%s exited with code %s", process.pid, process.exitcode)
+        if self._stopping or (self.burst and not recycled):
+            return
+        if not recycled and time.monotonic() - started < MIN_CHILD_LIFETIME_SECONDS:
+            time.sleep(MIN_CHILD_LIFETIME_SECONDS)
+        self._spawn()
+
+    def _drain(self) -> None:
+        for process, _ in self._children.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + self.drain_timeout
+        while self._children and time.monotonic() < deadline:
+            for sentinel in wait(list(self._children), timeout=max(0.0, deadline - time.monotonic())):
+                self._reap(sentinel)
+        for process, _ in self._children.values():
+            logger.warning("Worker pid=%s did not drain within %.0fs; killing it", process.pid, self.drain_timeout)
+            process.kill()
+            process.join()
+        self._children.clear()
+
+    def run(self) -> None:
+        previous = {signum: signal.signal(signum, self.stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            for _ in range(self.processes):
+                self._spawn()
+            while self._children and not self._stopping:
+                for sentinel in wait(list(self._children), timeout=1.0):
+                    self._reap(sentinel)
+            self._drain()
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=settings.worker_processes)
+    parser.add_argument("--max-jobs", type=int, default=settings.worker_max_jobs_per_child, help="0 = never recycle")
+    parser.add_argument("--queue", default=settings.task_queue_name)
+    parser.add_argument("--drain-timeout", type=float, default=settings.worker_drain_timeout_seconds)
+    parser.add_argument("--burst", action="store_true", help="exit once the queue is empty")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    if not settings.redis_url:
+        parser.error("REDIS_URL must be set")
+
+    preload()
+    supervisor = PreforkSupervisor(
+        processes=args.processes,
+        queue_name=args.queue,
+        max_jobs=args.max_jobs,
+        drain_timeout=args.drain_timeout,
+        burst=args.burst,
+    )
+    logger.info("Starting %s worker processes on queue %r", args.processes, args.queue)
+    supervisor.run()
+
+
+if __name__ == "__main__":
+    main()
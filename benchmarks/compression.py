@@ -0,0 +1,113 @@
+"""CPU time versus bytes saved for each response encoding and level.
+
+Builds ``GET /tasks`` pages with ``dump_rows`` (the listing's real encoder) from
+synthetic tasks whose descriptions run up to 2000 characters of word-like text,
+then compresses each page at every level of gzip, brotli and zstd (the latter
+two only when installed). Prints one JSON object per encoding and level.
+
+    python -m benchmarks.compression --page-sizes 50,100 --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from app.api.tasks import TASK_RESPONSE_FIELDS
+from app.core.compression import make_encoder
+from app.core.serialization import dump_rows
+from benchmarks.common import git_revision
+
+WORDS = (
+    "deploy review migrate database index query cache worker queue retry timeout "
+    "customer report invoice dashboard release staging production rollback alert "
+    "latency throughput endpoint schema backfill partition replica token refresh "
+    "the a to of and for with on in after before when because should must could"
+).split()
+LEVELS = {
+    "gzip": list(range(1, 10)),
+    "br": list(range(0, 12)),
+    "zstd": [1, 3, 6, 9, 12, 15, 19],
+}
+MODULES = {"gzip": None, "br": "brotli", "zstd": "zstandard"}
+
+
+def _page(size: int, rng: random.Random) -> bytes:
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    owner_id = UUID(int=rng.getrandbits(128))
+    rows = []
+    for index in range(size):
+        description_length = rng.randint(0, 2000)
+        words: list[str] = []
+        while sum(len(word) + 1 for word in words) < description_length:
+            words.append(rng.choice(WORDS))
+        created_at = started + timedelta(seconds=rng.randint(0, 10_000_000), microseconds=rng.randint(0, 999_999))
+        rows.append(
+            (
+                UUID(int=rng.getrandbits(128)),
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 10))).capitalize(),
+                " ".join(words)[:description_length] or None,
+                rng.choice(["pending", "processing", "completed", "failed"]),
+                rng.choice(["development", "testing", "deployment", "maintenance", "documentation"]),
+                rng.choice(["low", "medium", "high", "urgent"]),
+                rng.choice([15, 30, 45, 60, 90, 120]),
+                owner_id,
+                created_at,
+                created_at + timedelta(minutes=rng.randint(0, 600)),
+            )
+        )
+    return dump_rows(TASK_RESPONSE_FIELDS, rows)
+
+
+def _compress(encoding: str, level: int, payload: bytes) -> bytes:
+    encoder = make_encoder(encoding, gzip_level=level, brotli_quality=level, zstd_level=level)
+    return encoder.compress(payload) + encoder.finish()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-sizes", default="50,100")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    revision = git_revision()
+    for page_size in (int(value) for value in args.page_sizes.split(",")):
+        payload = _page(page_size, rng)
+        for encoding, levels in LEVELS.items():
+            module = MODULES[encoding]
+            if module is not None and importlib.util.find_spec(module) is None:
+                print(json.dumps({"encoding": encoding, "skipped": f"{module} is not installed"}), flush=True)
+                continue
+            for level in levels:
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    compressed = _compress(encoding, level, payload)
+                    timings.append(time.perf_counter() - started)
+                best = min(timings)
+                print(
+                    json.dumps(
+                        {
+                            "revision": revision,
+                            "page_size": page_size,
+                            "encoding": encoding,
+                            "level": level,
+                            "original_bytes": len(payload),
+                            "compressed_bytes": len(compressed),
+                            "ratio": round(len(payload) / len(compressed), 2),
+                            "compress_ms": round(best * 1000, 3),
+                            "mb_per_s": round(len(payload) / best / 1_000_000, 1),
+                        }
+                    ),
+                    flush=True,
+                )
+
+
+if __name__ == "__main__":
+    main()
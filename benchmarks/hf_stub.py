@@ -0,0 +1,198 @@
+"""Local stand-in for the Hugging Face zero-shot classification endpoint.
+
+Answers ``POST /models/<model id>`` with the same payload shape as the hosted
+Inference API (a list of ``{"label", "score"}`` sorted by score), so
+``AIClassifier`` can be benchmarked offline by setting
+``HF_INFERENCE_BASE_URL=http://127.0.0.1:8090``. Scores are derived from a hash
+of the input text, so the same task always gets the same labels.
+
+Latency, error and cold-start behaviour are configurable:
+
+* ``--latency`` picks a distribution in milliseconds: ``fixed:MS``,
+  ``uniform:LOW:HIGH``, ``normal:MEAN:STDDEV``, ``lognormal:MEDIAN:SIGMA`` or
+  ``exponential:MEAN``.
+* ``--rate-429`` and ``--rate-503`` are the fraction of requests answered with
+  that status and a ``Retry-After`` header of ``--retry-after`` seconds.
+* ``--loading-seconds`` answers every request with the hosted API's "model is
+  currently loading" 503 for that long after start-up; ``--loading-rate``
+  returns it at random afterwards, as when a model is evicted.
+
+    python -m benchmarks.hf_stub --port 8090 --latency lognormal:120:0.4 --rate-429 0.02
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+def parse_latency(value: str) -> Callable[[random.Random], float]:
+    """Turn a ``kind:params`` spec into a sampler returning seconds."""
+    kind, _, raw = value.partition(":")
+    try:
+        params = [float(item) for item in raw.split(":")] if raw else []
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid latency parameters: {value}") from exc
+
+    samplers: dict[str, tuple[int, Callable[[random.Random], float]]] = {
+        "fixed": (1, lambda rng: params[0]),
+        "uniform": (2, lambda rng: rng.uniform(params[0], params[1])),
+        "normal": (2, lambda rng: rng.gauss(params[0], params[1])),
+        "lognormal": (2, lambda rng: params[0] * rng.lognormvariate(0.0, params[1])),
+        "exponential": (1, lambda rng: rng.expovariate(1.0 / params[0]) if params[0] > 0 else 0.0),
+    }
+    if kind not in samplers:
+        raise argparse.ArgumentTypeError(f"unknown latency distribution: {kind}")
+    arity, sampler = samplers[kind]
+    if len(params) != arity:
+        raise argparse.ArgumentTypeError(f"{kind} latency takes {arity} parameter(s)")
+    return lambda rng: max(0.0, sampler(rng)) / 1000
+
+
+def score_labels(text: str, labels: list[str], multi_label: bool = False) -> list[dict[str, object]]:
+    """Deterministic pseudo-scores for ``labels`` given ``text``, highest first."""
+    weights = [
+        int.from_bytes(hashlib.sha256(f"{text}\x00{label}".encode("utf-8")).digest()[:4], "big") / 2**32
+        for label in labels
+    ]
+    if not multi_label:
+        total = sum(weights) or 1.0
+        weights = [weight / total for weight in weights]
+    ranked = sorted(zip(labels, weights), key=lambda item: item[1], reverse=True)
+    return [{"label": label, "score": round(score, 6)} for label, score in ranked]
+
+
+class StubBehaviour:
+    """Decides, per request, how long to wait and whether to fail."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self._latency = args.latency
+        self._rate_429 = args.rate_429
+        self._rate_503 = args.rate_503
+        self._loading_rate = args.loading_rate
+        self._loading_until = time.monotonic() + args.loading_seconds
+        self._loading_seconds = args.loading_seconds
+        self.retry_after = args.retry_after
+        self._rng = random.Random(args.seed)
+        self._lock = threading.Lock()
+        self.counts: dict[int, int] = {}
+
+    def next_outcome(self) -> tuple[float, str]:
+        """Return ``(delay_seconds, outcome)`` with outcome ``ok``, ``429``, ``503`` or ``loading``."""
+        with self._lock:
+            delay = self._latency(self._rng)
+            if time.monotonic() < self._loading_until:
+                return 0.0, "loading"
+            roll = self._rng.random()
+        if roll < self._rate_429:
+            return delay, "429"
+        if roll < self._rate_429 + self._rate_503:
+            return delay, "503"
+        if roll < self._rate_429 + self._rate_503 + self._loading_rate:
+            return 0.0, "loading"
+        return delay, "ok"
+
+    def loading_estimate(self) -> float:
+        return round(max(self._loading_until - time.monotonic(), float(self.retry_after)), 1)
+
+    def count(self, status: int) -> None:
+        with self._lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "hf-stub/1.0"
+    behaviour: StubBehaviour
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "responses": self.behaviour.counts})
+        else:
+            self._send_json(404, {"error": "Not Found"})
+
+    def do_POST(self) -> None:
+        if not self.path.startswith("/models/"):
+            self._send_json(404, {"error": "Not Found"})
+            return
+        model = self.path[len("/models/") :]
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            text = payload["inputs"]
+            parameters = payload.get("parameters") or {}
+            labels = list(parameters["candidate_labels"])
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"error": "Expected inputs and parameters.candidate_labels"})
+            return
+
+        delay, outcome = self.behaviour.next_outcome()
+        if delay:
+            time.sleep(delay)
+        if outcome == "loading":
+            self._send_json(
+                503,
+                {"error": f"Model {model} is currently loading", "estimated_time": self.behaviour.loading_estimate()},
+            )
+        elif outcome == "429":
+            self._send_json(429, {"error": "Rate limit reached. Please retry later."}, retry_after=True)
+        elif outcome == "503":
+            self._send_json(503, {"error": "Service temporarily unavailable"}, retry_after=True)
+        else:
+            self._send_json(200, score_labels(str(text), labels, bool(parameters.get("multi_label"))))
+
+    def log_message(self, format: str, *args: object) -> None:
+        logger.debug(format, *args)
+
+    def _send_json(self, status: int, body: object, retry_after: bool = False) -> None:
+        encoded = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        if retry_after or status == 503:
+            self.send_header("Retry-After", str(self.behaviour.retry_after))
+        self.end_headers()
+        self.wfile.write(encoded)
+        self.behaviour.count(status)
+
+
+def build_server(args: argparse.Namespace) -> ThreadingHTTPServer:
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"behaviour": StubBehaviour(args)})
+    return ThreadingHTTPServer((args.host, args.port), handler)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=parse_latency, default=parse_latency("lognormal:150:0.5"))
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-503", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1, help="seconds sent in Retry-After")
+    parser.add_argument("--loading-seconds", type=float, default=0.0)
+    parser.add_argument("--loading-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    logging.basicConfig(level=logging.INFO)
+    server = build_server(args)
+    logger.info("Hugging Face stub listening on http://%s:%s", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""Mixed-workload load test against an in-process app built by ``create_app``.
+
+Seeds ``--users`` users and ``--tasks`` tasks directly in ``DATABASE_URL``, serves
+the app with uvicorn in a background thread and drives a weighted mix of login,
+create, list (with filters), get, patch and delete requests from ``--concurrency``
+async clients. Task classification runs synchronously against a deterministic
+in-process stub, so runs need no network access; pass ``--hf-stub-url`` to run
+the real ``AIClassifier`` against ``benchmarks.hf_stub`` instead and include its
+latency and retries. Results (per operation and
+overall p50/p95/p99 and RPS) are written as JSON to stdout or ``--output`` so
+runs can be compared across commits.
+
+Start Postgres and Redis first, then migrate:
+
+    docker compose up -d postgres redis && alembic upgrade head
+    python -m benchmarks.load_test --users 50 --tasks 5000 --duration 30 --output before.json
+"""
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ["TASK_CLASSIFICATION_MODE"] = "sync"
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import hashlib  # noqa: E402
+import json  # noqa: E402
+import random  # noqa: E402
+import threading  # noqa: E402
+import time  # noqa: E402
+from datetime import datetime, timezone  # noqa: E402
+from uuid import uuid4  # noqa: E402
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from sqlalchemy import delete, insert, select, text  # noqa: E402
+
+import app.services.task_classification as task_classification  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.security import hash_password  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.main import create_app  # noqa: E402
+from app.models.task import Task, TaskStatus  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.ai_classifier import CATEGORY_LABELS, PRIORITY_LABELS  # noqa: E402
+from benchmarks.common import git_revision, summarize  # noqa: E402
+
+PASSWORD = "LoadTest123"
+DEFAULT_MIX = "login=5,create=15,list=40,get=25,patch=10,delete=5"
+PATCH_CATEGORIES = ["development", "testing", "deployment", "maintenance", "documentation"]
+PATCH_PRIORITIES = ["low", "medium", "high", "urgent"]
+
+
+class StubClassifier:
+    """Deterministic stand-in for ``AIClassifier``: labels derive from a hash of the title."""
+
+    def classify_task(self, title: str, description: str | None) -> dict[str, object]:
+        digest = hashlib.sha256(title.encode("utf-8")).digest()
+        return {
+            "category": CATEGORY_LABELS[digest[0] % len(CATEGORY_LABELS)],
+            "priority": PRIORITY_LABELS[digest[1] % len(PRIORITY_LABELS)],
+            "estimated_duration": 15 + 5 * (digest[2] % 24),
+        }
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = int(weight)
+    unknown = set(mix) - {"login", "create", "list", "get", "patch", "delete"}
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown operations: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def seed(run_id: str, users: int, tasks: int, rng: random.Random) -> list[str]:
+    """Insert users and tasks in bulk and fold the tasks into ``task_stats``."""
+    hashed = hash_password(PASSWORD)
+    emails = [f"loadtest-{run_id}-{index}@example.com" for index in range(users)]
+    user_ids = [uuid4() for _ in emails]
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        db.execute(
+            insert(User),
+            [{"id": user_id, "email": email, "hashed_password": hashed} for user_id, email in zip(user_ids, emails)],
+        )
+        rows = []
+        for index in range(tasks):
+            title = f"Load test task {index}"
+            classification = StubClassifier().classify_task(title, None)
+            rows.append(
+                {
+                    "id": uuid4(),
+                    "title": title,
+                    "description": "Seeded for load testing " * rng.randint(1, 20),
+                    "status": rng.choice(list(TaskStatus)),
+                    "owner_id": user_ids[index % users],
+                    "created_at": now,
+                    "updated_at": now,
+                    **classification,
+                }
+            )
+        for start in range(0, len(rows), 5000):
+            db.execute(insert(Task), rows[start : start + 5000])
+        db.execute(
+            text(
+                """
+                INSERT INTO task_stats (owner_id, status, category, priority, task_count, total_estimated_duration)
+                SELECT owner_id, status, COALESCE(category, ''), COALESCE(priority, ''),
+                       COUNT(*), COALESCE(SUM(estimated_duration), 0)
+                FROM tasks WHERE owner_id = ANY(:owners)
+                GROUP BY owner_id, status, COALESCE(category, ''), COALESCE(priority, '')
+                ON CONFLICT (owner_id, status, category, priority) DO UPDATE SET
+                    task_count = task_stats.task_count + EXCLUDED.task_count,
+                    total_estimated_duration = task_stats.total_estimated_duration
+                        + EXCLUDED.total_estimated_duration
+                """
+            ),
+            {"owners": user_ids},
+        )
+        db.commit()
+    return emails
+
+
+def cleanup(run_id: str) -> None:
+    with SessionLocal() as db:
+        user_ids = db.scalars(select(User.id).where(User.email.like(f"loadtest-{run_id}-%"))).all()
+        if user_ids:
+            db.execute(delete(Task).where(Task.owner_id.in_(user_ids)))
+            db.execute(delete(User).where(User.id.in_(user_ids)))
+        db.commit()
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    def record(self, operation: str, elapsed: float, ok: bool) -> None:
+        self.latencies.setdefault(operation, []).append(elapsed)
+        if not ok:
+            self.errors[operation] = self.errors.get(operation, 0) + 1
+
+
+async def _client_loop(
+    base_url: str,
+    email: str,
+    mix: dict[str, int],
+    stop_at: float,
+    rng: random.Random,
+    recorder: _Recorder,
+) -> None:
+    operations = list(mix)
+    weights = [mix[name] for name in operations]
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        login = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+        login.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+        listing = await client.get("/tasks", params={"limit": 100})
+        task_ids = [task["id"] for task in listing.json()]
+
+        while time.monotonic() < stop_at:
+            operation = rng.choices(operations, weights)[0]
+            if operation in {"get", "patch", "delete"} and not task_ids:
+                operation = "create"
+
+            started = time.perf_counter()
+            if operation == "login":
+                response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+                ok = response.status_code == 200
+            elif operation == "create":
+                response = await client.post(
+                    "/tasks",
+                    json={"title": f"Load test {uuid4().hex[:8]}", "description": "Created during load test"},
+                )
+                ok = response.status_code == 201
+                if ok:
+                    task_ids.append(response.json()["id"])
+            elif operation == "list":
+                params: dict[str, object] = {"limit": rng.choice([10, 50, 100])}
+                if rng.random() < 0.5:
+                    params["status"] = rng.choice([status.value for status in TaskStatus])
+                if rng.random() < 0.3:
+                    params["priority"] = rng.choice(PATCH_PRIORITIES)
+                response = await client.get("/tasks", params=params)
+                ok = response.status_code == 200
+            elif operation == "get":
+                response = await client.get(f"/tasks/{rng.choice(task_ids)}")
+                ok = response.status_code == 200
+            elif operation == "patch":
+                response = await client.patch(
+                    f"/tasks/{rng.choice(task_ids)}",
+                    json={"priority": rng.choice(PATCH_PRIORITIES), "category": rng.choice(PATCH_CATEGORIES)},
+                )
+                ok = response.status_code == 200
+            else:
+                task_id = task_ids.pop(rng.randrange(len(task_ids)))
+                response = await client.delete(f"/tasks/{task_id}")
+                ok = response.status_code == 204
+            recorder.record(operation, time.perf_counter() - started, ok)
+
+
+async def drive(base_url: str, emails: list[str], args: argparse.Namespace) -> tuple[_Recorder, float]:
+    recorder = _Recorder()
+    started = time.monotonic()
+    stop_at = started + args.duration
+    await asyncio.gather(
+        *(
+            _client_loop(
+                base_url,
+                emails[index % len(emails)],
+                args.mix,
+                stop_at,
+                random.Random(args.seed + index),
+                recorder,
+            )
+            for index in range(args.concurrency)
+        )
+    )
+    return recorder, time.monotonic() - started
+
+
+def _serve(port: int) -> tuple[uvicorn.Server, threading.Thread]:
+    config = settings.model_copy()
+    config.rate_limit_enabled = False
+    config.task_classification_mode = "sync"
+    server = uvicorn.Server(uvicorn.Config(create_app(config), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("uvicorn did not start")
+        time.sleep(0.05)
+    return server, thread
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--mix", type=_parse_mix, default=_parse_mix(DEFAULT_MIX))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--hf-stub-url", help="classify through AIClassifier against this benchmarks.hf_stub URL")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--keep-data", action="store_true", help="keep seeded users and tasks")
+    args = parser.parse_args()
+
+    if args.hf_stub_url:
+        os.environ["HF_INFERENCE_BASE_URL"] = args.hf_stub_url
+    else:
+        task_classification.AIClassifier = StubClassifier
+    run_id = uuid4().hex[:8]
+    emails = seed(run_id, args.users, args.tasks, random.Random(args.seed))
+    server, thread = _serve(args.port)
+    try:
+        recorder, elapsed = asyncio.run(drive(f"http://127.0.0.1:{args.port}", emails, args))
+    finally:
+        server.should_exit = True
+        thread.join(timeout=30)
+        if not args.keep_data:
+            cleanup(run_id)
+
+    all_latencies = [value for values in recorder.latencies.values() for value in values]
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "users": args.users,
+            "tasks": args.tasks,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "mix": args.mix,
+            "seed": args.seed,
+            "classifier": args.hf_stub_url or "in-process stub",
+        },
+        "overall": summarize(all_latencies, elapsed, sum(recorder.errors.values())),
+        "operations": {
+            name: summarize(values, elapsed, recorder.errors.get(name, 0))
+            for name, values in sorted(recorder.latencies.items())
+        },
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Measure GET /tasks throughput across uvicorn worker counts and DB pool sizes.
+
+Each combination boots a fresh ``uvicorn app.main:app`` against ``DATABASE_URL``,
+drives it with a fixed number of concurrent clients and prints one JSON object per
+run. Total server connections are roughly ``workers * (pool_size + overflow)``,
+so watch for runs where that exceeds Postgres' ``max_connections``.
+
+    python -m benchmarks.pool_sizing --workers 1,2,4 --pool-sizes 2,5,10
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from uuid import uuid4
+
+import httpx
+
+from benchmarks.common import summarize
+
+
+def _csv_ints(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health/live", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not become ready")
+
+
+def _auth_headers(base_url: str) -> dict[str, str]:
+    email = f"bench-{uuid4().hex[:12]}@example.com"
+    password = "BenchPass123"
+    httpx.post(f"{base_url}/auth/register", json={"email": email, "password": password}).raise_for_status()
+    login = httpx.post(f"{base_url}/auth/login", json={"email": email, "password": password})
+    login.raise_for_status()
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    for index in range(20):
+        httpx.post(f"{base_url}/tasks", json={"title": f"Bench task {index}"}, headers=headers).raise_for_status()
+    return headers
+
+
+def _drive(base_url: str, headers: dict[str, str], concurrency: int, duration: float) -> dict[str, float]:
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def worker() -> None:
+        nonlocal errors
+        with httpx.Client(base_url=base_url, headers=headers, timeout=30.0) as client:
+            while time.monotonic() < stop_at:
+                started = time.perf_counter()
+                response = client.get("/tasks", params={"limit": 50})
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    if response.status_code != 200:
+                        errors += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return summarize(latencies, duration, errors)
+
+
+def run(workers: int, pool_size: int, args: argparse.Namespace) -> dict:
+    env = {
+        **os.environ,
+        "DB_POOL_SIZE": str(pool_size),
+        "DB_MAX_OVERFLOW": str(args.max_overflow),
+        "RATE_LIMIT_ENABLED": "false",
+        "TASK_CLASSIFICATION_MODE": "sync",
+    }
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(args.port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    try:
+        _wait_until_ready(base_url)
+        headers = _auth_headers(base_url)
+        result = _drive(base_url, headers, args.concurrency, args.duration)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return {"workers": workers, "pool_size": pool_size, "max_overflow": args.max_overflow, **result}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=_csv_ints, default=[1, 2, 4])
+    parser.add_argument("--pool-sizes", type=_csv_ints, default=[2, 5, 10, 20])
+    parser.add_argument("--max-overflow", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        for pool_size in args.pool_sizes:
+            print(json.dumps(run(workers, pool_size, args)), flush=True)
+
+
+if __name__ == "__main__":
+    main()
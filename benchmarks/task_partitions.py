@@ -0,0 +1,154 @@
+"""Compare listing and insert latency on a plain vs a monthly-partitioned tasks table.
+
+Builds two scratch tables shaped like ``tasks`` in ``DATABASE_URL``, loads the
+same synthetic rows into both with ``generate_series`` and times the queries
+``GET /tasks`` issues (owner-scoped, newest first, with and without a
+created_at range) plus single-row inserts. Prints one JSON object per table.
+Loading the default 50M rows takes a while and needs tens of GB of disk; use
+``--rows`` for quicker runs. Scratch tables are dropped unless ``--keep``.
+
+    python -m benchmarks.task_partitions --rows 50000000 --months 24
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from datetime import date, timedelta
+from uuid import uuid4
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+
+COLUMNS = """
+    id uuid NOT NULL DEFAULT gen_random_uuid(),
+    title varchar(255) NOT NULL,
+    description text,
+    status task_status NOT NULL DEFAULT 'pending',
+    category varchar(100),
+    priority varchar(20),
+    estimated_duration integer,
+    owner_id uuid,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    updated_at timestamptz NOT NULL DEFAULT now()
+"""
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _create_tables(connection, months: int, start: date) -> None:
+    connection.execute(text("DROP TABLE IF EXISTS bench_tasks_plain, bench_tasks_partitioned CASCADE"))
+    connection.execute(text(f"CREATE TABLE bench_tasks_plain ({COLUMNS}, PRIMARY KEY (id))"))
+    connection.execute(
+        text(
+            f"CREATE TABLE bench_tasks_partitioned ({COLUMNS}, PRIMARY KEY (id, created_at)) "
+            "PARTITION BY RANGE (created_at)"
+        )
+    )
+    for offset in range(months + 1):
+        month = _add_months(start, offset)
+        connection.execute(
+            text(
+                f"CREATE TABLE bench_tasks_partitioned_p{month:%Y%m} PARTITION OF bench_tasks_partitioned "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+            )
+        )
+
+
+def _load(connection, table: str, rows: int, owners: int, start: date, months: int, batch: int) -> None:
+    span_seconds = (_add_months(start, months) - start).total_seconds()
+    for offset in range(0, rows, batch):
+        connection.execute(
+            text(
+                f"""
+                INSERT INTO {table} (title, description, status, category, priority, estimated_duration,
+                                     owner_id, created_at, updated_at)
+                SELECT
+                    'Synthetic task ' || n,
+                    repeat('lorem ipsum ', 20),
+                    (ARRAY['pending', 'processing', 'completed', 'failed'])[1 + n % 4]::task_status,
+                    (ARRAY['development', 'testing', 'deployment', 'maintenance'])[1 + n % 4],
+                    (ARRAY['low', 'medium', 'high', 'urgent'])[1 + (n / 7) % 4],
+                    30 + n % 90,
+                    ('00000000-0000-0000-0000-' || lpad(to_hex(n % :owners), 12, '0'))::uuid,
+                    :start + make_interval(secs => (n::float8 / :rows) * :span),
+                    now()
+                FROM generate_series(:first, :last) AS n
+                """
+            ),
+            {
+                "owners": owners,
+                "start": start,
+                "rows": rows,
+                "span": span_seconds,
+                "first": offset,
+                "last": min(offset + batch, rows) - 1,
+            },
+        )
+    connection.execute(text(f"CREATE INDEX ON {table} (owner_id, created_at)"))
+    connection.execute(text(f"VACUUM ANALYZE {table}"))
+
+
+def _time(connection, statement, params: dict, iterations: int) -> dict[str, float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        connection.execute(statement, params).fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    quantiles = statistics.quantiles(samples, n=100)
+    return {"p50_ms": round(quantiles[49], 3), "p95_ms": round(quantiles[94], 3)}
+
+
+def _measure(connection, table: str, start: date, months: int, iterations: int) -> dict:
+    owner = "00000000-0000-0000-0000-000000000007"
+    recent_from = _add_months(start, months - 1)
+    listing = text(f"SELECT * FROM {table} WHERE owner_id = :owner ORDER BY created_at DESC LIMIT 50")
+    ranged = text(
+        f"SELECT * FROM {table} WHERE owner_id = :owner AND created_at >= :after "
+        "ORDER BY created_at DESC LIMIT 50"
+    )
+    insert = text(
+        f"INSERT INTO {table} (title, owner_id, created_at) VALUES (:title, :owner, :created_at) RETURNING id"
+    )
+    return {
+        "table": table,
+        "list_recent": _time(connection, listing, {"owner": owner}, iterations),
+        "list_created_range": _time(connection, ranged, {"owner": owner, "after": recent_from}, iterations),
+        "insert": _time(
+            connection,
+            insert,
+            {"title": f"bench {uuid4()}", "owner": owner, "created_at": recent_from + timedelta(days=1)},
+            iterations,
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--owners", type=int, default=10_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--batch", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch tables afterwards")
+    args = parser.parse_args()
+
+    start = _add_months(date.today().replace(day=1), -args.months + 1)
+    engine = create_engine(settings.database_url)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        _create_tables(connection, args.months, start)
+        for table in ("bench_tasks_plain", "bench_tasks_partitioned"):
+            _load(connection, table, args.rows, args.owners, start, args.months, args.batch)
+            result = _measure(connection, table, start, args.months, args.iterations)
+            print(json.dumps({"rows": args.rows, **result}), flush=True)
+        if not args.keep:
+            connection.execute(text("DROP TABLE bench_tasks_plain, bench_tasks_partitioned CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Latency of ``GET /tasks?q=`` search queries on a large partitioned table.
+
+Builds a scratch table shaped like ``tasks`` (monthly partitions, the
+generated ``search_vector`` column and both GIN indexes from migration
+``20260210_01``) in ``DATABASE_URL`` and loads synthetic rows with
+``generate_series``. It then times the statements ``GET /tasks`` issues for
+full-text, prefix and misspelled searches, owner-scoped and combined with
+filters, next to an unindexed ``ILIKE`` scan of the same owner's tasks.
+Prints one JSON object. Loading the default 10M rows and building the indexes
+takes a while; use ``--rows`` for quicker runs. The scratch table is dropped
+unless ``--keep``.
+
+    python -m benchmarks.task_search --rows 10000000 --months 12
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.models.task import SEARCH_VECTOR_SQL
+from benchmarks.common import git_revision
+
+TABLE = "bench_tasks_search"
+VERBS = ["Fix", "Deploy", "Review", "Refactor", "Document", "Test", "Migrate", "Upgrade", "Monitor", "Design"]
+NOUNS = [
+    "login page", "billing service", "search index", "payment gateway", "user profile", "API gateway",
+    "email worker", "report export", "cache layer", "mobile client", "admin dashboard", "audit log",
+]
+DETAILS = [
+    "customers report intermittent timeouts", "blocked on the security review", "needed before the quarterly release",
+    "follow up from the incident retro", "requested by the support team", "part of the infrastructure budget",
+]
+LISTING = f"""
+    SELECT id, title, description, status, category, priority, estimated_duration, owner_id, created_at, updated_at
+    FROM {TABLE}
+    WHERE owner_id = :owner {{filters}}
+      AND (search_vector @@ websearch_to_tsquery('english', :q) OR :q <% title)
+    ORDER BY ts_rank_cd(search_vector, websearch_to_tsquery('english', :q)) + word_similarity(:q, title) DESC,
+             created_at DESC, id
+    LIMIT 50
+"""
+CASES = {
+    "full_text": ("deploy payment", ""),
+    "phrase": ('"billing service" -timeouts', ""),
+    "prefix": ("refact", ""),
+    "typo": ("Migrrate serch index", ""),
+    "with_filters": ("deploy", "AND status = 'completed' AND priority = 'high'"),
+}
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _words(values: list[str]) -> str:
+    return "ARRAY[" + ", ".join("'" + value.replace("'", "''") + "'" for value in values) + "]"
+
+
+def _create_table(connection, months: int, start: date) -> None:
+    connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    connection.execute(text(f"DROP TABLE IF EXISTS {TABLE} CASCADE"))
+    connection.execute(
+        text(
+            f"""
+            CREATE TABLE {TABLE} (
+                id uuid NOT NULL DEFAULT gen_random_uuid(),
+                title varchar(255) NOT NULL,
+                description text,
+                status task_status NOT NULL DEFAULT 'pending',
+                category varchar(120),
+                priority varchar(16),
+                estimated_duration integer,
+                owner_id uuid,
+                created_at timestamptz NOT NULL DEFAULT now(),
+                updated_at timestamptz NOT NULL DEFAULT now(),
+                search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED,
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+            """
+        )
+    )
+    for offset in range(months + 1):
+        month = _add_months(start, offset)
+        connection.execute(
+            text(
+                f"CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+            )
+        )
+
+
+def _load(connection, rows: int, owners: int, start: date, months: int, batch: int) -> None:
+    span_seconds = (_add_months(start, months) - start).total_seconds()
+    for offset in range(0, rows, batch):
+        connection.execute(
+            text(
+                f"""
+                INSERT INTO {TABLE} (title, description, status, category, priority, estimated_duration,
+                                     owner_id, created_at, updated_at)
+                SELECT
+                    ({_words(VERBS)})[1 + n % {len(VERBS)}] || ' ' || ({_words(NOUNS)})[1 + (n / 7) % {len(NOUNS)}]
+                        || ' #' || n,
+                    ({_words(DETAILS)})[1 + (n / 3) % {len(DETAILS)}] || ', ' || ({_words(NOUNS)})[1 + n % {len(NOUNS)}],
+                    (ARRAY['pending', 'processing', 'completed', 'failed'])[1 + n % 4]::task_status,
+                    (ARRAY['development', 'testing', 'deployment', 'maintenance'])[1 + n % 4],
+                    (ARRAY['low', 'medium', 'high', 'urgent'])[1 + (n / 5) % 4],
+                    30 + n % 90,
+                    ('00000000-0000-0000-0000-' || lpad(to_hex(n % :owners), 12, '0'))::uuid,
+                    :start + make_interval(secs => (n::float8 / :rows) * :span),
+                    now()
+                FROM generate_series(:first, :last) AS n
+                """
+            ),
+            {
+                "owners": owners,
+                "start": start,
+                "rows": rows,
+                "span": span_seconds,
+                "first": offset,
+                "last": min(offset + batch, rows) - 1,
+            },
+        )
+    connection.execute(text(f"CREATE INDEX ON {TABLE} (owner_id, created_at)"))
+    connection.execute(text(f"CREATE INDEX ON {TABLE} USING gin (search_vector)"))
+    connection.execute(text(f"CREATE INDEX ON {TABLE} USING gin (title gin_trgm_ops)"))
+    connection.execute(text(f"VACUUM ANALYZE {TABLE}"))
+
+
+def _time(connection, statement, params: dict, iterations: int) -> dict[str, float]:
+    samples = []
+    matches = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        matches = len(connection.execute(statement, params).fetchall())
+        samples.append((time.perf_counter() - started) * 1000)
+    quantiles = statistics.quantiles(samples, n=100)
+    return {"p50_ms": round(quantiles[49], 3), "p95_ms": round(quantiles[94], 3), "rows": matches}
+
+
+def _measure(connection, iterations: int) -> dict[str, dict[str, float]]:
+    owner = "00000000-0000-0000-0000-000000000007"
+    results = {}
+    for name, (q, filters) in CASES.items():
+        results[name] = _time(connection, text(LISTING.format(filters=filters)), {"owner": owner, "q": q}, iterations)
+    scan = text(
+        f"SELECT id FROM {TABLE} WHERE owner_id = :owner AND (title ILIKE :pattern OR description ILIKE :pattern) "
+        "ORDER BY created_at DESC LIMIT 50"
+    )
+    results["ilike_scan"] = _time(connection, scan, {"owner": owner, "pattern": "%deploy%payment%"}, iterations)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--owners", type=int, default=1_000)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--batch", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch table afterwards")
+    args = parser.parse_args()
+
+    start = _add_months(date.today().replace(day=1), -args.months + 1)
+    engine = create_engine(settings.database_url)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        _create_table(connection, args.months, start)
+        loading = time.perf_counter()
+        _load(connection, args.rows, args.owners, start, args.months, args.batch)
+        load_seconds = time.perf_counter() - loading
+        results = _measure(connection, args.iterations)
+        if not args.keep:
+            connection.execute(text(f"DROP TABLE {TABLE} CASCADE"))
+
+    print(
+        json.dumps(
+            {
+                "revision": git_revision(),
+                "rows": args.rows,
+                "owners": args.owners,
+                "load_seconds": round(load_seconds, 1),
+                **results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
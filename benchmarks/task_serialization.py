@@ -0,0 +1,94 @@
+"""Serialization cost of a task listing: Pydantic response model vs direct row encoding.
+
+``pydantic`` mirrors the old ``list_tasks`` path: ORM ``Task`` objects validated
+through ``TaskResponse`` (``from_attributes``) and dumped by FastAPI.
+``orjson_rows`` is the current path: selected column rows encoded with
+``dump_rows``. Both outputs are checked to be byte-identical before timing.
+
+    python -m benchmarks.task_serialization --sizes 100,10000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+from app.api.tasks import TASK_RESPONSE_FIELDS
+from app.core.serialization import dump_rows
+from app.models.task import Task, TaskStatus
+from app.schemas.task import TaskResponse
+from benchmarks.common import git_revision
+
+
+def _tasks(count: int) -> list[Task]:
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    owner_id = uuid4()
+    return [
+        Task(
+            id=uuid4(),
+            title=f"Benchmark task {index}",
+            description="Serialize me " * (index % 10),
+            status=list(TaskStatus)[index % len(TaskStatus)],
+            category="development",
+            priority="medium",
+            estimated_duration=30 + index % 90,
+            owner_id=owner_id,
+            created_at=started + timedelta(seconds=index, microseconds=index % 1000),
+            updated_at=started + timedelta(seconds=index + 1),
+        )
+        for index in range(count)
+    ]
+
+
+def _best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,10000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(list[TaskResponse])
+    for size in (int(value) for value in args.sizes.split(",")):
+        tasks = _tasks(size)
+        rows = [tuple(getattr(task, name) for name in TASK_RESPONSE_FIELDS) for task in tasks]
+
+        def pydantic_path() -> bytes:
+            return adapter.dump_json(adapter.validate_python(tasks, from_attributes=True))
+
+        def orjson_path() -> bytes:
+            return dump_rows(TASK_RESPONSE_FIELDS, rows)
+
+        if pydantic_path() != orjson_path():
+            raise SystemExit(f"outputs differ at {size} rows")
+
+        pydantic_seconds = _best_of(args.repeat, pydantic_path)
+        orjson_seconds = _best_of(args.repeat, orjson_path)
+        print(
+            json.dumps(
+                {
+                    "revision": git_revision(),
+                    "rows": size,
+                    "bytes": len(orjson_path()),
+                    "pydantic_ms": round(pydantic_seconds * 1000, 3),
+                    "orjson_rows_ms": round(orjson_seconds * 1000, 3),
+                    "speedup": round(pydantic_seconds / orjson_seconds, 1),
+                }
+            ),
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Latency and statement count of ``POST /tasks`` and ``PATCH /tasks/{id}``.
+
+Drives the app in-process with ``TestClient`` against ``DATABASE_URL`` (sync
+classification with a constant stub, so the Hugging Face call does not dominate)
+and reports p50/p95/p99 plus the statements each request ran. Run it on two
+commits to compare write paths:
+
+    python -m benchmarks.task_writes --iterations 500
+"""
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ["TASK_CLASSIFICATION_MODE"] = "sync"
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import time  # noqa: E402
+from uuid import uuid4  # noqa: E402
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import delete, select  # noqa: E402
+
+import app.services.task_classification as task_classification  # noqa: E402
+from app.core.sql_instrumentation import capture_request_stats  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.main import create_app  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from app.models.user import User  # noqa: E402
+from benchmarks.common import git_revision, summarize  # noqa: E402
+
+
+class _ConstantClassifier:
+    def classify_task(self, title: str, description: str | None) -> dict[str, object]:
+        return {"category": "development", "priority": "medium", "estimated_duration": 60}
+
+
+def _measure(client: TestClient, iterations: int, request) -> dict[str, float]:
+    latencies = []
+    errors = 0
+    with capture_request_stats() as captured:
+        started_all = time.perf_counter()
+        for index in range(iterations):
+            started = time.perf_counter()
+            if not request(index):
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+        elapsed = time.perf_counter() - started_all
+    queries = [stats.query_count for stats in captured]
+    return {
+        **summarize(latencies, elapsed, errors),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else 0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    task_classification.AIClassifier = _ConstantClassifier
+    email = f"bench-writes-{uuid4().hex[:12]}@example.com"
+    password = "BenchPass123"
+    created: list[str] = []
+
+    with TestClient(create_app()) as client:
+        client.post("/auth/register", json={"email": email, "password": password}).raise_for_status()
+        login = client.post("/auth/login", json={"email": email, "password": password})
+        login.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+
+        def create(index: int) -> bool:
+            response = client.post("/tasks", json={"title": f"Bench write {index}", "description": "Benchmark"})
+            if response.status_code == 201:
+                created.append(response.json()["id"])
+            return response.status_code == 201
+
+        def patch(index: int) -> bool:
+            priority = ("low", "high")[index % 2]
+            response = client.patch(f"/tasks/{created[index % len(created)]}", json={"priority": priority})
+            return response.status_code == 200
+
+        try:
+            results = {
+                "create": _measure(client, args.iterations, create),
+                "patch": _measure(client, args.iterations, patch),
+            }
+        finally:
+            with SessionLocal() as db:
+                user_id = db.scalar(select(User.id).where(User.email == email))
+                db.execute(delete(Task).where(Task.owner_id == user_id))
+                db.execute(delete(User).where(User.id == user_id))
+                db.commit()
+
+    print(json.dumps({"revision": git_revision(), "iterations": args.iterations, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Per-request cost of bearer token handling in ``get_current_user``.
+
+Times ``get_current_user`` with the user lookup stubbed out, so only token
+parsing, verification and claim checks are measured. Runs it with the claims
+cache disabled and enabled, and with PyJWT when it is installed. Prints one
+JSON object per configuration.
+
+    python -m benchmarks.token_decode --iterations 20000
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import time
+from contextlib import contextmanager
+from uuid import uuid4
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+import app.api.deps as deps
+import app.core.security as security
+from app.core.config import settings
+from app.models.user import User
+
+
+class _StubSession:
+    def __init__(self, user: User) -> None:
+        self._user = user
+
+    def get(self, model, ident):
+        return self._user
+
+    def __enter__(self) -> "_StubSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+@contextmanager
+def _configured(backend: str, cache_size: int):
+    previous = settings.jwt_backend, settings.jwt_claims_cache_size
+    settings.jwt_backend, settings.jwt_claims_cache_size = backend, cache_size
+    security.clear_claims_cache()
+    try:
+        yield
+    finally:
+        settings.jwt_backend, settings.jwt_claims_cache_size = previous
+        security.clear_claims_cache()
+
+
+def _measure(credentials: HTTPAuthorizationCredentials, iterations: int) -> dict[str, float]:
+    deps.get_current_user(credentials)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        deps.get_current_user(credentials)
+    elapsed = time.perf_counter() - started
+    return {"iterations": iterations, "us_per_request": round(elapsed / iterations * 1_000_000, 2)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    user_id = uuid4()
+    user = User(id=user_id, email="bench@example.com", hashed_password="x", is_active=True)
+    deps.replica_router.open_read_session = lambda user_id=None: _StubSession(user)
+    token = security.create_access_token(str(user_id), "user")
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    backends = ["jose"]
+    if importlib.util.find_spec("jwt") is not None:
+        backends.append("pyjwt")
+
+    for backend in backends:
+        for cache_size in (0, settings.jwt_claims_cache_size or 10000):
+            with _configured(backend, cache_size):
+                result = _measure(credentials, args.iterations)
+            print(json.dumps({"backend": backend, "claims_cache_size": cache_size, **result}), flush=True)
+
+
+if __name__ == "__main__":
+    main()
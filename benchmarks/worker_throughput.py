@@ -0,0 +1,164 @@
+"""Classification jobs per second: stock ``rq worker`` against ``python -m app.worker``.
+
+Seeds ``--jobs`` tasks in ``processing`` state, enqueues one classification job
+per task on a throwaway queue and times each worker setup draining it in burst
+mode. ``rq`` runs ``--processes`` independent ``rq worker`` processes, each
+forking a work horse per job. ``prefork`` runs the preforked pool with the same
+process count. Classification goes to an in-process ``benchmarks.hf_stub``, so
+the numbers measure worker overhead rather than the network. Needs a migrated
+database in ``DATABASE_URL`` and Redis in ``REDIS_URL``:
+
+    python -m benchmarks.worker_throughput --jobs 500 --processes 4 --latency fixed:20
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from redis import Redis
+from rq import Queue
+from sqlalchemy import delete, func, insert, select, text
+
+from app.core.config import settings
+from app.core.security import hash_password
+from app.database import SessionLocal
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from benchmarks import hf_stub
+from benchmarks.common import git_revision
+
+PASSWORD = "BenchPass123"
+SEED_TASK_STATS_SQL = text(
+    """
+    INSERT INTO task_stats (owner_id, status, category, priority, task_count, total_estimated_duration)
+    SELECT owner_id, status, COALESCE(category, ''), COALESCE(priority, ''),
+           COUNT(*), COALESCE(SUM(estimated_duration), 0)
+    FROM tasks WHERE owner_id = :owner_id
+    GROUP BY owner_id, status, COALESCE(category, ''), COALESCE(priority, '')
+    """
+)
+
+
+def _seed(owner_id: UUID, jobs: int) -> list[str]:
+    now = datetime.now(timezone.utc)
+    task_ids = [uuid4() for _ in range(jobs)]
+    with SessionLocal() as db:
+        email = f"bench-worker-{owner_id}@example.com"
+        db.execute(insert(User), [{"id": owner_id, "email": email, "hashed_password": hash_password(PASSWORD)}])
+        db.execute(
+            insert(Task),
+            [
+                {
+                    "id": task_id,
+                    "title": f"Worker benchmark task {index}",
+                    "description": "Queued for the worker throughput benchmark",
+                    "status": TaskStatus.PROCESSING,
+                    "owner_id": owner_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for index, task_id in enumerate(task_ids)
+            ],
+        )
+        db.execute(SEED_TASK_STATS_SQL, {"owner_id": owner_id})
+        db.commit()
+    return [str(task_id) for task_id in task_ids]
+
+
+def _cleanup(owner_id: UUID) -> None:
+    with SessionLocal() as db:
+        db.execute(text("DELETE FROM task_stats WHERE owner_id = :owner_id"), {"owner_id": owner_id})
+        db.execute(delete(Task).where(Task.owner_id == owner_id))
+        db.execute(delete(User).where(User.id == owner_id))
+        db.commit()
+
+
+def _remaining(owner_id: UUID) -> int:
+    with SessionLocal() as db:
+        pending = select(func.count()).select_from(Task).where(Task.status == TaskStatus.PROCESSING)
+        return db.scalar(pending.where(Task.owner_id == owner_id))
+
+
+def _commands(mode: str, queue_name: str, processes: int, max_jobs: int) -> list[list[str]]:
+    if mode == "rq":
+        return [["rq", "worker", "--burst", "--url", settings.redis_url, queue_name] for _ in range(processes)]
+    command = [sys.executable, "-m", "app.worker", "--burst", "--queue", queue_name]
+    return [command + ["--processes", str(processes), "--max-jobs", str(max_jobs)]]
+
+
+def _run(mode: str, args: argparse.Namespace, stub_url: str, connection: Redis) -> dict[str, object]:
+    owner_id = uuid4()
+    queue = Queue(f"bench-worker-{owner_id.hex[:12]}", connection=connection)
+    try:
+        task_ids = _seed(owner_id, args.jobs)
+        for task_id in task_ids:
+            queue.enqueue("app.jobs.task_classification.classify_task_job", task_id, job_timeout=60)
+
+        env = {**os.environ, "HF_INFERENCE_BASE_URL": stub_url}
+        started = time.perf_counter()
+        workers = [
+            subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            for command in _commands(mode, queue.name, args.processes, args.max_jobs)
+        ]
+        for worker in workers:
+            worker.wait()
+        elapsed = time.perf_counter() - started
+
+        unfinished = _remaining(owner_id)
+        return {
+            "jobs": args.jobs,
+            "unfinished": unfinished,
+            "seconds": round(elapsed, 2),
+            "jobs_per_second": round((args.jobs - unfinished) / elapsed, 1),
+        }
+    finally:
+        queue.delete(delete_jobs=True)
+        _cleanup(owner_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--max-jobs", type=int, default=settings.worker_max_jobs_per_child)
+    parser.add_argument("--latency", default="fixed:20", help="hf_stub latency per zero-shot call")
+    parser.add_argument("--modes", default="rq,prefork")
+    args = parser.parse_args()
+
+    if not settings.redis_url:
+        parser.error("REDIS_URL must be set")
+    stub = hf_stub.build_server(hf_stub.build_parser().parse_args(["--port", "0", "--latency", args.latency]))
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    stub_url = f"http://127.0.0.1:{stub.server_address[1]}"
+
+    connection = Redis.from_url(settings.redis_url)
+    results = {}
+    try:
+        for mode in [item.strip() for item in args.modes.split(",") if item.strip()]:
+            results[mode] = _run(mode, args, stub_url, connection)
+    finally:
+        stub.shutdown()
+        stub.server_close()
+
+    print(
+        json.dumps(
+            {
+                "revision": git_revision(),
+                "processes": args.processes,
+                "latency": args.latency,
+                **results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+#!/bin/bash
+# Allow streaming replication connections for the local postgres-replica service.
+set -e
+
+echo "host replication ${POSTGRES_USER} all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -1,5 +1,6 @@
 import os
-from typing import Iterator
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator
 
 os.environ.setdefault(
     "DATABASE_URL",
@@ -14,6 +15,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.core.sql_instrumentation import RequestQueryStats, capture_request_stats
 from app.main import app
 
 
@@ -30,7 +32,7 @@ def db_session() -> Iterator[Session]:
 
 @pytest.fixture(autouse=True)
 def _clean_tasks(db_session: Session) -> None:
-    db_session.execute(text("TRUNCATE TABLE refresh_tokens, tasks, users RESTART IDENTITY CASCADE"))
+    db_session.execute(text("TRUNCATE TABLE refresh_tokens, task_stats, tasks, tasks_archive, users RESTART IDENTITY CASCADE"))
     db_session.commit()
 
 
@@ -52,3 +54,21 @@ def auth_headers(client: TestClient) -> dict[str, str]:
         raise AssertionError(f"login failed: {response.status_code} {response.text}")
     token = response.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture()
+def query_budget() -> Callable[[int], ContextManager[list[RequestQueryStats]]]:
+    """``with query_budget(n): client.get(...)`` fails if any request in the block runs more than ``n`` statements."""
+
+    @contextmanager
+    def budget(max_queries: int) -> Iterator[list[RequestQueryStats]]:
+        with capture_request_stats() as captured:
+            yield captured
+        assert captured, "no instrumented request finished inside the query budget block"
+        for stats in captured:
+            statements = "\n".join(stats.statements or [])
+            assert stats.query_count <= max_queries, (
+                f"{stats.route} ran {stats.query_count} queries (budget {max_queries}):\n{statements}"
+            )
+
+    return budget
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import anyio
+from fastapi.testclient import TestClient
+
+from app.core.admission import AdmissionLimiter
+from app.core.config import settings
+from app.main import AdmissionControlMiddleware, create_app
+
+
+def _limiter(**overrides) -> AdmissionLimiter:
+    options = {"max_limit": 2, "min_limit": 1, "max_queue": 1, "queue_timeout_seconds": 0.5}
+    return AdmissionLimiter(**{**options, **overrides})
+
+
+def test_queues_up_to_the_bound_then_sheds() -> None:
+    limiter = _limiter()
+    outcomes: list[float] = []
+
+    async def request() -> None:
+        outcomes.append(await limiter.acquire())
+
+    async def main() -> None:
+        assert [await limiter.acquire(), await limiter.acquire()] == [0.0, 0.0]
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(request)
+            await anyio.sleep(0.01)
+            assert limiter.queued == 1
+            # The queue is full, so the next request is turned away without waiting.
+            assert await limiter.acquire() >= 0.5
+            limiter.release(0.01)
+        assert outcomes == [0.0]
+        assert limiter.in_flight == 2
+
+    anyio.run(main)
+    assert (limiter.admitted, limiter.shed) == (3, 1)
+
+
+def test_queued_request_gives_up_at_the_deadline() -> None:
+    limiter = _limiter(max_limit=1, queue_timeout_seconds=0.05)
+
+    async def main() -> float:
+        await limiter.acquire()
+        return await limiter.acquire()
+
+    assert anyio.run(main) > 0
+    assert limiter.queued == 0
+    assert limiter.in_flight == 1
+
+
+def test_sheds_up_front_when_the_predicted_wait_exceeds_the_deadline() -> None:
+    limiter = _limiter(max_limit=1, max_queue=10, queue_timeout_seconds=0.1)
+
+    async def main() -> float:
+        await limiter.acquire()
+        limiter.release(1.0)
+        await limiter.acquire()
+        return await limiter.acquire()
+
+    # One request at a time taking about a second cannot be served within 100ms.
+    assert anyio.run(main) >= 1.0
+    assert limiter.queued == 0
+
+
+def test_limit_shrinks_when_latency_rises_and_recovers_after() -> None:
+    limiter = _limiter(max_limit=32, min_limit=2)
+    limiter.in_flight = 32
+    for _ in range(100):
+        limiter._update_limit(0.01)
+    assert limiter.limit == 32
+
+    for _ in range(100):
+        limiter._update_limit(0.5)
+    assert limiter.limit < 8
+
+    for _ in range(300):
+        limiter._update_limit(0.01)
+    assert limiter.limit == 32
+
+
+def test_idle_service_does_not_grow_its_limit() -> None:
+    limiter = _limiter(max_limit=32, min_limit=2)
+    limiter.limit = 4.0
+    limiter.in_flight = 1
+    for _ in range(100):
+        limiter._update_limit(0.01)
+    assert limiter.limit == 4.0
+
+
+async def _echo(scope, receive, send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": scope["path"].encode()})
+
+
+def test_middleware_sheds_per_route_class_and_exempts_health() -> None:
+    app_settings = settings.model_copy(deep=True)
+    app_settings.admission_task_read_concurrency = 1
+    app_settings.admission_min_concurrency = 1
+    app_settings.admission_queue_size = 0
+    middleware = AdmissionControlMiddleware(_echo, app_settings=app_settings)
+    client = TestClient(middleware)
+
+    assert client.get("/tasks").status_code == 200
+    anyio.run(middleware.limiters["task_reads"].acquire)
+
+    shed = client.get("/tasks/1")
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "1"
+    assert shed.json() == {"error": "Service overloaded, retry later"}
+
+    assert client.patch("/tasks/1").status_code == 200
+    assert client.post("/auth/login").status_code == 200
+    assert client.get("/tasks/events").status_code == 200
+    assert client.get("/health/live").status_code == 200
+
+
+def test_admission_control_can_be_disabled() -> None:
+    app_settings = settings.model_copy(deep=True)
+    app_settings.admission_control_enabled = False
+    app_settings.rate_limit_enabled = False
+
+    assert not any(m.cls is AdmissionControlMiddleware for m in create_app(app_settings).user_middleware)
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from app.services.ai_classifier import AIClassifier
+
+
+def test_inference_base_url_routes_model_without_token(monkeypatch) -> None:
+    monkeypatch.delenv("HUGGINGFACEHUB_API_TOKEN", raising=False)
+    monkeypatch.setenv("HF_INFERENCE_BASE_URL", "http://127.0.0.1:8090/")
+    monkeypatch.setenv("HF_MODEL_ID", "org/model")
+
+    classifier = AIClassifier()
+
+    assert classifier._model == "http://127.0.0.1:8090/models/org/model"
+
+
+def test_retryable_detects_model_loading_response() -> None:
+    assert AIClassifier._is_retryable(RuntimeError("Model org/model is currently loading"))
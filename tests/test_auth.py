@@ -4,7 +4,10 @@ from fastapi.testclient import TestClient
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.security import hash_token
+from app.models.refresh_token import RefreshToken
 from app.models.user import User
+from app.services.refresh_tokens import prune_refresh_tokens
 import app.services.auth_throttle as auth_throttle
 
 
@@ -43,6 +46,23 @@ def test_revoked_refresh_token_returns_401(client: TestClient) -> None:
     assert refresh.json()["detail"] == "Refresh token revoked"
 
 
+def test_prune_refresh_tokens_removes_revoked_and_keeps_active(client: TestClient, db_session: Session) -> None:
+    revoked = _register_and_login(client, "prune-user@example.com")["refresh_token"]
+    active = client.post(
+        "/auth/login",
+        json={"email": "prune-user@example.com", "password": "ChangeMe123"},
+    ).json()["refresh_token"]
+    assert client.post("/auth/logout", json={"refresh_token": revoked}).status_code == 204
+
+    deleted = prune_refresh_tokens(db_session, batch_size=1)
+
+    assert deleted == 1
+    remaining = db_session.execute(select(RefreshToken.token_hash)).scalars().all()
+    assert remaining == [hash_token(active)]
+    refresh = client.post("/auth/refresh", json={"refresh_token": revoked})
+    assert refresh.status_code == 401
+
+
 def test_login_progressive_backoff_and_reset(monkeypatch, client: TestClient) -> None:
     auth_throttle.reset_failed_logins_for_tests()
     current_time = {"value": 1_000_000}
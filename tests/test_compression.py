@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+
+import anyio
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import negotiate_encoding
+from app.core.config import settings
+from app.main import CompressionMiddleware
+
+PAYLOAD = "task description " * 200
+
+
+def _client(**overrides) -> TestClient:
+    config = settings.model_copy(update={"compression_min_size": 1024, **overrides})
+    app = FastAPI()
+
+    @app.get("/large")
+    def large() -> dict[str, str]:
+        return {"description": PAYLOAD}
+
+    @app.get("/small")
+    def small() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/text")
+    def text() -> PlainTextResponse:
+        return PlainTextResponse(PAYLOAD, media_type="image/svg+xml")
+
+    app.add_middleware(CompressionMiddleware, app_settings=config)
+    return TestClient(app)
+
+
+def test_negotiate_encoding_honours_q_values_and_server_order() -> None:
+    offered = ["zstd", "br", "gzip"]
+    assert negotiate_encoding("gzip, br", offered) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", offered) == "gzip"
+    assert negotiate_encoding("*;q=0.1, gzip;q=0", offered) == "zstd"
+    assert negotiate_encoding("identity", offered) is None
+    assert negotiate_encoding("", offered) is None
+
+
+def test_gzip_large_body_and_skip_small_body() -> None:
+    client = _client(compression_encodings=["gzip"])
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) < len(PAYLOAD)
+    assert response.json() == {"description": PAYLOAD}
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+    assert small.json() == {"status": "ok"}
+
+    uncompressible = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in uncompressible.headers
+
+
+def _run_chunked(content_type: bytes, extra_headers: list[tuple[bytes, bytes]] | None = None) -> list:
+    config = settings.model_copy(update={"compression_encodings": ["gzip"], "compression_min_size": 0})
+    headers = [(b"content-type", content_type), *(extra_headers or [])]
+
+    async def streaming_app(scope, receive, send) -> None:
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for index in range(3):
+            await send({"type": "http.response.body", "body": f"data: {index}\n\n".encode(), "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    sent = []
+
+    async def send(message) -> None:
+        sent.append(message)
+
+    async def receive() -> dict:
+        return {"type": "http.request"}
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"gzip")]}
+    anyio.run(CompressionMiddleware(streaming_app, app_settings=config), scope, receive, send)
+    return sent
+
+
+@pytest.mark.parametrize(
+    "content_type, extra_headers",
+    [(b"text/event-stream", [(b"content-length", b"27")]), (b"application/x-ndjson", [])],
+)
+def test_streams_are_sent_uncompressed(content_type: bytes, extra_headers: list) -> None:
+    start, *bodies = _run_chunked(content_type, extra_headers)
+
+    assert all(name != b"content-encoding" for name, _ in start["headers"])
+    assert [body["body"] for body in bodies] == [b"data: 0\n\n", b"data: 1\n\n", b"data: 2\n\n", b""]
+
+
+def test_chunked_body_of_known_length_is_flushed_per_chunk() -> None:
+    start, *bodies = _run_chunked(b"application/json", [(b"content-length", b"27")])
+
+    assert (b"content-encoding", b"gzip") in start["headers"]
+    assert all(name != b"content-length" for name, _ in start["headers"])
+    decoder = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    # Each chunk decodes in full as soon as it arrives.
+    assert [decoder.decompress(body["body"]) for body in bodies[:3]] == [b"data: 0\n\n", b"data: 1\n\n", b"data: 2\n\n"]
+    assert gzip.decompress(b"".join(body["body"] for body in bodies)) == b"data: 0\n\ndata: 1\n\ndata: 2\n\n"
+
+
+@pytest.mark.parametrize("encoding, module", [("br", "brotli"), ("zstd", "zstandard")])
+def test_optional_encodings(encoding: str, module: str) -> None:
+    pytest.importorskip(module)
+    client = _client(compression_encodings=[encoding])
+
+    response = client.get("/large", headers={"Accept-Encoding": encoding})
+
+    assert response.headers["Content-Encoding"] == encoding
+    assert response.json() == {"description": PAYLOAD}
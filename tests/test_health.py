@@ -8,3 +8,8 @@ def test_health_check() -> None:
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+def test_metrics_requires_admin(client: TestClient, auth_headers: dict[str, str]) -> None:
+    assert client.get("/health/metrics").status_code == 401
+    assert client.get("/health/metrics", headers=auth_headers).status_code == 403
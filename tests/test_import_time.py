@@ -0,0 +1,38 @@
+import os
+
+from benchmarks.import_time import parse_importtime, profile_import
+
+# Generous against the ~0.75 s measured locally so slow CI runners pass; the
+# previous eager imports took about twice that. Override with IMPORT_TIME_BUDGET_MS.
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1200"))
+
+
+def test_parse_importtime() -> None:
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   app.core.config\n"
+        "import time:        40 |        160 | app.main\n"
+    )
+
+    records = parse_importtime(output)
+
+    assert [(record.module, record.self_us, record.cumulative_us) for record in records] == [
+        ("app.core.config", 120, 120),
+        ("app.main", 40, 160),
+    ]
+
+
+def test_app_main_import_defers_heavy_dependencies() -> None:
+    profile = profile_import("app.main")
+
+    assert profile.loaded_lazy_modules == []
+
+
+def test_app_main_import_within_budget() -> None:
+    # Best of three damps scheduler noise; a regression shows up in all of them.
+    best_ms = min(profile_import("app.main").cumulative_ms("app.main") for _ in range(3))
+
+    assert best_ms <= IMPORT_TIME_BUDGET_MS, (
+        f"importing app.main took {best_ms:.0f} ms (budget {IMPORT_TIME_BUDGET_MS:.0f} ms); "
+        "run python -m benchmarks.import_time to see which modules grew"
+    )
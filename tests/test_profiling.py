@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.core.profiling import RequestProfile
+from app.core.sql_instrumentation import capture_request_stats, install_sql_hooks, sql_metrics, track_queries
+from app.core.security import create_access_token
+from app.main import ProfilingMiddleware, QueryTimingMiddleware
+
+
+def _busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+def _profiled_app(tmp_path, sample_rate: float) -> TestClient:
+    config = settings.model_copy(
+        update={
+            "profiling_sample_rate": sample_rate,
+            "profiling_interval_ms": 1.0,
+            "profiling_output_dir": str(tmp_path),
+        }
+    )
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+
+    @app.get("/work")
+    def work() -> dict[str, int]:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        _busy(0.05)
+        return {"ok": 1}
+
+    app.add_middleware(ProfilingMiddleware, app_settings=config)
+    return TestClient(app)
+
+
+def test_profile_counts_sql_and_samples_registered_threads() -> None:
+    install_sql_hooks()
+    engine = create_engine("sqlite://")
+    with track_queries() as query_stats:
+        profile = RequestProfile("test", 0.001, query_stats)
+        profile.start()
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            _busy(0.05)
+        finally:
+            profile.stop()
+
+    assert query_stats.query_count == 1
+    assert profile.sample_count > 0
+    document = profile.speedscope("test")
+    assert document["profiles"][0]["type"] == "sampled"
+    assert any(frame["name"] == "_busy" for frame in document["shared"]["frames"])
+    assert "_busy" in profile.collapsed()
+
+
+def test_sampled_request_writes_profile_keyed_by_request_id(tmp_path) -> None:
+    client = _profiled_app(tmp_path, sample_rate=1.0)
+
+    response = client.get("/work", headers={"X-Request-ID": "req-123"})
+
+    assert response.headers["X-Request-ID"] == "req-123"
+    summary = json.loads((tmp_path / "req-123.json").read_text())
+    assert summary["path"] == "/work"
+    assert summary["status"] == 200
+    assert summary["db_queries"] == 2
+    assert summary["samples"] > 0
+    assert (tmp_path / "req-123.speedscope.json").exists()
+
+
+def test_profile_header_requires_admin_token(tmp_path) -> None:
+    client = _profiled_app(tmp_path, sample_rate=0.0)
+
+    user_token = create_access_token("user-id", "user")
+    response = client.get("/work", headers={"X-Profile": "1", "Authorization": f"Bearer {user_token}"})
+    assert "X-Request-ID" not in response.headers
+    assert not list(tmp_path.iterdir())
+
+    admin_token = create_access_token("admin-id", "admin")
+    response = client.get("/work", headers={"X-Profile": "1", "Authorization": f"Bearer {admin_token}"})
+    assert (tmp_path / f"{response.headers['X-Request-ID']}.json").exists()
+
+
+def test_query_timing_middleware_reports_server_timing_and_metrics() -> None:
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int) -> dict[str, int]:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        return {"id": item_id}
+
+    app.add_middleware(QueryTimingMiddleware, app_settings=settings)
+    sql_metrics.reset()
+    with capture_request_stats() as captured:
+        response = TestClient(app).get("/items/7")
+
+    assert 'desc="2 queries"' in response.headers["Server-Timing"]
+    assert captured[0].statements == ["SELECT 1", "SELECT 2"]
+    assert sql_metrics.snapshot()["GET /items/{item_id}"]["queries"] == 2
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.rate_limit import LocalRateLimiter, RateLimit
+from app.core.security import create_access_token
+from app.main import create_app
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class MemoryCounterStore:
+    """The Redis sliding-window layout in a dict, shared by simulated processes."""
+
+    def __init__(self) -> None:
+        self.windows: dict[tuple[str, int], dict[str, int]] = {}
+        self.processes: dict[str, float] = {}
+
+    def for_process(self, process_id: str) -> "_ProcessView":
+        return _ProcessView(self, process_id)
+
+
+class _ProcessView:
+    def __init__(self, shared: MemoryCounterStore, process_id: str) -> None:
+        self.shared = shared
+        self.process_id = process_id
+
+    def sync(self, batch, limit, now):
+        window = int(now // limit.period_seconds)
+        self.shared.processes[self.process_id] = now
+        results = {}
+        for key, count in batch.items():
+            current = self.shared.windows.setdefault((key, window), {})
+            if count:
+                current[self.process_id] = current.get(self.process_id, 0) + count
+            previous = self.shared.windows.get((key, window - 1), {})
+            results[key] = (sum(current.values()), sum(previous.values()), len(set(current) | set(previous) | {self.process_id}))
+        return len(self.shared.processes), results
+
+
+class UnavailableStore:
+    def sync(self, batch, limit, now):
+        return None
+
+
+def test_parse_uses_slowapi_notation() -> None:
+    assert RateLimit.parse("100/minute") == RateLimit(100, 60.0)
+    assert RateLimit.parse("5 per 10 seconds") == RateLimit(5, 10.0)
+
+
+def test_single_process_is_an_exact_token_bucket() -> None:
+    clock = FakeClock()
+    limiter = LocalRateLimiter(RateLimit(5, 10.0), clock=clock)
+
+    assert [limiter.acquire("ip:1") for _ in range(5)] == [0.0] * 5
+    assert limiter.acquire("ip:1") == 2.0
+    assert limiter.acquire("ip:2") == 0.0
+
+    clock.now += 2.0
+    assert limiter.acquire("ip:1") == 0.0
+    assert limiter.acquire("ip:1") > 0
+
+
+def _simulate(processes: int, seconds: int, requests_per_second: int) -> list[float]:
+    """Drive one key across ``processes`` limiters syncing once a second; return admission times."""
+    limit = RateLimit(100, 60.0)
+    clock = FakeClock()
+    store = MemoryCounterStore()
+    limiters = [
+        LocalRateLimiter(limit, store=store.for_process(f"p{index}"), background=False, clock=clock)
+        for index in range(processes)
+    ]
+    rng = random.Random(7)
+    admitted = []
+    for _ in range(seconds):
+        for step in range(requests_per_second):
+            clock.now += 1 / requests_per_second
+            if rng.choice(limiters).acquire("user:1") == 0.0:
+                admitted.append(clock.now)
+        for limiter in limiters:
+            limiter.sync()
+    return admitted
+
+
+def _max_in_window(times: list[float], start: float, window: float) -> int:
+    best = 0
+    for index, began in enumerate(times):
+        if began < start:
+            continue
+        end = began + window
+        best = max(best, sum(1 for at in times[index:] if at < end))
+    return best
+
+
+@pytest.mark.parametrize(("processes", "requests_per_second"), [(1, 5), (4, 17), (8, 30)])
+def test_fleet_stays_within_documented_bounds(processes: int, requests_per_second: int) -> None:
+    # 100/minute synced every second, offered 3-18x the limit.
+    admitted = _simulate(processes, seconds=360, requests_per_second=requests_per_second)
+    first = admitted[0]
+
+    # The cold start burst is followed by the sliding window's worst case.
+    assert _max_in_window(admitted, first, 60) <= 2 * 100
+    # Sustained load: at most L * (1 + T / P) + n per period.
+    assert _max_in_window(admitted, first + 120, 60) <= 100 * (1 + 1 / 60) + processes
+    # And the key is not starved: close to L per period.
+    steady = [at for at in admitted if at >= first + 120]
+    assert len(steady) / ((steady[-1] - steady[0]) / 60) >= 95
+
+
+def test_unavailable_store_falls_back_to_local_limit() -> None:
+    clock = FakeClock()
+    limiter = LocalRateLimiter(RateLimit(3, 60.0), store=UnavailableStore(), background=False, clock=clock)
+
+    assert [limiter.acquire("ip:1") for _ in range(3)] == [0.0] * 3
+    limiter.sync()
+    assert limiter.acquire("ip:1") > 0
+
+
+class FlakyStore:
+    """A shared store that goes down after it has answered some syncs."""
+
+    def __init__(self) -> None:
+        self.shared = MemoryCounterStore().for_process("p0")
+        self.available = True
+
+    def sync(self, batch, limit, now):
+        return self.shared.sync(batch, limit, now) if self.available else None
+
+
+def test_outage_after_a_sync_falls_back_to_local_limit() -> None:
+    clock = FakeClock()
+    store = FlakyStore()
+    limiter = LocalRateLimiter(RateLimit(10, 60.0), store=store, background=False, clock=clock)
+
+    assert [limiter.acquire("ip:1") for _ in range(10)] == [0.0] * 10
+    # The reply rebases the bucket on an empty previous window, i.e. a refill rate of 0.
+    limiter.sync()
+    store.available = False
+
+    admitted = []
+    for second in range(600):
+        clock.now += 1.0
+        if limiter.acquire("ip:1") == 0.0:
+            admitted.append(second)
+        limiter.sync()
+
+    # The local limit of 10 per 60 seconds, for all ten minutes of the outage.
+    assert 95 <= len(admitted) <= 100
+    assert admitted[0] < 10
+
+
+def _client(limit: str) -> TestClient:
+    app_settings = settings.model_copy(deep=True)
+    app_settings.rate_limit_enabled = True
+    app_settings.rate_limit_default = limit
+    app_settings.rate_limit_default_backend = "local"
+    app_settings.redis_url = None
+    return TestClient(create_app(app_settings))
+
+
+def test_middleware_limits_by_user_then_ip() -> None:
+    client = _client("2/minute")
+    alice = {"Authorization": f"Bearer {create_access_token('alice', 'user')}"}
+    bob = {"Authorization": f"Bearer {create_access_token('bob', 'user')}"}
+
+    assert [client.get("/missing", headers=alice).status_code for _ in range(2)] == [404, 404]
+    limited = client.get("/missing", headers=alice)
+    assert limited.status_code == 429
+    assert int(limited.headers["Retry-After"]) >= 1
+    assert limited.json() == {"error": "Rate limit exceeded: 2 per 60 seconds"}
+
+    # Other users and anonymous callers have their own buckets.
+    assert client.get("/missing", headers=bob).status_code == 404
+    assert client.get("/missing").status_code == 404
+    # An invalid token falls back to the IP bucket rather than a per-token one.
+    invalid = {"Authorization": "Bearer not-a-token"}
+    assert client.get("/missing", headers=invalid).status_code == 404
+    assert client.get("/missing", headers=invalid).status_code == 429
+
+
+def test_health_checks_are_exempt() -> None:
+    client = _client("1/minute")
+
+    assert [client.get("/health").status_code for _ in range(3)] == [200, 200, 200]
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+
+from jose import jwt
+
+import app.core.security as security
+
+
+def test_decode_token_caches_verified_claims(monkeypatch) -> None:
+    security.clear_claims_cache()
+    calls = {"count": 0}
+    original = security._decode_with_backend
+
+    def counting_decode(token: str) -> dict:
+        calls["count"] += 1
+        return original(token)
+
+    monkeypatch.setattr(security, "_decode_with_backend", counting_decode)
+    token = security.create_access_token("user-id", "user")
+
+    first = security.decode_token(token)
+    first["sub"] = "tampered"
+    second = security.decode_token(token)
+
+    assert calls["count"] == 1
+    assert second["sub"] == "user-id"
+
+
+def test_decode_token_does_not_serve_expired_claims(monkeypatch) -> None:
+    security.clear_claims_cache()
+    token = jwt.encode(
+        {"sub": "user-id", "type": "access", "exp": int(time.time()) + 60},
+        security.settings.jwt_secret_key,
+        algorithm=security.settings.jwt_algorithm,
+    )
+    security.decode_token(token)
+
+    expired_at = time.time() + 120
+    monkeypatch.setattr(security.time, "time", lambda: expired_at)
+    calls = {"count": 0}
+
+    def counting_decode(token: str) -> dict:
+        calls["count"] += 1
+        return {"sub": "user-id", "exp": 0}
+
+    monkeypatch.setattr(security, "_decode_with_backend", counting_decode)
+    security.decode_token(token)
+
+    assert calls["count"] == 1
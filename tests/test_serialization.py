@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+from app.api.tasks import TASK_RESPONSE_FIELDS
+from app.core.serialization import dump_rows
+from app.models.task import TaskStatus
+from app.schemas.task import TaskResponse
+
+
+def test_task_rows_encode_like_pydantic() -> None:
+    timestamps = [
+        datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        datetime(2026, 1, 2, 3, 4, 5, 120, tzinfo=timezone.utc),
+        datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+        datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=-3))),
+    ]
+    rows = [
+        (
+            uuid4(),
+            "Café \x1f \"quoted\" \\ / <tag> 😀  ",
+            None if index % 2 else "multi\nline\tdescription",
+            list(TaskStatus)[index % len(TaskStatus)],
+            "testing",
+            None,
+            2**31 - 1,
+            uuid4() if index % 2 else None,
+            created_at,
+            created_at + timedelta(seconds=1),
+        )
+        for index, created_at in enumerate(timestamps)
+    ]
+    adapter = TypeAdapter(list[TaskResponse])
+    expected = adapter.dump_json(adapter.validate_python([dict(zip(TASK_RESPONSE_FIELDS, row)) for row in rows]))
+
+    assert dump_rows(TASK_RESPONSE_FIELDS, rows) == expected
+    assert dump_rows(TASK_RESPONSE_FIELDS, []) == adapter.dump_json([])
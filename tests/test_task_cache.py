@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+import app.services.task_cache as task_cache
+from app.core.config import settings
+
+
+class MemoryRedis:
+    """The handful of Redis calls the cache makes, kept in a dict."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+        self.fail = False
+
+    def mget(self, keys):
+        if self.fail:
+            raise RedisConnectionError("down")
+        return [self.values.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        if self.fail:
+            raise RedisConnectionError("down")
+        self.values[key] = value if isinstance(value, bytes) else str(value).encode()
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, client: MemoryRedis) -> None:
+        self.client = client
+        self.calls = []
+
+    def set(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+
+    def execute(self):
+        for args, kwargs in self.calls:
+            self.client.set(*args, **kwargs)
+
+
+@pytest.fixture()
+def redis(monkeypatch) -> MemoryRedis:
+    client = MemoryRedis()
+    monkeypatch.setattr(task_cache, "_get_redis_client", lambda: client)
+    task_cache.task_cache_stats.reset()
+    return client
+
+
+def _fill_task(task_id, owner_id, body=b'{"v":1}', **kwargs) -> None:
+    slot = task_cache.lookup_task(task_id)
+    task_cache.store(slot, body, {"ETag": 'W/"1"'}, owner_id=owner_id, **kwargs)
+
+
+def test_disabled_cache_looks_up_nothing(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "task_cache_enabled", False)
+    assert task_cache.lookup_task(uuid4()) is None
+
+
+def test_read_through_then_invalidated_by_version(redis: MemoryRedis) -> None:
+    task_id, owner_id = uuid4(), uuid4()
+    assert task_cache.lookup_task(task_id).entry is None
+    _fill_task(task_id, owner_id)
+
+    entry = task_cache.lookup_task(task_id).entry
+    assert entry.body == b'{"v":1}'
+    assert entry.owner_id == owner_id
+
+    task_cache.invalidate_tasks([task_id], [owner_id])
+    assert task_cache.lookup_task(task_id).entry is None
+    # Filling looks the slot up too, so it counts as a miss.
+    assert task_cache.task_cache_stats.snapshot()["task"] == {"hits": 1, "misses": 3, "errors": 0, "hit_ratio": 0.25}
+
+
+def test_fill_racing_a_write_is_never_served(redis: MemoryRedis) -> None:
+    task_id, owner_id = uuid4(), uuid4()
+    slot = task_cache.lookup_task(task_id)
+    # A write commits and bumps the version while this miss reads the old row.
+    task_cache.invalidate_tasks([task_id], [owner_id])
+    task_cache.store(slot, b'{"v":"old"}', {"ETag": 'W/"0"'}, owner_id=owner_id)
+
+    assert task_cache.lookup_task(task_id).entry is None
+
+
+def test_pages_are_scoped_and_retired_per_owner(redis: MemoryRedis) -> None:
+    alice, bob = uuid4(), uuid4()
+    params = {"limit": 50, "offset": 0}
+    for scope in (alice, bob, None):
+        task_cache.store(task_cache.lookup_page(scope, params), b"[]", {"ETag": 'W/"p"'})
+
+    task_cache.invalidate_tasks([uuid4()], [alice])
+
+    assert task_cache.lookup_page(alice, params).entry is None
+    assert task_cache.lookup_page(bob, params).entry is not None
+    # Unscoped admin pages include every owner's tasks.
+    assert task_cache.lookup_page(None, params).entry is None
+    assert task_cache.lookup_page(bob, {**params, "offset": 50}).entry is None
+
+
+def test_invalidate_all_retires_everything(redis: MemoryRedis) -> None:
+    task_id = uuid4()
+    _fill_task(task_id, uuid4())
+    task_cache.invalidate_all()
+    assert task_cache.lookup_task(task_id).entry is None
+
+
+def test_replica_reads_do_not_fill_fresh_versions(redis: MemoryRedis, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "db_replica_max_lag_seconds", 5.0)
+    task_id, owner_id = uuid4(), uuid4()
+    task_cache.invalidate_tasks([task_id], [owner_id])
+
+    _fill_task(task_id, owner_id, from_replica=True)
+    assert task_cache.lookup_task(task_id).entry is None
+
+    _fill_task(task_id, owner_id, from_replica=False)
+    assert task_cache.lookup_task(task_id).entry is not None
+
+
+def test_unreachable_redis_falls_back_to_the_database(redis: MemoryRedis) -> None:
+    redis.fail = True
+    assert task_cache.lookup_task(uuid4()) is None
+    task_cache.invalidate_tasks([uuid4()], [uuid4()])
+    assert task_cache.task_cache_stats.snapshot()["task"]["errors"] == 1
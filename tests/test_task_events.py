@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from uuid import uuid4
+
+import app.services.task_events as task_events
+
+
+def _publish(owner_id: str, event_id: str) -> None:
+    task_events.broker._dispatch(
+        {"data": json.dumps({"id": event_id, "owner_id": owner_id, "event": "task.classified", "data": "{}"})}
+    )
+
+
+def test_stream_replays_after_last_event_id_and_skips_duplicates(monkeypatch) -> None:
+    async def idle_listener(self) -> None:
+        await asyncio.sleep(3600)
+
+    async def replay(owner_id: str, last_event_id: str) -> list[dict]:
+        assert last_event_id == "1-0"
+        return [{"id": "2-0", "event": "task.classified", "data": "{}"}]
+
+    monkeypatch.setattr(task_events.TaskEventBroker, "_listen", idle_listener)
+    monkeypatch.setattr(task_events.broker, "replay", replay)
+
+    async def scenario() -> list[str]:
+        owner_id = uuid4()
+        stream = task_events.stream_task_events(owner_id, "1-0")
+        frames = [await stream.__anext__(), await stream.__anext__()]
+        _publish(str(owner_id), "2-0")
+        _publish(str(owner_id), "3-0")
+        frames.append(await stream.__anext__())
+        await stream.aclose()
+        return frames
+
+    frames = asyncio.run(scenario())
+
+    assert frames[0].startswith("id: 2-0\n")
+    assert frames[1].startswith("retry: ")
+    assert frames[2].startswith("id: 3-0\n")
+    assert task_events.broker._subscriptions == {}
+
+
+def test_slow_subscriber_is_closed_when_buffer_overflows(monkeypatch) -> None:
+    monkeypatch.setattr(task_events.settings, "task_events_buffer_size", 2)
+
+    async def scenario() -> list[dict | None]:
+        subscription = task_events._Subscription("owner")
+        for event_id in ("1-0", "2-0", "3-0"):
+            subscription.offer({"id": event_id})
+        assert subscription.first_dropped_id == "1-0"
+        return [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+
+    # Buffered events are dropped too, and the reader replays all of them from the stream.
+    assert asyncio.run(scenario()) == [None]
+
+
+def _overflow_scenario(monkeypatch, history: list[str]):
+    monkeypatch.setattr(task_events.settings, "task_events_buffer_size", 2)
+
+    async def idle_listener(self) -> None:
+        await asyncio.sleep(3600)
+
+    async def replay(owner_id: str, last_event_id: str, *, inclusive: bool = False) -> list[dict]:
+        start = task_events._parse_event_id(last_event_id)
+        return [
+            {"id": event_id, "event": "task.classified", "data": "{}"}
+            for event_id in history
+            if task_events._parse_event_id(event_id) > start
+            or (inclusive and task_events._parse_event_id(event_id) == start)
+        ]
+
+    monkeypatch.setattr(task_events.TaskEventBroker, "_listen", idle_listener)
+    monkeypatch.setattr(task_events.broker, "replay", replay)
+
+
+def test_overflowed_reader_replays_dropped_events_itself(monkeypatch) -> None:
+    history = ["1-0", "2-0", "3-0", "4-0", "5-0"]
+    _overflow_scenario(monkeypatch, history)
+
+    async def scenario() -> list[str]:
+        owner_id = uuid4()
+        stream = task_events.stream_task_events(owner_id, None)
+        assert (await stream.__anext__()).startswith("retry: ")
+        _publish(str(owner_id), "1-0")
+        frames = [await stream.__anext__()]
+        # The reader falls behind: 2-0 and 3-0 fill the buffer and 4-0 overflows it.
+        for event_id in history[1:4]:
+            _publish(str(owner_id), event_id)
+        frames += [await stream.__anext__() for _ in range(3)]
+        # The new subscription delivers live events again.
+        _publish(str(owner_id), "5-0")
+        frames.append(await stream.__anext__())
+        await stream.aclose()
+        return [frame.split("\n", 1)[0] for frame in frames]
+
+    assert asyncio.run(scenario()) == ["id: 1-0", "id: 2-0", "id: 3-0", "id: 4-0", "id: 5-0"]
+    assert task_events.broker._subscriptions == {}
+
+
+def test_overflow_before_the_first_event_replays_from_the_first_dropped(monkeypatch) -> None:
+    history = ["1-0", "2-0", "3-0"]
+    _overflow_scenario(monkeypatch, history)
+
+    async def scenario() -> list[str]:
+        owner_id = uuid4()
+        # No Last-Event-ID, and the buffer overflows before anything is delivered.
+        stream = task_events.stream_task_events(owner_id, None)
+        assert (await stream.__anext__()).startswith("retry: ")
+        for event_id in history:
+            _publish(str(owner_id), event_id)
+        frames = [await stream.__anext__() for _ in range(3)]
+        await stream.aclose()
+        return [frame.split("\n", 1)[0] for frame in frames]
+
+    assert asyncio.run(scenario()) == ["id: 1-0", "id: 2-0", "id: 3-0"]
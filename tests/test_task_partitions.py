@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import app.services.task_classification as classification_module
+from app.api.tasks import _estimated_task_count
+from app.services.task_partitions import detach_old_partitions, ensure_future_partitions, list_partitions
+
+SCRATCH_YEARS = ("2001", "2031", "2032")
+
+
+class StubClassifier:
+    def classify_task(self, title: str, description: str | None) -> dict[str, object]:
+        return {"category": "testing", "priority": "low", "estimated_duration": 5}
+
+
+def _create_task_in_month(client: TestClient, headers: dict[str, str], db: Session, created_at: str) -> None:
+    response = client.post("/tasks", json={"title": "Old task"}, headers=headers)
+    assert response.status_code == 201
+    db.execute(
+        text("UPDATE tasks SET created_at = :created_at WHERE id = :id"),
+        {"created_at": created_at, "id": response.json()["id"]},
+    )
+    db.commit()
+
+
+@pytest.fixture(autouse=True)
+def _drop_scratch_partitions(db_session: Session) -> Iterator[None]:
+    """Drop the far-future partitions these tests create, attached or not."""
+    yield
+    db_session.rollback()
+    names = db_session.execute(
+        text("SELECT relname FROM pg_class WHERE relkind = 'r' AND relname ~ :pattern"),
+        {"pattern": f"^tasks_p({'|'.join(SCRATCH_YEARS)})[0-9]{{2}}"},
+    ).scalars()
+    for name in list(names):
+        db_session.execute(text(f"DROP TABLE {name}"))
+    db_session.commit()
+
+
+def test_ensure_future_partitions_is_idempotent(db_session: Session) -> None:
+    today = date(2031, 11, 15)
+
+    created = ensure_future_partitions(db_session, months_ahead=2, today=today)
+    assert {"tasks_p203111", "tasks_p203112", "tasks_p203201"} <= set(list_partitions(db_session))
+    assert ensure_future_partitions(db_session, months_ahead=2, today=today) == []
+    assert set(created) <= {"tasks_p203111", "tasks_p203112", "tasks_p203201"}
+
+
+def test_task_count_estimate_follows_partitions_filled_after_the_migration(db_session: Session) -> None:
+    ensure_future_partitions(db_session, months_ahead=0, today=date(2031, 12, 1))
+    before = _estimated_task_count(db_session) or 0
+    db_session.execute(
+        text(
+            "INSERT INTO tasks (id, title, status, created_at, updated_at) "
+            "SELECT gen_random_uuid(), 'Estimated', 'pending', '2031-12-05', now() FROM generate_series(1, 500)"
+        )
+    )
+    db_session.commit()
+    # What autovacuum does for a partition; it never analyzes the parent.
+    db_session.execute(text("ANALYZE tasks_p203112"))
+    db_session.commit()
+
+    assert _estimated_task_count(db_session) == before + 500
+
+
+def test_ensure_future_partitions_moves_rows_out_of_the_default_partition(db_session: Session) -> None:
+    # No partition covers 2031-12 yet, so these land in tasks_default.
+    db_session.execute(
+        text(
+            "INSERT INTO tasks (id, title, status, created_at, updated_at) "
+            "SELECT gen_random_uuid(), 'Early', 'pending', '2031-12-10', now() FROM generate_series(1, 3)"
+        )
+    )
+    db_session.commit()
+
+    created = ensure_future_partitions(db_session, months_ahead=2, today=date(2031, 11, 15))
+
+    assert "tasks_p203112" in created
+    assert db_session.execute(text("SELECT count(*) FROM tasks_p203112")).scalar_one() == 3
+    strays = "SELECT count(*) FROM tasks_default WHERE created_at >= '2031-12-01' AND created_at < '2032-01-01'"
+    assert db_session.execute(text(strays)).scalar_one() == 0
+    children = db_session.execute(
+        text("SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = 'tasks'::regclass")
+    ).scalars()
+    assert "tasks_default" in set(children)
+    assert db_session.execute(text("SELECT count(*) FROM tasks WHERE title = 'Early'")).scalar_one() == 3
+
+
+def test_detach_old_partitions_subtracts_rows_from_stats(
+    monkeypatch, client: TestClient, auth_headers: dict[str, str], db_session: Session
+) -> None:
+    monkeypatch.setattr(classification_module, "AIClassifier", lambda: StubClassifier())
+    ensure_future_partitions(db_session, months_ahead=0, today=date(2001, 1, 1))
+    _create_task_in_month(client, auth_headers, db_session, "2001-01-10")
+    _create_task_in_month(client, auth_headers, db_session, "2001-01-20")
+    assert client.get("/tasks/stats", headers=auth_headers).json()["total"] == 2
+
+    assert detach_old_partitions(db_session, retention_months=1, today=date(2001, 3, 1)) == ["tasks_p200101"]
+
+    assert "tasks_p200101" not in list_partitions(db_session)
+    assert db_session.execute(text("SELECT count(*) FROM tasks_p200101")).scalar_one() == 2
+    assert client.get("/tasks/stats", headers=auth_headers).json()["total"] == 0
+
+
+def test_detach_old_partitions_finishes_an_interrupted_detach(
+    monkeypatch, client: TestClient, auth_headers: dict[str, str], db_session: Session
+) -> None:
+    monkeypatch.setattr(classification_module, "AIClassifier", lambda: StubClassifier())
+    ensure_future_partitions(db_session, months_ahead=0, today=date(2001, 2, 1))
+    _create_task_in_month(client, auth_headers, db_session, "2001-02-10")
+    # A run that stopped after its first transaction.
+    db_session.execute(text("ALTER TABLE tasks DETACH PARTITION tasks_p200102"))
+    db_session.execute(text("ALTER TABLE tasks_p200102 RENAME TO tasks_p200102_detaching"))
+    db_session.commit()
+
+    assert detach_old_partitions(db_session, retention_months=0) == []
+
+    assert db_session.execute(text("SELECT to_regclass('tasks_p200102_detaching')")).scalar_one() is None
+    assert db_session.execute(text("SELECT count(*) FROM tasks_p200102")).scalar_one() == 1
+    assert client.get("/tasks/stats", headers=auth_headers).json()["total"] == 0
@@ -0,0 +1,140 @@
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+
+import app.services.task_classification as classification_module
+from app.worker import RECYCLE_EXIT_CODE, PreforkSupervisor
+
+
+def _recycling_child(log: Path, max_jobs: int) -> None:
+    with log.open("a") as handle:
+        handle.write(f"{os.getpid()}\n")
+    # The third child finds the "queue" empty and exits normally.
+    sys.exit(RECYCLE_EXIT_CODE if len(log.read_text().splitlines()) < 3 else 0)
+
+
+def test_supervisor_replaces_recycled_children(tmp_path: Path) -> None:
+    log = tmp_path / "pids"
+    supervisor = PreforkSupervisor(
+        processes=1,
+        queue_name="test",
+        max_jobs=10,
+        drain_timeout=5,
+        burst=True,
+        target=lambda queue_name, max_jobs, burst: _recycling_child(log, max_jobs),
+    )
+
+    supervisor.run()
+
+    pids = log.read_text().splitlines()
+    assert supervisor.spawned == 3
+    assert len(set(pids)) == 3
+
+
+def _draining_child(log: Path) -> None:
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    (log / f"{os.getpid()}.started").touch()
+    stop.wait(10)
+    time.sleep(0.2)  # the job in flight
+    (log / f"{os.getpid()}.drained").touch()
+
+
+def test_supervisor_drains_children_on_stop(tmp_path: Path) -> None:
+    supervisor = PreforkSupervisor(
+        processes=2,
+        queue_name="test",
+        max_jobs=0,
+        drain_timeout=5,
+        target=lambda queue_name, max_jobs, burst: _draining_child(tmp_path),
+    )
+
+    def stop_when_started() -> None:
+        deadline = time.monotonic() + 10
+        while len(list(tmp_path.glob("*.started"))) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        supervisor.stop()
+
+    threading.Thread(target=stop_when_started, daemon=True).start()
+    supervisor.run()
+
+    assert len(list(tmp_path.glob("*.drained"))) == 2
+    assert supervisor.spawned == 2
+
+
+def test_supervisor_kills_children_that_outlive_drain_timeout(tmp_path: Path) -> None:
+    def stuck_child(queue_name: str, max_jobs: int, burst: bool) -> None:
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        (tmp_path / "started").touch()
+        time.sleep(30)
+
+    supervisor = PreforkSupervisor(processes=1, queue_name="test", max_jobs=0, drain_timeout=0.5, target=stuck_child)
+
+    def stop_when_started() -> None:
+        while not (tmp_path / "started").exists():
+            time.sleep(0.05)
+        supervisor.stop()
+
+    threading.Thread(target=stop_when_started, daemon=True).start()
+    started = time.monotonic()
+    supervisor.run()
+
+    assert time.monotonic() - started < 10
+
+
+def test_children_ignore_the_terminal_sigint(tmp_path: Path) -> None:
+    def record_sigint(queue_name: str, max_jobs: int, burst: bool) -> None:
+        # Ctrl-C at a terminal signals the whole process group, children included.
+        os.kill(os.getpid(), signal.SIGINT)
+        time.sleep(0.1)
+        (tmp_path / "survived").touch()
+
+    supervisor = PreforkSupervisor(
+        processes=1, queue_name="test", max_jobs=0, drain_timeout=5, burst=True, target=record_sigint
+    )
+
+    supervisor.run()
+
+    assert (tmp_path / "survived").exists()
+
+
+def test_classifier_is_reused_until_replaced(monkeypatch) -> None:
+    built = []
+
+    class CountingClassifier:
+        def __init__(self) -> None:
+            built.append(self)
+
+    monkeypatch.setattr(classification_module, "AIClassifier", CountingClassifier)
+    first = classification_module.get_classifier()
+    assert classification_module.get_classifier() is first
+    assert len(built) == 1
+
+    monkeypatch.setattr(classification_module, "AIClassifier", lambda: "replacement")
+    assert classification_module.get_classifier() == "replacement"
+
+
+def test_bulk_deletes_use_the_maintenance_queue(monkeypatch) -> None:
+    import app.services.task_queue as task_queue
+
+    class RecordingQueue:
+        def __init__(self, name: str | None) -> None:
+            self.name = name
+
+        def enqueue(self, func_name: str, *args, **kwargs):
+            enqueued.append((self.name, func_name))
+            return type("Job", (), {"id": "job-1"})()
+
+    enqueued: list[tuple[str | None, str]] = []
+    monkeypatch.setattr(task_queue, "_queue", lambda name=None: RecordingQueue(name))
+
+    task_queue.enqueue_task_bulk_delete({"status": "completed"})
+    task_queue.enqueue_task_classification("00000000-0000-0000-0000-000000000000")
+
+    assert enqueued == [
+        ("task-maintenance", "app.jobs.task_bulk_delete.delete_tasks_job"),
+        (None, "app.jobs.task_classification.classify_task_job"),
+    ]